@@ -0,0 +1,103 @@
+"""Micro-benchmark for the outer edge selection in extract_contact_angle_features().
+
+Compares the vectorized level set scan against the previous per-level-set Python loop on the drop points of the
+sample images, and reports the cost of the whole feature extraction for reference.
+
+Usage: python benchmarks/bench_conan_features.py [--repeat N]
+"""
+
+import argparse
+import os
+import timeit
+
+import cv2
+import numpy as np
+
+from opendrop.geometry import Line2, Rect2, Vector2
+from opendrop.features import extract_contact_angle_features
+from opendrop.features.conan import _outermost_edges
+
+
+EXAMPLE_IMAGES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'example_images')
+
+# (file name, baseline, roi)
+SAMPLES = (
+    (
+        'drop_on_surface.png',
+        Line2(Vector2(100, 668), Vector2(700, 662)),
+        Rect2(80, 300, 650, 720),
+    ),
+    (
+        'drop_on_surface_with_needle.png',
+        Line2(Vector2(0, 1170), Vector2(1600, 1168)),
+        Rect2(300, 500, 1300, 1199),
+    ),
+)
+
+
+def outermost_edges_loop(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """The previous implementation of _outermost_edges(), looping over pairs of level sets. Both are checked
+    to agree in tests/features/test_conan_features.py."""
+    mask = np.zeros(len(y), dtype=bool)
+
+    ix = y.argsort()
+    x, y = x[ix], y[ix]
+
+    levels = np.histogram_bin_edges(y, bins=max(1, int(y.max()/2)))
+    levels_ix = (0, *np.searchsorted(y, levels[1:], side='right'))
+
+    for start, stop in zip(levels_ix, levels_ix[min(2, len(levels_ix)-1):]):
+        level_set = x[start:stop]
+        ltr_ix = level_set.argsort()
+        contiguous_groups = np.split(ltr_ix, (np.diff(level_set[ltr_ix]) > 2.828).nonzero()[0] + 1)
+        mask[ix[start + contiguous_groups[0]]] = True
+        mask[ix[start + contiguous_groups[-1]]] = True
+
+    return mask
+
+
+def drop_coordinates(image: np.ndarray, baseline: Line2, roi: Rect2) -> np.ndarray:
+    """Return the candidate drop edge points in the (height, distance along baseline) coordinates used by
+    extract_contact_angle_features(), before outer edge selection."""
+    roi_baseline = baseline - roi.position
+    up = -roi_baseline.perp
+    right = roi_baseline.unit
+    origin = np.reshape(roi_baseline.pt0, (2, 1))
+
+    gray = cv2.cvtColor(image[roi.y0:roi.y1+1, roi.x0:roi.x1+1], cv2.COLOR_RGB2GRAY)
+    edges = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 20, 60)
+    points = np.array(edges.nonzero()[::-1])
+
+    x, y = [up, right] @ (points - origin)
+    keep = x > 2.0
+
+    return np.array([x[keep], y[keep]])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help="number of timed calls per image")
+    args = parser.parse_args()
+
+    print('{:>32} {:>8} {:>12} {:>16} {:>16}'.format(
+        'image', 'points', 'loop (ms)', 'vectorized (ms)', 'extract (ms)'
+    ))
+    for file_name, baseline, roi in SAMPLES:
+        image = cv2.imread(os.path.join(EXAMPLE_IMAGES_DIR, file_name))
+        x, y = drop_coordinates(image, baseline, roi)
+
+        loop = min(timeit.repeat(lambda: outermost_edges_loop(x, y), number=1, repeat=args.repeat))
+        vectorized = min(timeit.repeat(lambda: _outermost_edges(x, y), number=1, repeat=args.repeat))
+        extract = min(timeit.repeat(
+            lambda: extract_contact_angle_features(image, baseline, False, roi=roi),
+            number=1,
+            repeat=args.repeat,
+        ))
+
+        print('{:>32} {:>8} {:>12.3f} {:>16.3f} {:>16.3f}'.format(
+            file_name, len(x), loop*1e3, vectorized*1e3, extract*1e3
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Micro-benchmark for the contact angle fitting stage.
+
+Reports the per-frame cost of contact_angle_fit() (and the batched contact_angle_fit_batch()) on synthetic
+sessile drop profiles with typical extracted contour sizes.
+
+Usage: python benchmarks/bench_conan_fit.py [--repeat N]
+"""
+
+import argparse
+import math
+import timeit
+
+import numpy as np
+
+from opendrop.geometry import Line2, Vector2
+from opendrop.fit import contact_angle_fit, contact_angle_fit_batch
+
+
+# Typical numbers of drop points returned by extract_contact_angle_features().
+CONTOUR_SIZES = (250, 1000, 4000, 16000)
+
+BASELINE_Y = 600.0
+
+
+def synthetic_drop(n_points: int, contact_angle: float = math.radians(110), seed: int = 0) -> np.ndarray:
+    """Return a noisy circular cap profile sitting on the line y = BASELINE_Y, in image coordinates."""
+    rng = np.random.default_rng(seed)
+
+    # Scale the cap so its perimeter is roughly n_points pixels long.
+    radius = n_points / (2*contact_angle)
+    theta = rng.uniform(-contact_angle, contact_angle, n_points)
+    x = 640 + radius*np.sin(theta)
+    y = BASELINE_Y + radius*math.cos(contact_angle) - radius*np.cos(theta)
+
+    # Quantize to pixels like edge detection would.
+    return np.round([x, y] + rng.normal(scale=0.3, size=(2, n_points)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help="number of timed calls per contour size")
+    args = parser.parse_args()
+
+    baseline = Line2(Vector2(0, BASELINE_Y), Vector2(1280, BASELINE_Y))
+
+    print('{:>10} {:>16} {:>16}'.format('points', 'single (ms)', 'batched (ms)'))
+    for n_points in CONTOUR_SIZES:
+        data = synthetic_drop(n_points)
+
+        single = min(timeit.repeat(
+            lambda: contact_angle_fit(data, baseline),
+            number=1,
+            repeat=args.repeat,
+        ))
+
+        batched = timeit.timeit(
+            lambda: contact_angle_fit_batch([data]*args.repeat, [baseline]*args.repeat),
+            number=1,
+        ) / args.repeat
+
+        print('{:>10} {:>16.3f} {:>16.3f}'.format(n_points, single*1e3, batched*1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark of the worker pool execution modes on the sample images.
+
+Runs the jobs the analysis services submit (feature extraction alone, as for previews, and extraction and fitting
+in one task, as for analyses) on a process pool that passes images through a shared memory FrameArena, as in
+WorkerPool's PROCESS mode, and on a thread pool, as in THREAD mode. Reports the throughput of each mode.
+
+Threads only pay off where the work releases the GIL, so compare the modes on a machine with several cores and
+the compiled Young-Laplace shape extension. With a single worker both modes run one job at a time and the
+numbers say nothing about which mode scales better.
+
+Usage: python benchmarks/bench_worker_modes.py [--frames N] [--workers N] [--no-fit]
+"""
+
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import time
+from typing import Callable, List, Tuple
+
+import cv2
+
+from opendrop.arena import FrameArena, call_with_shared_frames
+from opendrop.geometry import Line2, Rect2, Vector2
+from opendrop.features import extract_contact_angle_features, extract_pendant_features
+from opendrop.fit import extract_and_fit_contact_angle, extract_and_fit_pendant
+
+
+EXAMPLE_IMAGES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'example_images')
+
+PENDANT_IMAGES = tuple('water_in_air00{}.png'.format(i) for i in range(1, 6))
+PENDANT_DROP_REGION = Rect2(250, 0, 800, 1000)
+
+SESSILE_IMAGE = 'drop_on_surface.png'
+SESSILE_BASELINE = Line2(Vector2(100, 668), Vector2(700, 662))
+SESSILE_ROI = Rect2(80, 300, 650, 720)
+
+
+def workloads(fit: bool) -> List[Tuple[str, Callable, list, dict]]:
+    """Return (name, function, images, keyword arguments) of each workload."""
+    pendant = [cv2.imread(os.path.join(EXAMPLE_IMAGES_DIR, name)) for name in PENDANT_IMAGES]
+    sessile = [cv2.imread(os.path.join(EXAMPLE_IMAGES_DIR, SESSILE_IMAGE))]
+
+    pendant_kwargs = dict(drop_region=PENDANT_DROP_REGION)
+    sessile_kwargs = dict(baseline=SESSILE_BASELINE, inverted=False, roi=SESSILE_ROI)
+
+    jobs = [
+        ('pendant extract', extract_pendant_features, pendant, pendant_kwargs),
+        ('sessile extract', extract_contact_angle_features, sessile, sessile_kwargs),
+    ]
+
+    if fit:
+        jobs += [
+            ('pendant extract+fit', extract_and_fit_pendant, pendant, pendant_kwargs),
+            ('sessile extract+fit', extract_and_fit_contact_angle, sessile, sessile_kwargs),
+        ]
+
+    return jobs
+
+
+def run_process(executor: Executor, arena: FrameArena, fn: Callable, images: list, kwargs: dict) -> None:
+    futs = []
+    for image in images:
+        frame = arena.put(image)
+        fut = executor.submit(call_with_shared_frames, fn, (frame,), kwargs)
+        fut.add_done_callback(lambda _, frame=frame: arena.release(frame))
+        futs.append(fut)
+
+    for fut in futs:
+        fut.result()
+
+
+def run_thread(executor: Executor, fn: Callable, images: list, kwargs: dict) -> None:
+    futs = [executor.submit(fn, image, **kwargs) for image in images]
+    for fut in futs:
+        fut.result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=40, help="number of frames per workload")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of workers")
+    parser.add_argument('--no-fit', action='store_true', help="only benchmark feature extraction")
+    args = parser.parse_args()
+
+    process_executor = ProcessPoolExecutor(max_workers=args.workers)
+    thread_executor = ThreadPoolExecutor(max_workers=args.workers)
+    arena = FrameArena(max_free=2*args.workers)
+
+    print('{} workers on {} CPUs, {} frames per workload'.format(args.workers, os.cpu_count(), args.frames))
+    if args.workers < 2:
+        print('warning: with one worker the modes can\'t be compared, use a machine with several cores')
+    print('{:>24} {:>18} {:>18}'.format('workload', 'process (fps)', 'thread (fps)'))
+    for name, fn, images, kwargs in workloads(fit=not args.no_fit):
+        frames = [images[i % len(images)] for i in range(args.frames)]
+
+        # Warm up the workers (imports, caches and buffers).
+        run_process(process_executor, arena, fn, frames[:args.workers], kwargs)
+        run_thread(thread_executor, fn, frames[:args.workers], kwargs)
+
+        start = time.perf_counter()
+        run_process(process_executor, arena, fn, frames, kwargs)
+        process_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_thread(thread_executor, fn, frames, kwargs)
+        thread_time = time.perf_counter() - start
+
+        print('{:>24} {:>18.1f} {:>18.1f}'.format(name, args.frames/process_time, args.frames/thread_time))
+
+    process_executor.shutdown()
+    thread_executor.shutdown()
+    arena.close()
+
+
+if __name__ == '__main__':
+    main()
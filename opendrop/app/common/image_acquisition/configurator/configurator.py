@@ -36,10 +36,12 @@ from opendrop.app.common.services.acquisition import (
     ImageAcquirer,
     LocalStorageAcquirer,
     USBCameraAcquirer,
+    VideoFileAcquirer,
 )
 from opendrop.appfw import ComponentFactory, Presenter, component, install
 
 from .local_storage import local_storage_cs
+from .video_file import video_file_cs
 
 
 @component(
@@ -67,6 +69,8 @@ class ImageAcquisitionConfiguratorPresenter(Presenter[Gtk.Bin]):
             self.remove_configurator()
         elif isinstance(acquirer, LocalStorageAcquirer):
             self.load_local_storage_configurator()
+        elif isinstance(acquirer, VideoFileAcquirer):
+            self.load_video_file_configurator()
         elif isinstance(acquirer, USBCameraAcquirer):
             self.load_usb_camera_configurator()
         elif isinstance(acquirer, GenicamAcquirer):
@@ -97,6 +101,16 @@ class ImageAcquisitionConfiguratorPresenter(Presenter[Gtk.Bin]):
         self.configurator_component.view_rep.show()
         self.host.add(self.configurator_component.view_rep)
 
+    def load_video_file_configurator(self) -> None:
+        self.remove_configurator()
+
+        self.configurator_component = video_file_cs.factory(
+            acquirer=self._acquirer
+        ).create()
+
+        self.configurator_component.view_rep.show()
+        self.host.add(self.configurator_component.view_rep)
+
     def load_usb_camera_configurator(self) -> None:
         self.remove_configurator()
 
@@ -72,6 +72,11 @@ class LocalStorageView(View['LocalStoragePresenter', Gtk.Widget]):
     _FILE_INPUT_FILTER.add_mime_type('image/x‑portable‑anymap')
     _FILE_INPUT_FILTER.add_mime_type('image/vnd.radiance')
 
+    # Frame stacks, see FrameStack
+    _FILE_INPUT_FILTER.add_pattern('*.npy')
+    _FILE_INPUT_FILTER.add_pattern('*.raw')
+    _FILE_INPUT_FILTER.add_pattern('*.bin')
+
     def _do_init(self) -> Gtk.Widget:
         self._widget = Gtk.Grid(row_spacing=10, column_spacing=10)
 
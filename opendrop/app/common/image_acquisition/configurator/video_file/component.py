@@ -0,0 +1,189 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+from gi.repository import Gtk, Gdk, GObject
+
+from opendrop.app.common.services.acquisition import VideoFileAcquirer
+from opendrop.mvp import ComponentSymbol, Presenter, View
+from opendrop.utility.bindable.gextension import GObjectPropertyBindable
+from opendrop.widgets.file_chooser_button import FileChooserButton
+from opendrop.widgets.float_entry import FloatEntry
+from opendrop.widgets.integer_entry import IntegerEntry
+
+video_file_cs = ComponentSymbol()  # type: ComponentSymbol[Gtk.Widget]
+
+
+@video_file_cs.view()
+class VideoFileView(View['VideoFilePresenter', Gtk.Widget]):
+    STYLE = '''
+    .small-pad {
+         min-height: 0px;
+         min-width: 0px;
+         padding: 6px 4px 6px 4px;
+    }
+
+    .error-text {
+        color: red;
+    }
+    '''
+
+    _STYLE_PROV = Gtk.CssProvider()
+    _STYLE_PROV.load_from_data(bytes(STYLE, 'utf-8'))
+    Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), _STYLE_PROV, Gtk.STYLE_PROVIDER_PRIORITY_USER)
+
+    _FILE_INPUT_FILTER = Gtk.FileFilter()
+    _FILE_INPUT_FILTER.add_mime_type('video/*')
+
+    def _do_init(self) -> Gtk.Widget:
+        self._widget = Gtk.Grid(row_spacing=10, column_spacing=10)
+
+        file_chooser_lbl = Gtk.Label('Video file:', xalign=0)
+        self._widget.attach(file_chooser_lbl, 0, 0, 1, 1)
+
+        self._file_chooser_inp = FileChooserButton(
+            label='Choose file',
+            dialog_title='Select video file',
+            file_filter=self._FILE_INPUT_FILTER,
+        )
+        self._file_chooser_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._file_chooser_inp, file_chooser_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._file_chooser_err_msg_lbl = Gtk.Label(xalign=0)
+        self._file_chooser_err_msg_lbl.get_style_context().add_class('error-text')
+        self._widget.attach_next_to(self._file_chooser_err_msg_lbl, self._file_chooser_inp, Gtk.PositionType.RIGHT, 1, 1)
+
+        duration_lbl = Gtk.Label('Duration (s):', xalign=0)
+        self._widget.attach(duration_lbl, 0, 1, 1, 1)
+
+        self._duration_val_lbl = Gtk.Label(xalign=0)
+        self._widget.attach_next_to(self._duration_val_lbl, duration_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        start_time_lbl = Gtk.Label('Start time (s):', xalign=0)
+        self._widget.attach(start_time_lbl, 0, 2, 1, 1)
+
+        self._start_time_inp = FloatEntry(lower=0, width_chars=6)
+        self._start_time_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._start_time_inp, start_time_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        end_time_lbl = Gtk.Label('End time (s):', xalign=0)
+        self._widget.attach(end_time_lbl, 0, 3, 1, 1)
+
+        self._end_time_inp = FloatEntry(lower=0, width_chars=6)
+        self._end_time_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._end_time_inp, end_time_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        stride_lbl = Gtk.Label('Use every nth frame:', xalign=0)
+        self._widget.attach(stride_lbl, 0, 4, 1, 1)
+
+        self._stride_inp = IntegerEntry(lower=1, default=1, width_chars=6)
+        self._stride_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._stride_inp, stride_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._widget.show_all()
+
+        self.bn_selected_video_paths = GObjectPropertyBindable(self._file_chooser_inp, 'file-paths')
+        self.bn_file_chooser_err_msg = GObjectPropertyBindable(self._file_chooser_err_msg_lbl, 'label')
+        self.bn_duration_text = GObjectPropertyBindable(self._duration_val_lbl, 'label')
+        self.bn_start_time = GObjectPropertyBindable(self._start_time_inp, 'value')
+        self.bn_end_time = GObjectPropertyBindable(self._end_time_inp, 'value')
+        self.bn_stride = GObjectPropertyBindable(self._stride_inp, 'value')
+
+        # Set which widget is first focused
+        self._file_chooser_inp.grab_focus()
+
+        self.presenter.view_ready()
+
+        return self._widget
+
+    def _do_destroy(self) -> None:
+        self._widget.destroy()
+
+
+@video_file_cs.presenter(options=['acquirer'])
+class VideoFilePresenter(Presenter['VideoFileView']):
+    def _do_init(self, acquirer: VideoFileAcquirer) -> None:
+        self._acquirer = acquirer
+
+        self.__data_bindings = []
+        self.__event_connections = []
+
+    def view_ready(self) -> None:
+        self.__data_bindings.extend([
+            self._acquirer.bn_start_time.bind(
+                self.view.bn_start_time
+            ),
+            self._acquirer.bn_end_time.bind(
+                self.view.bn_end_time
+            ),
+            self._acquirer.bn_stride.bind(
+                self.view.bn_stride
+            ),
+        ])
+
+        self.__event_connections.extend([
+            self._acquirer.bn_last_loaded_path.on_changed.connect(self._hdl_model_last_loaded_path_changed),
+            self.view.bn_selected_video_paths.on_changed.connect(self._hdl_view_selected_video_paths_changed)
+        ])
+
+        self._hdl_model_last_loaded_path_changed()
+
+    def _hdl_model_last_loaded_path_changed(self) -> None:
+        duration = self._acquirer.bn_duration.get()
+        if duration is None:
+            self.view.bn_duration_text.set('')
+        else:
+            self.view.bn_duration_text.set('{:.2f}'.format(duration))
+
+        last_loaded_path = self._acquirer.bn_last_loaded_path.get()
+        if last_loaded_path is None:
+            return
+
+        if tuple(self.view.bn_selected_video_paths.get()) != (str(last_loaded_path),):
+            self.view.bn_selected_video_paths.set((str(last_loaded_path),))
+
+    def _hdl_view_selected_video_paths_changed(self) -> None:
+        selected_video_paths = self.view.bn_selected_video_paths.get()
+        if len(selected_video_paths) == 0:
+            return
+
+        last_loaded_path = self._acquirer.bn_last_loaded_path.get()
+        if last_loaded_path is not None and str(last_loaded_path) == selected_video_paths[0]:
+            return
+
+        try:
+            self._acquirer.load_video_path(selected_video_paths[0])
+        except ValueError as e:
+            self.view.bn_file_chooser_err_msg.set(str(e))
+        else:
+            self.view.bn_file_chooser_err_msg.set('')
+
+    def _do_destroy(self) -> None:
+        for db in self.__data_bindings:
+            db.unbind()
+
+        for ec in self.__event_connections:
+            ec.disconnect()
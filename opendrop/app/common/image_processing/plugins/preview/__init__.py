@@ -27,4 +27,9 @@
 
 
 from .image_sequence_navigator import image_sequence_navigator_cs
-from .model import AcquirerController, ImageSequenceAcquirerController, CameraAcquirerController
+from .model import (
+    AcquirerController,
+    ImageSequenceAcquirerController,
+    CameraAcquirerController,
+    FrameChangeDetector,
+)
@@ -27,13 +27,16 @@
 
 
 import asyncio
-import itertools
-from typing import Optional, Hashable, Iterable, MutableSequence
+import math
+from typing import Optional, Sequence, Tuple
 
+import cv2
 from gi.repository import GLib
 import numpy as np
 
 from opendrop.app.common.services.acquisition import ImageSequenceAcquirer, CameraAcquirer
+from opendrop.frame import as_frame
+from opendrop.geometry import Rect2
 from opendrop.utility.bindable import AccessorBindable
 from opendrop.utility.bindable.typing import Bindable
 from opendrop.utility.misc import clamp
@@ -45,11 +48,6 @@ class AcquirerController:
 
 
 class ImageSequenceAcquirerController(AcquirerController):
-    class _ImageRegistration:
-        def __init__(self, image_id: Hashable, image: np.ndarray) -> None:
-            self.image_id = image_id
-            self.image = image
-
     def __init__(
             self, *,
             acquirer: ImageSequenceAcquirer,
@@ -58,7 +56,8 @@ class ImageSequenceAcquirerController(AcquirerController):
         self._acquirer = acquirer
         self._source_image_out = source_image_out
 
-        self._image_registry = []  # type: MutableSequence[self._ImageRegistration]
+        # Images are only indexed when shown, so a lazily loaded sequence is never loaded all at once.
+        self._sequence = tuple()  # type: Sequence[np.ndarray]
 
         self.bn_num_images = AccessorBindable(
             getter=self._get_num_images,
@@ -70,8 +69,6 @@ class ImageSequenceAcquirerController(AcquirerController):
             setter=self._set_showing_image_index,
         )
 
-        self._showing_image_id = None  # type: Optional[Hashable]
-
         self.__event_connections = [
             acquirer.bn_images.on_changed.connect(
                 self._hdl_acquirer_images_changed
@@ -80,106 +77,29 @@ class ImageSequenceAcquirerController(AcquirerController):
         self._hdl_acquirer_images_changed()
 
     def _hdl_acquirer_images_changed(self) -> None:
+        self._sequence = self._acquirer.bn_images.get()
         self._showing_image_index = None
-        self._update_image_registry()
-        self._update_showing_image()
-
-    def _update_image_registry(self) -> None:
-        acquirer_images = list(self._acquirer.bn_images.get())
-
-        for image_reg in tuple(self._get_unassociated_registered_images(acquirer_images)):
-            self._image_registry.remove(image_reg)
-            self._on_image_deregistered(image_reg.image_id)
-
-        for image in self._filter_unregistered_images(acquirer_images):
-            new_image_reg = self._ImageRegistration(
-                image_id=id(image),
-                image=image,
-            )
-            self._image_registry.append(new_image_reg)
-            self._on_image_registered(
-                image_id=new_image_reg.image_id,
-                image=image,
-            )
-
+        self._on_images_changed()
         self.bn_num_images.poke()
-
-    def _filter_unregistered_images(self, images: Iterable[np.ndarray]) -> Iterable[np.ndarray]:
-        return itertools.filterfalse(self._is_image_registered, images)
-
-    def _is_image_registered(self, image: np.ndarray) -> bool:
-        try:
-            self._get_image_reg_by_image(image)
-        except ValueError:
-            return False
-        else:
-            return True
-
-    def _get_unassociated_registered_images(self, images: Iterable[np.ndarray]) -> Iterable[_ImageRegistration]:
-        return (
-            image_reg
-            for image_reg in self._image_registry
-            if not self._is_registered_image_associated(images, image_reg)
-        )
-
-    @staticmethod
-    def _is_registered_image_associated(images: Iterable[np.ndarray], image_reg: _ImageRegistration) -> bool:
-        for image in images:
-            if np.array_equal(image_reg.image, image):
-                return True
-        else:
-            return False
+        self._update_showing_image()
 
     def _update_showing_image(self) -> None:
-        acquirer_images = list(self._acquirer.bn_images.get())
-        if self._showing_image_index is None and len(acquirer_images) > 0:
+        if self._showing_image_index is None and len(self._sequence) > 0:
             self._showing_image_index = 0
             self.bn_showing_image_index.poke()
 
         if self._showing_image_index is None:
             return
 
-        new_showing_image_reg = self._get_image_reg_by_image(
-            image=acquirer_images[self._showing_image_index]
-        )
-
-        new_showing_image_id = new_showing_image_reg.image_id
-
-        if new_showing_image_id == self._showing_image_id:
-            return
-
-        self._showing_image_id = new_showing_image_id
-        self._on_image_changed(new_showing_image_id)
+        self._on_image_changed(self._showing_image_index)
         self._update_source_image_out()
 
     def _update_source_image_out(self) -> None:
-        image_reg = self._get_image_reg_by_image_id(
-            image_id=self._showing_image_id,
-        )
-
-        image = image_reg.image
-
+        image = self._get_image(self._showing_image_index)
         self._source_image_out.set(image)
 
-    def _get_image_reg_by_image(self, image: np.ndarray) -> _ImageRegistration:
-        for image_reg in self._image_registry:
-            if np.array_equal(image_reg.image, image):
-                return image_reg
-        else:
-            raise ValueError(
-                "No _ImageRegistration found for image '{}'"
-                .format(image)
-            )
-
-    def _get_image_reg_by_image_id(self, image_id: Hashable) -> _ImageRegistration:
-        for image_reg in self._image_registry:
-            if image_reg.image_id == image_id:
-                return image_reg
-        else:
-            raise ValueError(
-                "No _ImageRegistration found for image_id '{}'"
-                .format(image_id)
-            )
+    def _get_image(self, image_id: int) -> np.ndarray:
+        return self._sequence[image_id]
 
     def _get_showing_image_index(self) -> Optional[int]:
         return self._showing_image_index
@@ -189,19 +109,19 @@ class ImageSequenceAcquirerController(AcquirerController):
             return
 
         idx = clamp(idx, 0, self.bn_num_images.get() - 1)
+        if idx == self._showing_image_index:
+            return
+
         self._showing_image_index = idx
         self._update_showing_image()
 
     def _get_num_images(self) -> int:
-        return len(self._acquirer.bn_images.get())
-
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
-        pass
+        return len(self._sequence)
 
-    def _on_image_deregistered(self, image_id: Hashable) -> None:
+    def _on_images_changed(self) -> None:
         pass
 
-    def _on_image_changed(self, image_id: Hashable) -> None:
+    def _on_image_changed(self, image_id: int) -> None:
         pass
 
     def destroy(self) -> None:
@@ -283,3 +203,77 @@ class CameraAcquirerController(AcquirerController):
 
         for ec in self.__event_connections:
             ec.disconnect()
+
+
+class FrameChangeDetector:
+    """Detect whether a camera frame has changed since the last analysed frame.
+
+    Regions of interest are divided into TILE_SIZE square tiles, and a frame has changed if the mean intensity of
+    any tile differs from the reference frame by more than THRESHOLD. Averaging over tiles suppresses sensor
+    noise while an edge moving by a pixel still shifts the mean of the tiles it crosses.
+    """
+
+    TILE_SIZE = 16
+    THRESHOLD = 2.0
+
+    def __init__(self) -> None:
+        self._reference = None  # type: Optional[Sequence[Tuple[Tuple[int, int, int, int], np.ndarray]]]
+
+    def reset(self) -> None:
+        """Forget the reference frame, the next frame is always reported as changed."""
+        self._reference = None
+
+    def changed(self, image: np.ndarray, regions: Sequence[Optional[Rect2[int]]]) -> bool:
+        """Return True if `image` differs from the reference frame within `regions` (the whole image if there are
+        none). If it does, `image` becomes the new reference frame."""
+        tiles = [
+            (bounds, self._tile_means(image, bounds))
+            for bounds in self._clip_regions(image, regions)
+        ]
+
+        reference = self._reference
+        if reference is not None and len(reference) == len(tiles) and all(
+                bounds == ref_bounds and np.abs(means - ref_means).max(initial=0.0) <= self.THRESHOLD
+                for (bounds, means), (ref_bounds, ref_means) in zip(tiles, reference)):
+            return False
+
+        self._reference = tiles
+        return True
+
+    def _tile_means(self, image: np.ndarray, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+        x0, y0, x1, y1 = bounds
+        subimage = image[y0:y1+1, x0:x1+1]
+        size = (
+            math.ceil(subimage.shape[1]/self.TILE_SIZE),
+            math.ceil(subimage.shape[0]/self.TILE_SIZE),
+        )
+
+        means = cv2.resize(subimage.astype(np.float32), size, interpolation=cv2.INTER_AREA)
+
+        # Compare in 8-bit grey levels.
+        bit_depth = as_frame(image).bit_depth
+        if bit_depth > 8:
+            means *= 2.0**(8 - bit_depth)
+
+        return means
+
+    @staticmethod
+    def _clip_regions(
+            image: np.ndarray,
+            regions: Sequence[Optional[Rect2[int]]],
+    ) -> Sequence[Tuple[int, int, int, int]]:
+        height, width = image.shape[:2]
+        regions = [region for region in regions if region is not None] or [Rect2(0, 0, width - 1, height - 1)]
+
+        clipped = []
+        for region in regions:
+            bounds = (
+                max(0, int(region.x0)),
+                max(0, int(region.y0)),
+                min(width - 1, int(region.x1)),
+                min(height - 1, int(region.y1)),
+            )
+            if bounds[0] <= bounds[2] and bounds[1] <= bounds[3]:
+                clipped.append(bounds)
+
+        return clipped
@@ -1,2 +1,3 @@
 from ._acquisition import ImageAcquisitionService, AcquirerType
-from ._acquirer import ImageAcquirer, InputImage, ImageSequenceAcquirer, CameraAcquirer, LocalStorageAcquirer, USBCameraAcquirer, GenicamAcquirer
+from ._acquirer import ImageAcquirer, InputImage, ImageSequenceAcquirer, CameraAcquirer, LocalStorageAcquirer, VideoFileAcquirer, USBCameraAcquirer, GenicamAcquirer
+from ._acquirer import Backpressure, FramePipeline, FrameStack, LazyImageSequence
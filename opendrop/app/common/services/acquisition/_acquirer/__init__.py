@@ -28,7 +28,10 @@
 
 from .base import ImageAcquirer, InputImage
 from .camera import CameraAcquirer
-from .image_sequence import ImageSequenceAcquirer
+from .pipeline import Backpressure, FramePipeline
+from .image_sequence import ImageSequenceAcquirer, LazyImageSequence
+from .frame_stack import FrameStack
 from .local_storage import LocalStorageAcquirer
+from .video_file import VideoFileAcquirer
 from .usb_camera import USBCameraAcquirer
 from .genicam import GenicamAcquirer
@@ -54,5 +54,9 @@ class InputImage(ABC):
     async def read(self) -> Tuple[np.ndarray, float]:
         """Return the image and timestamp."""
 
+    def release(self) -> None:
+        """Called by the consumer once it has finished processing the image, so the acquirer can limit the
+        number of images in progress."""
+
     def cancel(self) -> None:
         pass
@@ -34,9 +34,11 @@ from typing import Sequence, Tuple, Optional
 
 import numpy as np
 
+from opendrop.frame import Frame
 from opendrop.utility.bindable import VariableBindable
 from opendrop.utility.bindable.typing import Bindable
 from .base import ImageAcquirer, InputImage
+from .pipeline import FramePipeline
 
 
 class CameraAcquirer(ImageAcquirer):
@@ -48,6 +50,9 @@ class CameraAcquirer(ImageAcquirer):
         self.bn_num_frames = VariableBindable(1)
         self.bn_frame_interval = VariableBindable(None)  # type: Bindable[Optional[float]]
 
+        # Limits the frames waiting to be analysed when analysis can't keep up with the frame rate.
+        self.pipeline = FramePipeline()
+
     def acquire_images(self) -> Sequence[InputImage]:
         camera = self.bn_camera.get()
 
@@ -82,6 +87,7 @@ class CameraAcquirer(ImageAcquirer):
                 camera=camera,
                 delay=capture_delay,
                 first_image=input_images[0] if input_images else None,
+                pipeline=self.pipeline,
                 loop=self._loop,
             )
 
@@ -99,22 +105,31 @@ class CameraAcquirer(ImageAcquirer):
 
 class _BaseCameraInputImage(InputImage):
     def __init__(self, camera: 'Camera', delay: float, first_image: Optional['_BaseCameraInputImage'] = None, *,
-                 loop: asyncio.AbstractEventLoop) -> None:
+                 pipeline: FramePipeline, loop: asyncio.AbstractEventLoop) -> None:
         self._loop = loop
 
         self._first_image = first_image
+        self._pipeline = pipeline
 
         self._read_fut = self._loop.create_future()
+        self._captured = None
 
         self._camera = camera
-        self._do_capture_handle = self._loop.call_later(delay=delay, callback=self._do_capture)
+        self._do_capture_handle = self._loop.call_later(delay, self._pipeline.due, self)
 
         self.capture_time = math.nan
+        self._capture_time = math.nan
 
         self.est_ready = time.time() + delay
 
-    def _do_capture(self) -> None:
-        image = self._camera.capture()
+    def capture(self) -> bool:
+        """Capture the frame, called by the pipeline. Return False if the capture failed."""
+        try:
+            image = self._camera.capture()
+        except Exception as e:
+            self._read_fut.set_exception(e)
+            return False
+
         self._capture_time = time.time()
 
         if self._first_image is not None:
@@ -124,22 +139,35 @@ class _BaseCameraInputImage(InputImage):
 
         timestamp = round(timestamp, 1)
 
-        self._read_fut.set_result(
-            (image, timestamp)
-        )
+        self._captured = (image, timestamp)
+        return True
+
+    def deliver(self) -> None:
+        """Hand the captured frame to the consumer, called by the pipeline."""
+        captured, self._captured = self._captured, None
+        self._read_fut.set_result(captured)
+
+    def drop(self) -> None:
+        """Drop the frame, called by the pipeline. The consumer sees the read cancelled."""
+        self._captured = None
+        self._read_fut.cancel()
 
     async def read(self) -> Tuple[np.ndarray, float]:
         return await self._read_fut
 
+    def release(self) -> None:
+        self._pipeline.release(self)
+
     def cancel(self) -> None:
         self._do_capture_handle.cancel()
         self._read_fut.cancel()
+        self._pipeline.discard(self)
 
 
 class Camera(ABC):
     @abstractmethod
-    def capture(self) -> np.ndarray:
-        """Return the captured image."""
+    def capture(self) -> Frame:
+        """Return the captured image, as a Frame in the camera's own pixel format."""
 
     @abstractmethod
     def get_image_size_hint(self) -> Optional[Tuple[int, int]]:
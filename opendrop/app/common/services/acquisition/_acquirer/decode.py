@@ -0,0 +1,115 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Deque, MutableSet, Optional, Tuple
+
+import numpy as np
+
+from .base import InputImage
+
+
+class DecodeQueue:
+    """Decodes requested images in order, with at most `capacity` of them decoded (or decoding) and not yet
+    released by their consumer, so decoding doesn't run far ahead of analysis."""
+
+    def __init__(self, executor: Executor, capacity: int) -> None:
+        self._executor = executor
+        self._capacity = capacity
+
+        self._waiting = deque()  # type: Deque[DecodedInputImage]
+        self._decoding = set()  # type: MutableSet[DecodedInputImage]
+
+    def request(self, image: 'DecodedInputImage') -> None:
+        self._waiting.append(image)
+        self._dispatch()
+
+    def release(self, image: 'DecodedInputImage') -> None:
+        self._decoding.discard(image)
+        self._dispatch()
+
+    def discard(self, image: 'DecodedInputImage') -> None:
+        if image in self._waiting:
+            self._waiting.remove(image)
+
+        self.release(image)
+
+    def _dispatch(self) -> None:
+        while self._waiting and len(self._decoding) < self._capacity:
+            image = self._waiting.popleft()
+            self._decoding.add(image)
+            image.decode(self._executor)
+
+
+class DecodedInputImage(InputImage):
+    """Input image decoded by `load`, which returns the image and its timestamp, when its DecodeQueue gets to it.
+    The image is requested from the queue on construction."""
+
+    def __init__(self, load: Callable[[], Tuple[np.ndarray, float]], *, queue: DecodeQueue,
+                 loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+        self._load = load
+        self._queue = queue
+
+        self._read_fut = self._loop.create_future()
+        self._decode_fut = None  # type: Optional[asyncio.Future]
+
+        self._queue.request(self)
+
+    def decode(self, executor: Executor) -> None:
+        """Start decoding the image, called by the queue."""
+        self._decode_fut = self._loop.run_in_executor(executor, self._load)
+        self._decode_fut.add_done_callback(self._decode_done)
+
+    def _decode_done(self, fut: asyncio.Future) -> None:
+        if self._read_fut.done():
+            return
+
+        if fut.cancelled():
+            self._read_fut.cancel()
+            self._queue.release(self)
+        elif fut.exception() is not None:
+            self._read_fut.set_exception(fut.exception())
+            self._queue.release(self)
+        else:
+            self._read_fut.set_result(fut.result())
+
+    async def read(self) -> Tuple[np.ndarray, float]:
+        return await self._read_fut
+
+    def release(self) -> None:
+        self._queue.release(self)
+
+    def cancel(self) -> None:
+        if self._decode_fut is not None:
+            self._decode_fut.cancel()
+
+        self._read_fut.cancel()
+        self._queue.discard(self)
@@ -0,0 +1,303 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from pathlib import Path
+import struct
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from opendrop.frame import Frame, PixelFormat
+
+
+NPY_SUFFIXES = ('.npy',)
+TIFF_SUFFIXES = ('.tif', '.tiff')
+
+# Raw frame dumps are described by a JSON sidecar file with the same name and a .json suffix, e.g.:
+#   {"width": 1280, "height": 1024, "dtype": "<u2", "bit_depth": 12}
+# Optional keys are "dtype" (default "uint8"), "channels" (1 or 3, default 1), "offset" (bytes before the first
+# frame, default 0), "frames" (default as many as fit in the file) and "bit_depth".
+RAW_SUFFIXES = ('.raw', '.bin')
+
+
+def is_frame_stack(path: Path) -> bool:
+    return path.suffix.lower() in (*NPY_SUFFIXES, *TIFF_SUFFIXES, *RAW_SUFFIXES)
+
+
+class FrameStack(Sequence[np.ndarray]):
+    """Frames stored one after another in a .npy file, a raw dump with a sidecar header, or a multi-page TIFF.
+
+    The file is memory-mapped and frames are read-only views into it, so they are never copied by the acquirer
+    and are mapped again (rather than copied) when passed to worker processes. TIFF pages that can't be mapped,
+    e.g. compressed ones, are decoded when indexed instead.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+
+        # (N, height, width[, 3]) array of frames for .npy and raw stacks.
+        self._stack = None  # type: Optional[np.ndarray]
+        self._pixel_format = None  # type: Optional[PixelFormat]
+        self._bit_depth = None  # type: Optional[int]
+
+        # Frames of TIFF stacks, None for pages that can't be mapped.
+        self._pages = []  # type: List[Optional[np.ndarray]]
+
+        suffix = self.path.suffix.lower()
+        try:
+            if suffix in NPY_SUFFIXES:
+                self._open_npy()
+            elif suffix in TIFF_SUFFIXES:
+                self._open_tiff()
+            elif suffix in RAW_SUFFIXES:
+                self._open_raw()
+            else:
+                raise ValueError('Unknown frame stack format')
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            raise ValueError(f"Failed to load frame stack from '{self.path}': {e}") from e
+
+    def __len__(self) -> int:
+        if self._stack is not None:
+            return len(self._stack)
+        else:
+            return len(self._pages)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        if self._stack is not None:
+            return Frame(self._stack[index], self._pixel_format, self._bit_depth)
+
+        page = self._pages[index]
+        if page is None:
+            page = self._decode_page(range(len(self._pages))[index])
+
+        return page
+
+    def _open_npy(self) -> None:
+        stack = np.load(self.path, mmap_mode='r')
+        if stack.ndim == 2 or stack.ndim == 3 and stack.shape[-1] == 3:
+            # A single frame.
+            stack = stack[np.newaxis]
+
+        self._set_stack(stack)
+
+    def _open_raw(self) -> None:
+        header_path = self.path.with_suffix('.json')
+        with open(header_path) as f:
+            header = json.load(f)
+
+        width = int(header['width'])
+        height = int(header['height'])
+        dtype = np.dtype(header.get('dtype', 'uint8'))
+        channels = int(header.get('channels', 1))
+        offset = int(header.get('offset', 0))
+
+        frame_shape = (height, width) if channels == 1 else (height, width, channels)
+        frame_size = width * height * channels * dtype.itemsize
+        num_frames = int(header.get('frames', (self.path.stat().st_size - offset) // max(frame_size, 1)))
+        if num_frames <= 0:
+            raise ValueError('File holds no complete frames')
+
+        stack = np.memmap(self.path, dtype, mode='r', offset=offset, shape=(num_frames, *frame_shape))
+        self._set_stack(stack, header.get('bit_depth'))
+
+    def _set_stack(self, stack: np.ndarray, bit_depth: Optional[int] = None) -> None:
+        if not (stack.ndim == 3 or stack.ndim == 4 and stack.shape[-1] == 3):
+            raise ValueError(f'Expected frames of shape (height, width) or (height, width, 3), got {stack.shape[1:]}')
+
+        self._stack = stack
+        self._pixel_format = _pixel_format(stack.dtype, channels=1 if stack.ndim == 3 else 3)
+        self._bit_depth = bit_depth
+
+    def _open_tiff(self) -> None:
+        with open(self.path, 'rb') as f:
+            pages = _read_tiff_pages(f)
+
+        file_size = self.path.stat().st_size
+        data = np.memmap(self.path, np.uint8, mode='r')
+
+        for page in pages:
+            if page is None:
+                self._pages.append(None)
+                continue
+
+            offset, shape, dtype, pixel_format = page
+            size = int(np.prod(shape)) * dtype.itemsize
+            if offset + size > file_size:
+                self._pages.append(None)
+                continue
+
+            image = data[offset:offset + size].view(dtype).reshape(shape)
+            self._pages.append(Frame(image, pixel_format))
+
+    def _decode_page(self, index: int) -> np.ndarray:
+        success, images = cv2.imreadmulti(
+            str(self.path),
+            index,
+            1,
+            flags=cv2.IMREAD_ANYDEPTH | cv2.IMREAD_ANYCOLOR,
+        )
+        if not success or len(images) == 0:
+            raise ValueError(f"Failed to load page {index} from '{self.path}'")
+
+        image = images[0]
+        if image.ndim == 3:
+            # OpenCV decodes colour pages as BGR or BGRA.
+            if image.shape[2] == 4:
+                image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGB)
+            else:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        image.flags.writeable = False
+
+        return Frame(image, _pixel_format(image.dtype, 1 if image.ndim == 2 else 3))
+
+
+def _pixel_format(dtype: np.dtype, channels: int) -> PixelFormat:
+    if dtype == np.uint8:
+        is_16bit = False
+    elif dtype == np.uint16 and dtype.isnative:
+        is_16bit = True
+    else:
+        raise ValueError(f'Unsupported pixel type {dtype.str}, expected uint8 or native byte order uint16')
+
+    return PixelFormat.MONO8.with_channels(mono=channels == 1).with_depth(is_16bit)
+
+
+# TIFF tags
+_IMAGE_WIDTH = 256
+_IMAGE_LENGTH = 257
+_BITS_PER_SAMPLE = 258
+_COMPRESSION = 259
+_PHOTOMETRIC = 262
+_STRIP_OFFSETS = 273
+_SAMPLES_PER_PIXEL = 277
+_STRIP_BYTE_COUNTS = 279
+_PLANAR_CONFIG = 284
+_TILE_WIDTH = 322
+_SAMPLE_FORMAT = 339
+
+# Struct formats of the integer TIFF field types.
+_TIFF_TYPES = {1: 'B', 3: 'H', 4: 'I', 16: 'Q'}
+
+_TiffPage = Tuple[int, Tuple[int, ...], np.dtype, PixelFormat]
+
+
+def _read_tiff_pages(f: BinaryIO) -> List[Optional[_TiffPage]]:
+    """Return the (offset, shape, dtype, pixel format) of the pixel data of each page of a TIFF or BigTIFF file,
+    or None for pages whose pixel data isn't stored uncompressed and contiguously."""
+    header = f.read(16)
+    if header[:2] == b'II':
+        byte_order = '<'
+    elif header[:2] == b'MM':
+        byte_order = '>'
+    else:
+        raise ValueError('Not a TIFF file')
+
+    version, = struct.unpack(byte_order + 'H', header[2:4])
+    if version == 42:
+        count_fmt, entry_fmt, offset_fmt = 'H', 'HHI4s', 'I'
+        ifd_offset, = struct.unpack(byte_order + 'I', header[4:8])
+    elif version == 43:
+        count_fmt, entry_fmt, offset_fmt = 'Q', 'HHQ8s', 'Q'
+        ifd_offset, = struct.unpack(byte_order + 'Q', header[8:16])
+    else:
+        raise ValueError('Not a TIFF file')
+
+    count_fmt, entry_fmt, offset_fmt = (byte_order + fmt for fmt in (count_fmt, entry_fmt, offset_fmt))
+    entry_size = struct.calcsize(entry_fmt)
+
+    pages = []
+    visited = set()
+
+    while ifd_offset and ifd_offset not in visited:
+        visited.add(ifd_offset)
+
+        f.seek(ifd_offset)
+        num_entries, = struct.unpack(count_fmt, f.read(struct.calcsize(count_fmt)))
+        entries = f.read(num_entries * entry_size)
+        ifd_offset, = struct.unpack(offset_fmt, f.read(struct.calcsize(offset_fmt)))
+
+        tags = {}  # type: Dict[int, Tuple[int, ...]]
+        for tag, typ, count, value in struct.iter_unpack(entry_fmt, entries):
+            if typ not in _TIFF_TYPES:
+                continue
+
+            values_fmt = '{}{}{}'.format(byte_order, count, _TIFF_TYPES[typ])
+            values_size = struct.calcsize(values_fmt)
+            if values_size <= len(value):
+                tags[tag] = struct.unpack(values_fmt, value[:values_size])
+            else:
+                # Values that don't fit in the entry are stored elsewhere.
+                pos = f.tell()
+                f.seek(struct.unpack(offset_fmt, value)[0])
+                tags[tag] = struct.unpack(values_fmt, f.read(values_size))
+                f.seek(pos)
+
+        pages.append(_tiff_page(tags, byte_order))
+
+    if not pages:
+        raise ValueError('TIFF file has no pages')
+
+    return pages
+
+
+def _tiff_page(tags: Dict[int, Tuple[int, ...]], byte_order: str) -> Optional[_TiffPage]:
+    width, = tags[_IMAGE_WIDTH]
+    height, = tags[_IMAGE_LENGTH]
+    bits = set(tags.get(_BITS_PER_SAMPLE, (1,)))
+    samples, = tags.get(_SAMPLES_PER_PIXEL, (1,))
+    compression, = tags.get(_COMPRESSION, (1,))
+    photometric, = tags.get(_PHOTOMETRIC, (1,))
+    planar, = tags.get(_PLANAR_CONFIG, (1,))
+    sample_format = set(tags.get(_SAMPLE_FORMAT, (1,)))
+    offsets = tags.get(_STRIP_OFFSETS)
+    counts = tags.get(_STRIP_BYTE_COUNTS)
+
+    # Only uncompressed, unsigned 8 or 16-bit, black-is-zero grayscale or interleaved RGB strips are mapped.
+    if compression != 1 or offsets is None or counts is None or _TILE_WIDTH in tags:
+        return None
+    if sample_format != {1} or bits not in ({8}, {16}):
+        return None
+    if (samples, photometric) not in ((1, 1), (3, 2)) or samples == 3 and planar != 1:
+        return None
+
+    dtype = np.dtype(byte_order + ('u1' if bits == {8} else 'u2'))
+    if not dtype.isnative or offsets[0] % dtype.itemsize:
+        return None
+
+    # Strips must follow each other.
+    if any(offset + count != next_offset for offset, count, next_offset in zip(offsets, counts, offsets[1:])):
+        return None
+    if sum(counts) < width * height * samples * dtype.itemsize:
+        return None
+
+    shape = (height, width) if samples == 1 else (height, width, 3)
+    pixel_format = _pixel_format(dtype, samples)
+
+    return offsets[0], shape, dtype, pixel_format
@@ -44,12 +44,17 @@ except ModuleNotFoundError:
     harvesters = Mock()
     GENICAM_ENABLED = False
 
+from opendrop.frame import Frame, PixelFormat
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.bindable.typing import ReadBindable
 from opendrop.utility.events import EventConnection
 from .camera import CameraAcquirer, Camera, CameraCaptureError
 
 
+# Significant bits of pixel formats by suffix, e.g. 'Mono12'.
+_BIT_DEPTHS = {'10': 10, '12': 12}
+
+
 GenicamCameraInfo = NamedTuple('GenicamCameraInfo', [
     ("camera_id", str),
     ("vendor", str),
@@ -179,7 +184,7 @@ class GenicamCamera(Camera):
 
         self.bn_alive.set(True)
 
-    def capture(self) -> np.ndarray:
+    def capture(self) -> Frame:
         with self._hacquirer.fetch_buffer() as buf:
             if not buf.payload.components:
                 raise CameraCaptureError
@@ -199,76 +204,41 @@ class GenicamCamera(Camera):
 
             data_format = component.data_format
 
-            if data_format == 'Mono8':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-            elif data_format == 'Mono10':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'Mono12':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format == 'RGB8':
-                image = data.reshape(height, width, 3).copy()
-            elif data_format == 'RGB10':
-                image = data.reshape(height, width, 3)
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'RGB12':
-                image = data.reshape(height, width, 3)
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format == 'BGR8':
-                image = cv2.cvtColor(
-                    data.reshape(height, width, 3),
-                    code=cv2.COLOR_BGR2RGB,
-                )
-            elif data_format == 'BGR10':
-                image = cv2.cvtColor(
-                    data.reshape(height, width, 3),
-                    code=cv2.COLOR_BGR2RGB,
-                )
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'BGR12':
+            # Frames are kept at their native bit depth (copied out of the buffer), consumers convert them if
+            # they need to.
+            bit_depth = _BIT_DEPTHS.get(data_format[-2:], 8)
+            if bit_depth == 8:
+                rgb_format = PixelFormat.RGB8
+            else:
+                rgb_format = PixelFormat.RGB16
+
+            if data_format in {'Mono8', 'Mono10', 'Mono12'}:
+                mono_format = PixelFormat.MONO8 if bit_depth == 8 else PixelFormat.MONO16
+                return Frame(np.array(data), mono_format, bit_depth)
+            elif data_format in {'RGB8', 'RGB10', 'RGB12'}:
+                return Frame(data.reshape(height, width, 3).copy(), rgb_format, bit_depth)
+            elif data_format in {'BGR8', 'BGR10', 'BGR12'}:
                 image = cv2.cvtColor(
                     data.reshape(height, width, 3),
                     code=cv2.COLOR_BGR2RGB,
                 )
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format in {'BayerGR8', 'BayerRG8', 'BayerBG8', 'BayerGB8'}:
-                image = cv2.cvtColor(
-                    data,
-                    # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR8': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG8': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG8': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB8': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
-                )
-            elif data_format in {'BayerGR10', 'BayerRG10', 'BayerBG10', 'BayerGB10'}:
+                return Frame(image, rgb_format, bit_depth)
+            elif data_format in {'BayerGR8', 'BayerRG8', 'BayerBG8', 'BayerGB8',
+                                 'BayerGR10', 'BayerRG10', 'BayerBG10', 'BayerGB10',
+                                 'BayerGR12', 'BayerRG12', 'BayerBG12', 'BayerGB12'}:
                 image = cv2.cvtColor(
                     data,
                     # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR10': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG10': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG10': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB10': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
+                    code={'BayerGR': cv2.COLOR_BayerGB2RGB,
+                          'BayerRG': cv2.COLOR_BayerBG2RGB,
+                          'BayerBG': cv2.COLOR_BayerRG2RGB,
+                          'BayerGB': cv2.COLOR_BayerGR2RGB,
+                    }[data_format[:7]]
                 )
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format in {'BayerGR12', 'BayerRG12', 'BayerBG12', 'BayerGB12'}:
-                image = cv2.cvtColor(
-                    data,
-                    # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR12': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG12': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG12': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB12': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
-                )
-                image = (image/4095*255).astype(np.uint8)
+                return Frame(image, rgb_format, bit_depth)
             else:
                 raise CameraCaptureError('Unsupported pixel format {}'.format(data_format))
 
-            return image
-
     def get_image_size_hint(self) -> Optional[Tuple[int, int]]:
         if not hasattr(self, '_hacquirer'): return
 
@@ -26,7 +26,9 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Sequence, Tuple, Optional
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Hashable, Sequence, Tuple, Optional, Union, overload
 
 import numpy as np
 
@@ -48,22 +50,14 @@ class ImageSequenceAcquirer(ImageAcquirer):
         if len(images) == 0:
             raise ValueError("'_images' can't be empty")
 
-        frame_interval = self.bn_frame_interval.get()
-        if frame_interval is None or frame_interval <= 0:
-            if len(images) == 1:
-                # Since only one image, we don't care about the frame_interval.
-                frame_interval = 0
-            else:
-                raise ValueError(
-                    "'frame_interval' must be > 0 and not None, currently: '{}'"
-                    .format(frame_interval)
-                )
+        frame_interval = self._get_frame_interval(len(images))
 
         input_images = []
 
-        for i, img in enumerate(images):
+        for i in range(len(images)):
             input_image = _BaseImageSequenceInputImage(
-                image=img,
+                images=images,
+                index=i,
                 timestamp=i * frame_interval
             )
             input_image.is_replicated = self.IS_REPLICATED
@@ -71,6 +65,20 @@ class ImageSequenceAcquirer(ImageAcquirer):
 
         return input_images
 
+    def _get_frame_interval(self, num_images: int) -> float:
+        frame_interval = self.bn_frame_interval.get()
+        if frame_interval is None or frame_interval <= 0:
+            if num_images == 1:
+                # Since only one image, we don't care about the frame_interval.
+                frame_interval = 0
+            else:
+                raise ValueError(
+                    "'frame_interval' must be > 0 and not None, currently: '{}'"
+                    .format(frame_interval)
+                )
+
+        return frame_interval
+
     def get_image_size_hint(self) -> Optional[Tuple[int, int]]:
         images = self.bn_images.get()
         if images is None or len(images) == 0:
@@ -81,9 +89,69 @@ class ImageSequenceAcquirer(ImageAcquirer):
 
 
 class _BaseImageSequenceInputImage(InputImage):
-    def __init__(self, image: np.ndarray, timestamp: float) -> None:
-        self._image = image
+    def __init__(self, images: Sequence[np.ndarray], index: int, timestamp: float) -> None:
+        self._images = images
+        self._index = index
         self._timestamp = timestamp
 
     async def read(self) -> Tuple[np.ndarray, float]:
-        return self._image, self._timestamp
+        # Indexed when read so images of a LazyImageSequence are only loaded when needed.
+        return self._images[self._index], self._timestamp
+
+
+# Number of images kept loaded by a LazyImageSequence, for stepping back and forth between images in the preview.
+FRAME_CACHE_SIZE = 8
+
+
+class LazyImageSequence(Sequence[np.ndarray]):
+    """A sequence of images that are loaded on demand from their `sources` (e.g. file paths) by `load`. Only the
+    most recently accessed images are kept, so memory use does not grow with the length of the sequence."""
+
+    def __init__(
+            self,
+            sources: Sequence[Hashable],
+            load: Callable[[Any], np.ndarray],
+            cache_size: int = FRAME_CACHE_SIZE
+    ) -> None:
+        self.sources = tuple(sources)
+        self._load = load
+        self._cache_size = cache_size
+
+        self._cache = OrderedDict()  # type: OrderedDict[Hashable, np.ndarray]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @overload
+    def __getitem__(self, index: int) -> np.ndarray: ...
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[np.ndarray]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[np.ndarray, Sequence[np.ndarray]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+
+        source = self.sources[index]
+        image = self.load(index)
+
+        with self._lock:
+            self._cache[source] = image
+            self._cache.move_to_end(source)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return image
+
+    def load(self, index: int) -> np.ndarray:
+        """Return the image at `index`, loading it if it is not cached, without adding it to the cache. Can be
+        called from any thread, e.g. to load images for analysis without evicting the ones being previewed."""
+        source = self.sources[index]
+
+        with self._lock:
+            image = self._cache.get(source)
+
+        if image is None:
+            image = self._load(source)
+
+        return image
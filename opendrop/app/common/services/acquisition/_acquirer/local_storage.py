@@ -25,15 +25,29 @@
 # should have received a copy of the GNU General Public License along
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
-
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
 from pathlib import Path
-from typing import Union, Sequence, MutableSequence
+from typing import Union, Sequence, MutableSequence, Tuple
 
 import cv2
 import numpy as np
 
+from opendrop.frame import Frame, PixelFormat
 from opendrop.utility.bindable import VariableBindable
-from .image_sequence import ImageSequenceAcquirer
+from .base import InputImage
+from .decode import DecodeQueue, DecodedInputImage
+from .frame_stack import FrameStack, is_frame_stack
+from .image_sequence import ImageSequenceAcquirer, LazyImageSequence
+
+
+# cv2.imread() releases the GIL, so images are decoded in parallel by a pool of threads.
+DECODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Most images decoded for analyses and not yet released by them, so decoding doesn't run far ahead of analysis.
+MAX_DECODED_IMAGES = 16
 
 
 class LocalStorageAcquirer(ImageSequenceAcquirer):
@@ -41,22 +55,78 @@ class LocalStorageAcquirer(ImageSequenceAcquirer):
 
     def __init__(self) -> None:
         super().__init__()
+        self._loop = asyncio.get_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix='ImageDecoder')
+
         self.bn_last_loaded_paths = VariableBindable(tuple())  # type: VariableBindable[Sequence[Path]]
 
     def load_image_paths(self, image_paths: Sequence[Union[Path, str]]) -> None:
+        """Use the images at `image_paths` as the image sequence. Only the paths are kept, images are decoded when
+        they are previewed or analysed. Frame stacks (.npy files, raw dumps and TIFF files) contribute all their
+        frames, which are memory-mapped instead of decoded."""
         # Sort image paths in lexicographic order, and ignore paths to directories.
         image_paths = sorted([p for p in map(Path, image_paths) if not p.is_dir()])
 
-        images: MutableSequence[np.ndarray] = []
+        sources = []  # type: MutableSequence[Union[Path, Tuple[FrameStack, int]]]
         for image_path in image_paths:
-            # Load in grayscale to save memory.
-            image = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-            if image is None:
+            if is_frame_stack(image_path):
+                # Only reads the file header, raises ValueError if the stack can't be opened.
+                stack = FrameStack(image_path)
+                sources.extend((stack, i) for i in range(len(stack)))
+            elif cv2.haveImageReader(str(image_path)):
+                # Only reads the file header.
+                sources.append(image_path)
+            else:
                 raise ValueError(f"Failed to load image from '{image_path}'")
 
-            image.flags.writeable = False
+        self.bn_images.set(LazyImageSequence(sources, _load_image))
+        self.bn_last_loaded_paths.set(tuple(image_paths))
 
-            images.append(image)
+    def acquire_images(self) -> Sequence[InputImage]:
+        images = self.bn_images.get()
+        if len(images) == 0:
+            raise ValueError("'_images' can't be empty")
 
-        self.bn_images.set(images)
-        self.bn_last_loaded_paths.set(tuple(image_paths))
+        frame_interval = self._get_frame_interval(len(images))
+
+        # Images are decoded in order, as analyses release earlier ones.
+        queue = DecodeQueue(self._executor, MAX_DECODED_IMAGES)
+
+        input_images = []
+
+        for i in range(len(images)):
+            input_image = DecodedInputImage(
+                functools.partial(_read_image, images, i, i * frame_interval),
+                queue=queue,
+                loop=self._loop,
+            )
+            input_image.is_replicated = self.IS_REPLICATED
+            input_images.append(input_image)
+
+        return input_images
+
+    def destroy(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def _read_image(images: LazyImageSequence, index: int, timestamp: float) -> Tuple[np.ndarray, float]:
+    return images.load(index), timestamp
+
+
+def _load_image(source: Union[Path, Tuple[FrameStack, int]]) -> np.ndarray:
+    if isinstance(source, tuple):
+        stack, index = source
+        return stack[index]
+    else:
+        return _decode_image(source)
+
+
+def _decode_image(image_path: Path) -> np.ndarray:
+    # Load in grayscale to save memory.
+    image = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError(f"Failed to load image from '{image_path}'")
+
+    image.flags.writeable = False
+
+    return Frame(image, PixelFormat.MONO8)
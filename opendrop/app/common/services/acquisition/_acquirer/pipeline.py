@@ -0,0 +1,132 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import collections
+from enum import Enum
+import time
+from typing import Deque, Set
+
+from opendrop.utility.bindable import VariableBindable
+
+
+class Backpressure(Enum):
+    # Capture frames late, once there is room.
+    BLOCK = 'Block'
+    # Capture frames on time and drop the oldest frame waiting for analysis.
+    DROP_OLDEST = 'Drop oldest'
+    # Skip captures while full, lowering the frame rate to what analysis keeps up with.
+    DOWNSAMPLE = 'Downsample'
+
+    def __init__(self, display_name: str) -> None:
+        self.display_name = display_name
+
+
+class FramePipeline:
+    """Bounds the camera frames waiting to be analysed.
+
+    A frame is in flight from when it is handed to its consumer (its InputImage.read() returns) until the consumer
+    releases it. At most `capacity` frames are in flight, captured frames wait in a queue of at most `capacity`
+    frames for their turn. When a frame is due to be captured while the queue is full, `policy` decides what
+    happens.
+
+    Metrics are exposed as bindables: bn_queue_depth is the number of frames waiting (captured, or due to be
+    captured under BLOCK), bn_in_flight the number of frames in flight, bn_lag how long after its scheduled
+    capture time the last frame was handed to its consumer, and bn_dropped the number of frames dropped.
+    """
+
+    def __init__(self, capacity: int = 8, policy: Backpressure = Backpressure.BLOCK) -> None:
+        self.bn_capacity = VariableBindable(capacity)
+        self.bn_policy = VariableBindable(policy)
+
+        self.bn_queue_depth = VariableBindable(0)
+        self.bn_in_flight = VariableBindable(0)
+        self.bn_lag = VariableBindable(0.0)
+        self.bn_dropped = VariableBindable(0)
+
+        self._blocked: Deque['_BaseCameraInputImage'] = collections.deque()
+        self._queue: Deque['_BaseCameraInputImage'] = collections.deque()
+        self._in_flight: Set['_BaseCameraInputImage'] = set()
+
+    def due(self, image: '_BaseCameraInputImage') -> None:
+        """Called when `image` is scheduled to be captured."""
+        capacity = max(1, self.bn_capacity.get())
+        policy = self.bn_policy.get()
+
+        if len(self._queue) < capacity:
+            self._capture(image)
+        elif policy is Backpressure.BLOCK:
+            self._blocked.append(image)
+        elif policy is Backpressure.DROP_OLDEST:
+            self._drop(self._queue.popleft())
+            self._capture(image)
+        else:
+            self._drop(image)
+
+        self._flush()
+
+    def release(self, image: '_BaseCameraInputImage') -> None:
+        """Called when the consumer of `image` is done with it."""
+        self.discard(image)
+
+    def discard(self, image: '_BaseCameraInputImage') -> None:
+        """Forget `image` wherever it is in the pipeline."""
+        if image in self._in_flight:
+            self._in_flight.remove(image)
+        elif image in self._queue:
+            self._queue.remove(image)
+        elif image in self._blocked:
+            self._blocked.remove(image)
+        else:
+            return
+
+        self._flush()
+
+    def _capture(self, image: '_BaseCameraInputImage') -> None:
+        if image.capture():
+            self._queue.append(image)
+
+    def _drop(self, image: '_BaseCameraInputImage') -> None:
+        image.drop()
+        self.bn_dropped.set(self.bn_dropped.get() + 1)
+
+    def _flush(self) -> None:
+        capacity = max(1, self.bn_capacity.get())
+
+        while True:
+            if self._queue and len(self._in_flight) < capacity:
+                image = self._queue.popleft()
+                self._in_flight.add(image)
+                self.bn_lag.set(max(0.0, time.time() - image.est_ready))
+                image.deliver()
+            elif self._blocked and len(self._queue) < capacity:
+                self._capture(self._blocked.popleft())
+            else:
+                break
+
+        self.bn_queue_depth.set(len(self._queue) + len(self._blocked))
+        self.bn_in_flight.set(len(self._in_flight))
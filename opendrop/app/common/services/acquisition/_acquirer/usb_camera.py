@@ -30,8 +30,8 @@ import time
 from typing import Tuple, Optional
 
 import cv2
-import numpy as np
 
+from opendrop.frame import Frame, PixelFormat
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.events import EventConnection
 from .camera import CameraAcquirer, Camera, CameraCaptureError
@@ -138,13 +138,13 @@ class USBCamera(Camera):
         else:
             return False
 
-    def capture(self) -> np.ndarray:
+    def capture(self) -> Frame:
         start_time = time.time()
         while self._vc.isOpened() and (time.time() - start_time) < self._CAPTURE_TIMEOUT:
             success, image = self._vc.read()
 
             if success:
-                return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                return Frame(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), PixelFormat.RGB8)
 
         self.release()
         raise CameraCaptureError
@@ -0,0 +1,291 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import math
+from pathlib import Path
+import threading
+from typing import MutableSequence, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from opendrop.frame import Frame, PixelFormat
+from opendrop.utility.bindable import VariableBindable
+from opendrop.utility.bindable.typing import Bindable
+from .base import InputImage
+from .decode import DecodeQueue, DecodedInputImage
+from .image_sequence import ImageSequenceAcquirer, LazyImageSequence
+
+
+# Most frames decoded for analyses and not yet released by them, so decoding doesn't run far ahead of analysis.
+MAX_DECODED_FRAMES = 16
+
+
+class VideoFileAcquirer(ImageSequenceAcquirer):
+    """Acquires frames of a video file, every `bn_stride`'th frame between `bn_start_time` and `bn_end_time`
+    (seconds, None for the start or end of the video). Frames are timestamped with their presentation time in the
+    video.
+
+    Frames are decoded by a single thread, in order, while they are analysed. The preview seeks to the frame
+    shown."""
+
+    IS_REPLICATED = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._loop = asyncio.get_event_loop()
+
+        # Frames of a video can only be decoded one after another.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='VideoDecoder')
+
+        self._video = None  # type: Optional[_VideoFile]
+        self._streams = []  # type: MutableSequence[_VideoStream]
+
+        self.bn_last_loaded_path = VariableBindable(None)  # type: Bindable[Optional[Path]]
+        self.bn_duration = VariableBindable(None)  # type: Bindable[Optional[float]]
+
+        self.bn_stride = VariableBindable(1)  # type: Bindable[Optional[int]]
+        self.bn_start_time = VariableBindable(None)  # type: Bindable[Optional[float]]
+        self.bn_end_time = VariableBindable(None)  # type: Bindable[Optional[float]]
+
+        self.bn_stride.on_changed.connect(self._update_images)
+        self.bn_start_time.on_changed.connect(self._update_images)
+        self.bn_end_time.on_changed.connect(self._update_images)
+
+    def load_video_path(self, video_path: Union[Path, str]) -> None:
+        """Open the video at `video_path`. Only its properties are read, frames are decoded when they are
+        previewed or analysed."""
+        video_path = Path(video_path)
+
+        video = _VideoFile(video_path)
+
+        if self._video is not None:
+            self._video.close()
+
+        self._video = video
+
+        self.bn_duration.set(video.duration)
+        self._update_images()
+        self.bn_last_loaded_path.set(video_path)
+
+    def _update_images(self) -> None:
+        try:
+            indices = self._get_frame_indices()
+        except ValueError:
+            indices = range(0)
+
+        if self._video is None:
+            self.bn_images.set(tuple())
+        else:
+            self.bn_images.set(LazyImageSequence(indices, self._video.read_image))
+
+    def _get_frame_indices(self) -> Sequence[int]:
+        if self._video is None:
+            raise ValueError('No video loaded')
+
+        stride = self.bn_stride.get()
+        if stride is None or stride <= 0:
+            raise ValueError(
+                "'stride' must be > 0 and not None, currently: '{}'"
+                .format(stride)
+            )
+
+        start_time = self.bn_start_time.get()
+        end_time = self.bn_end_time.get()
+        if start_time is not None and end_time is not None and end_time < start_time:
+            raise ValueError(
+                "'end_time' must not be before 'start_time', currently: '{}' and '{}'"
+                .format(end_time, start_time)
+            )
+
+        return self._video.frame_indices(start_time, end_time, stride)
+
+    def acquire_images(self) -> Sequence[InputImage]:
+        indices = self._get_frame_indices()
+        if len(indices) == 0:
+            raise ValueError('No frames in the selected time range')
+
+        stream = _VideoStream(self._video.path, last_index=indices[-1])
+        self._streams.append(stream)
+
+        # Frames are decoded in order, as analyses release earlier ones.
+        queue = DecodeQueue(self._executor, MAX_DECODED_FRAMES)
+
+        input_images = []
+
+        for index in indices:
+            input_image = DecodedInputImage(
+                functools.partial(stream.read, index),
+                queue=queue,
+                loop=self._loop,
+            )
+            input_image.is_replicated = self.IS_REPLICATED
+            input_images.append(input_image)
+
+        return input_images
+
+    def get_image_size_hint(self) -> Optional[Tuple[int, int]]:
+        if self._video is None:
+            return None
+
+        return self._video.size
+
+    def destroy(self) -> None:
+        if self._video is not None:
+            self._video.close()
+
+        for stream in self._streams:
+            self._executor.submit(stream.close)
+
+        self._executor.shutdown(wait=False)
+
+
+class _VideoFile:
+    """Properties of a video file, and random access to its frames for the preview."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+        self._capture = _open_capture(path)
+        self._lock = threading.Lock()
+        self._next_index = 0
+
+        self.fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self.num_frames = int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.size = (
+            int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+
+        if not self.fps > 0 or self.num_frames <= 0:
+            self._capture.release()
+            raise ValueError(f"Failed to read the frame rate and frame count of '{path}'")
+
+        self.duration = self.num_frames / self.fps
+
+    def frame_indices(self, start_time: Optional[float], end_time: Optional[float], stride: int) -> range:
+        """Return the indices of every `stride`'th frame between `start_time` and `end_time`, estimated from the
+        frame rate."""
+        first = 0
+        last = self.num_frames - 1
+
+        if start_time is not None:
+            first = max(first, math.ceil(start_time * self.fps - 1e-6))
+        if end_time is not None:
+            last = min(last, math.floor(end_time * self.fps + 1e-6))
+
+        return range(first, last + 1, stride)
+
+    def read_image(self, index: int) -> np.ndarray:
+        with self._lock:
+            if index != self._next_index:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+            success, image = self._capture.read()
+            self._next_index = index + 1
+
+        if not success:
+            raise ValueError(f"Failed to read frame {index} from '{self.path}'")
+
+        return _to_frame(image)
+
+    def close(self) -> None:
+        with self._lock:
+            self._capture.release()
+
+
+class _VideoStream:
+    """Reads frames of a video in increasing order. Frames in between are skipped with grab(), without being
+    retrieved. Only used from the decoder thread."""
+
+    def __init__(self, path: Path, last_index: int) -> None:
+        self._path = path
+        self._last_index = last_index
+
+        self._capture = None  # type: Optional[cv2.VideoCapture]
+        self._next_index = 0
+
+    def read(self, index: int) -> Tuple[np.ndarray, float]:
+        if self._capture is None:
+            self._capture = _open_capture(self._path)
+
+        try:
+            if index < self._next_index or self._next_index == 0 and index > 0:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+                self._next_index = index
+
+            while self._next_index < index:
+                if not self._capture.grab():
+                    raise ValueError(f"Failed to read frame {index} from '{self._path}'")
+                self._next_index += 1
+
+            success, image = self._capture.read()
+            if not success:
+                raise ValueError(f"Failed to read frame {index} from '{self._path}'")
+            self._next_index += 1
+
+            # Presentation time of the frame, in seconds.
+            timestamp = self._capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        except ValueError:
+            self.close()
+            raise
+
+        if index >= self._last_index:
+            self.close()
+
+        return _to_frame(image), timestamp
+
+    def close(self) -> None:
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+            self._next_index = 0
+
+
+def _open_capture(path: Path) -> cv2.VideoCapture:
+    # Decode in software so frames and timestamps don't depend on the machine's video hardware.
+    capture = cv2.VideoCapture(
+        str(path),
+        cv2.CAP_ANY,
+        (cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE),
+    )
+
+    if not capture.isOpened():
+        raise ValueError(f"Failed to open video '{path}'")
+
+    return capture
+
+
+def _to_frame(image: np.ndarray) -> np.ndarray:
+    # Convert to grayscale to save memory, like images loaded from files.
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    image.flags.writeable = False
+
+    return Frame(image, PixelFormat.MONO8)
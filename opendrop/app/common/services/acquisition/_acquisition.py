@@ -31,7 +31,7 @@ from typing import Optional, Tuple, Sequence
 
 from injector import singleton
 
-from ._acquirer import ImageAcquirer, InputImage, LocalStorageAcquirer, USBCameraAcquirer, GenicamAcquirer
+from ._acquirer import ImageAcquirer, InputImage, LocalStorageAcquirer, VideoFileAcquirer, USBCameraAcquirer, GenicamAcquirer
 from opendrop.utility.bindable import AccessorBindable
 
 
@@ -51,6 +51,8 @@ class ImageAcquisitionService:
 
         if isinstance(acquirer, LocalStorageAcquirer):
             return AcquirerType.LOCAL_STORAGE
+        elif isinstance(acquirer, VideoFileAcquirer):
+            return AcquirerType.VIDEO_FILE
         elif isinstance(acquirer, USBCameraAcquirer):
             return AcquirerType.USB_CAMERA
         elif isinstance(acquirer, GenicamAcquirer):
@@ -71,6 +73,8 @@ class ImageAcquisitionService:
 
         if acquirer_type is AcquirerType.LOCAL_STORAGE:
             new_acquirer = LocalStorageAcquirer()
+        elif acquirer_type is AcquirerType.VIDEO_FILE:
+            new_acquirer = VideoFileAcquirer()
         elif acquirer_type is AcquirerType.USB_CAMERA:
             new_acquirer = USBCameraAcquirer()
         elif acquirer_type is AcquirerType.GENICAM:
@@ -115,6 +119,7 @@ class ImageAcquisitionService:
 
 class AcquirerType(Enum):
     LOCAL_STORAGE = ('Filesystem',)
+    VIDEO_FILE = ('Video file',)
     USB_CAMERA = ('cv2.VideoCapture',)
     GENICAM = ('GenICam',)
 
@@ -0,0 +1,293 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import collections
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+import math
+import os
+import threading
+import time
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from injector import Binder, Module, provider, singleton
+import numpy as np
+
+from opendrop.arena import FrameArena, SharedFrame, call_with_shared_frames, map_frame
+
+
+__all__ = ('WorkerLane', 'WorkerMode', 'WorkerPool', 'WorkerPoolModule')
+
+
+# Seconds after the last preview job was submitted that a worker stays reserved for previews.
+PREVIEW_RESERVE_TIMEOUT = 1.0
+
+# Array arguments at least this large are passed to workers through shared memory instead of being pickled.
+SHARED_FRAME_MIN_BYTES = 2**16
+
+
+class WorkerLane(Enum):
+    PREVIEW = 'preview'
+    ANALYSIS = 'analysis'
+
+
+class WorkerMode(Enum):
+    # Jobs run in worker processes, images are passed through shared memory.
+    PROCESS = 'process'
+    # Jobs run in threads of this process. Only worthwhile where the work releases the GIL, and opt-in: it has
+    # only been benchmarked on a single CPU, where it can't show whether threads scale as well as processes.
+    THREAD = 'thread'
+
+
+class WorkerPool:
+    """Pool of worker processes shared by the analysis services of a session.
+
+    Jobs wait in a queue for their lane and are only handed to the process pool when a worker is free, taking
+    turns between lanes so neither lane is starved. While previews are being requested (and there is more than
+    one worker), one worker is kept free of analysis jobs so previews don't wait behind a long batch analysis.
+    Jobs can be cancelled until they are handed to a worker.
+
+    A job submitted with a `supersede` key replaces any job in the same lane and with the same key that is still
+    waiting, e.g. the preview of an older frame. The replaced job is cancelled. Only one job with a given key
+    runs at a time, so a stream of frames keeps at most one job running and the newest one waiting.
+
+    In PROCESS mode, large array arguments (i.e. images) are copied into a shared memory FrameArena when the job is
+    handed to a worker, and the worker reads them from there. Their slots are released when the job finishes. In
+    THREAD mode, jobs get their arguments as is.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mode: WorkerMode = WorkerMode.PROCESS) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mode = mode
+
+        if mode is WorkerMode.PROCESS:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._arena = FrameArena(max_free=2*self.max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._arena = None
+        self._lock = threading.Lock()
+        self._queues: Dict[WorkerLane, Deque[_Job]] = {lane: collections.deque() for lane in WorkerLane}
+        self._next_lanes = collections.deque(WorkerLane)
+        self._running: Dict[WorkerLane, int] = {lane: 0 for lane in WorkerLane}
+        self._running_keys: Set[Hashable] = set()
+        self._last_preview = -math.inf
+        self._shutdown = False
+
+    def submit(
+            self,
+            fn: Callable,
+            *args,
+            lane: WorkerLane = WorkerLane.ANALYSIS,
+            supersede: Optional[Hashable] = None,
+            prepare: Optional[Callable[[], dict]] = None,
+            **kwargs
+    ) -> Future:
+        """Schedule fn(*args, **kwargs) to run in a worker process and return a future for its result.
+
+        If given, `prepare` is called when the job is handed to a worker, from whichever thread hands it over, and
+        the keyword arguments it returns are added to `kwargs`. Use it for arguments that depend on the results of
+        earlier jobs, which may finish while this one is waiting."""
+        fut = Future()
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('Cannot submit jobs after shutdown')
+
+            queue = self._queues[lane]
+            if supersede is not None:
+                superseded = [job for job in queue if job.key == supersede]
+                queue = self._queues[lane] = collections.deque(job for job in queue if job.key != supersede)
+            else:
+                superseded = []
+
+            queue.append(_Job(fut, fn, args, kwargs, supersede, prepare))
+
+            if lane is WorkerLane.PREVIEW:
+                self._last_preview = time.monotonic()
+
+        for job in superseded:
+            job.fut.cancel()
+
+        self._dispatch()
+
+        return fut
+
+    def shutdown(self) -> None:
+        """Cancel jobs that haven't started and wait for running jobs to finish."""
+        with self._lock:
+            self._shutdown = True
+            pending = [job.fut for queue in self._queues.values() for job in queue]
+            for queue in self._queues.values():
+                queue.clear()
+
+        for fut in pending:
+            fut.cancel()
+
+        self._executor.shutdown()
+        if self._arena is not None:
+            self._arena.close()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                lane, job = self._next_job()
+                if job is None:
+                    return
+                self._running[lane] += 1
+                if job.key is not None:
+                    self._running_keys.add(job.key)
+
+            shared: List[SharedFrame] = []
+            try:
+                kwargs = job.kwargs
+                if job.prepare is not None:
+                    kwargs = {**kwargs, **job.prepare()}
+
+                if self._arena is not None:
+                    args = tuple(self._share(arg, shared) for arg in job.args)
+                    kwargs = {k: self._share(v, shared) for k, v in kwargs.items()}
+                    worker_fut = self._executor.submit(call_with_shared_frames, job.fn, args, kwargs)
+                else:
+                    worker_fut = self._executor.submit(job.fn, *job.args, **kwargs)
+            except Exception as exc:
+                # E.g. `prepare` failed, shared memory is exhausted, or the executor was shut down or is broken.
+                self._finish(lane, job, shared)
+                job.fut.set_exception(exc)
+                continue
+
+            worker_fut.add_done_callback(
+                lambda worker_fut, lane=lane, job=job, shared=shared: self._job_done(lane, job, worker_fut, shared)
+            )
+
+    def _share(self, arg, shared: List[SharedFrame]):
+        if not isinstance(arg, np.ndarray) or arg.dtype.hasobject or arg.nbytes < SHARED_FRAME_MIN_BYTES:
+            return arg
+
+        # Images memory-mapped from a file are mapped again by the worker instead of being copied.
+        mapped = map_frame(arg)
+        if mapped is not None:
+            return mapped
+
+        frame = self._arena.put(arg)
+        shared.append(frame)
+
+        return frame
+
+    def _next_job(self) -> Tuple[Optional[WorkerLane], Optional['_Job']]:
+        if self._shutdown or sum(self._running.values()) >= self.max_workers:
+            return None, None
+
+        for _ in range(len(self._next_lanes)):
+            lane = self._next_lanes[0]
+            self._next_lanes.rotate(-1)
+
+            if lane is WorkerLane.ANALYSIS and self._running[lane] >= max(1, self.max_workers - 1) \
+                    and time.monotonic() - self._last_preview < PREVIEW_RESERVE_TIMEOUT:
+                # Keep a worker free for previews.
+                continue
+
+            queue = self._queues[lane]
+            for job in list(queue):
+                if job.key is not None and job.key in self._running_keys:
+                    continue
+
+                queue.remove(job)
+                # Skip jobs cancelled while waiting.
+                if job.fut.set_running_or_notify_cancel():
+                    return lane, job
+
+        return None, None
+
+    def _job_done(self, lane: WorkerLane, job: '_Job', worker_fut: Future, shared: List[SharedFrame]) -> None:
+        fut = job.fut
+
+        self._finish(lane, job, shared)
+
+        if worker_fut.cancelled():
+            # Only happens on shutdown.
+            fut.set_exception(RuntimeError('Worker pool was shut down'))
+        elif worker_fut.exception() is not None:
+            fut.set_exception(worker_fut.exception())
+        else:
+            fut.set_result(worker_fut.result())
+
+        self._dispatch()
+
+    def _finish(self, lane: WorkerLane, job: '_Job', shared: List[SharedFrame]) -> None:
+        with self._lock:
+            self._running[lane] -= 1
+            self._running_keys.discard(job.key)
+
+        for frame in shared:
+            self._arena.release(frame)
+
+
+class _Job:
+    # Compared by identity, arguments may be arrays.
+    def __init__(
+            self,
+            fut: Future,
+            fn: Callable,
+            args: tuple,
+            kwargs: dict,
+            key: Optional[Hashable],
+            prepare: Optional[Callable[[], dict]],
+    ) -> None:
+        self.fut = fut
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.prepare = prepare
+
+
+class WorkerPoolModule(Module):
+    """Binds a session-wide WorkerPool with `max_workers` workers (one per CPU by default) running in `mode`.
+
+    Unless given, the mode and number of workers are read at startup from the OPENDROP_WORKER_MODE ('process' or
+    'thread') and OPENDROP_MAX_WORKERS environment variables. The mode defaults to PROCESS; THREAD is opt-in.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mode: Optional[WorkerMode] = None) -> None:
+        if max_workers is None and os.environ.get('OPENDROP_MAX_WORKERS'):
+            max_workers = int(os.environ['OPENDROP_MAX_WORKERS'])
+
+        if mode is None:
+            mode = WorkerMode(os.environ.get('OPENDROP_WORKER_MODE', WorkerMode.PROCESS.value))
+
+        self._max_workers = max_workers
+        self._mode = mode
+
+    def configure(self, binder: Binder) -> None:
+        pass
+
+    @singleton
+    @provider
+    def provide_worker_pool(self) -> WorkerPool:
+        return WorkerPool(max_workers=self._max_workers, mode=self._mode)
@@ -63,6 +63,8 @@ class ConanPreviewPluginView(View['ConanPreviewPluginPresenter', None]):
         self._features_artist = ImageArtist()
         self._canvas.add_artist(self._features_artist, z_index=z_index)
 
+        self._canvas_size_allocate_id = self._canvas.connect('size-allocate', self._canvas_size_allocate)
+
         self.presenter.view_ready()
 
     def set_image(self, image: Optional[np.ndarray]) -> None:
@@ -84,7 +86,7 @@ class ConanPreviewPluginView(View['ConanPreviewPluginPresenter', None]):
             self._features_artist.clear_data()
             return
 
-        if features.labels is None:
+        if features.labels is None or features.labels.size == 0:
             self._features_artist.clear_data()
             return
 
@@ -100,7 +102,7 @@ class ConanPreviewPluginView(View['ConanPreviewPluginPresenter', None]):
         width = features.labels.shape[1]
         height = features.labels.shape[0]
 
-        self._features_artist.extents = Rect2(0, 0, width, height)
+        self._features_artist.extents = Rect2(position=features.labels_position, size=(width, height))
         self._features_artist.set_data(data, cairo.Format.ARGB32, width, height)
 
     def show_image_sequence_navigator(self) -> None:
@@ -127,9 +129,14 @@ class ConanPreviewPluginView(View['ConanPreviewPluginPresenter', None]):
 
         self._image_sequence_navigator_cid = None
 
+    def _canvas_size_allocate(self, *_) -> None:
+        # Canvas scale is updated on allocation.
+        self.presenter.canvas_zoom_changed(self._canvas.get_scale())
+
     def _do_destroy(self) -> None:
         self._canvas.remove_artist(self._image_artist)
         self._canvas.remove_artist(self._features_artist)
+        self._canvas.disconnect(self._canvas_size_allocate_id)
 
 
 @conan_preview_plugin_cs.presenter(options=['model'])
@@ -173,6 +180,9 @@ class ConanPreviewPluginPresenter(Presenter['ConanPreviewPluginView']):
         else:
             self.view.hide_image_sequence_navigator()
 
+    def canvas_zoom_changed(self, zoom: float) -> None:
+        self._model.set_zoom(zoom)
+
     @property
     def acquirer_controller(self) -> Optional[AcquirerController]:
         return self._model.bn_acquirer_controller.get()
@@ -27,7 +27,8 @@
 
 
 import asyncio
-from typing import Optional, Callable, Hashable
+import functools
+from typing import Optional, Callable
 
 import numpy as np
 
@@ -35,10 +36,12 @@ from opendrop.app.common.services.acquisition import ImageAcquisitionService, Im
 from opendrop.app.common.image_processing.plugins.preview.model import (
     AcquirerController,
     ImageSequenceAcquirerController,
-    CameraAcquirerController
+    CameraAcquirerController,
+    FrameChangeDetector,
 )
 from opendrop.app.conan.services.params import ConanParamsFactory
 from opendrop.app.conan.services.features import ConanFeaturesService, ConanFeatures
+from opendrop.features import pyramid_level
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.bindable.typing import Bindable
 
@@ -65,6 +68,9 @@ class ConanPreviewPluginModel:
         self.bn_source_image = VariableBindable(None)
         self.bn_features = VariableBindable(None)
 
+        # Pyramid level features are extracted at for the preview, chosen from the canvas zoom.
+        self.bn_preview_level = VariableBindable(0)  # type: Bindable[int]
+
         self._image_acquisition.bn_acquirer.on_changed.connect(
             self._update_acquirer_controller,
         )
@@ -77,6 +83,9 @@ class ConanPreviewPluginModel:
         self._watchers -= 1
         self._update_acquirer_controller()
 
+    def set_zoom(self, zoom: float) -> None:
+        self.bn_preview_level.set(pyramid_level(zoom))
+
     def _update_acquirer_controller(self) -> None:
         self._destroy_acquirer_controller()
 
@@ -92,6 +101,7 @@ class ConanPreviewPluginModel:
                 features_service=self._features_service,
                 source_image_out=self.bn_source_image,
                 show_features=self._show_features,
+                preview_level=self.bn_preview_level,
             )
         elif isinstance(new_acquirer, CameraAcquirer):
             new_acquirer_controller = ConanCameraAcquirerController(
@@ -100,6 +110,7 @@ class ConanPreviewPluginModel:
                 features_service=self._features_service,
                 source_image_out=self.bn_source_image,
                 show_features=self._show_features,
+                preview_level=self.bn_preview_level,
             )
         elif new_acquirer is None:
             new_acquirer_controller = None
@@ -137,15 +148,16 @@ class ConanImageSequenceAcquirerController(ImageSequenceAcquirerController):
             features_service: ConanFeaturesService,
             source_image_out: Bindable[Optional[np.ndarray]],
             show_features: Callable,
+            preview_level: Bindable[int],
     ) -> None:
         self._params_factory = params_factory
         self._features_service = features_service
         self._show_features = show_features
+        self._preview_level = preview_level
 
         self.__destroyed = False
 
         self._extracted_features = {}
-        self._images = {}
         self._current_image = None
         self._current_preview = None
 
@@ -156,6 +168,7 @@ class ConanImageSequenceAcquirerController(ImageSequenceAcquirerController):
 
         self._params_factory_changed_id = \
             params_factory.connect('changed', self._params_factory_chagned)
+        self._preview_level_changed_conn = preview_level.on_changed.connect(self._params_factory_chagned)
 
     def _params_factory_chagned(self, *_) -> None:
         for fut in self._extracted_features.values():
@@ -164,26 +177,33 @@ class ConanImageSequenceAcquirerController(ImageSequenceAcquirerController):
         self._extracted_features = {}
         self._queue_update_preview()
 
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
-        self._images[image_id] = image
+    def _on_images_changed(self) -> None:
+        for fut in self._extracted_features.values():
+            fut.cancel()
 
-    def _on_image_deregistered(self, image_id: Hashable) -> None:
-        del self._images[image_id]
-        if image_id in self._extracted_features:
-            del self._extracted_features[image_id]
+        self._extracted_features = {}
+        self._current_image = None
+        self._current_preview = None
 
-    def _on_image_changed(self, image_id: Hashable) -> None:
+    def _on_image_changed(self, image_id: int) -> None:
         self._current_image = image_id
         self._queue_update_preview()
 
     def _queue_update_preview(self, *_) -> None:
-        if self.__destroyed: return
+        if self.__destroyed or self._current_image is None: return
 
         image_id = self._current_image
-        image = self._images[self._current_image]
-
-        if image_id not in self._extracted_features:
-            fut = self._features_service.extract(image, labels=True)
+        image = self._get_image(image_id)
+
+        # Extraction is cancelled if another image's extraction superseded it before it started.
+        if image_id not in self._extracted_features or self._extracted_features[image_id].cancelled():
+            fut = self._features_service.extract(
+                image,
+                labels=True,
+                scale=2.0**-self._preview_level.get(),
+                preview=True,
+                supersede=self,
+            )
             self._extracted_features[image_id] = fut
             fut.add_done_callback(self._queue_update_preview)
 
@@ -205,6 +225,7 @@ class ConanImageSequenceAcquirerController(ImageSequenceAcquirerController):
     def destroy(self) -> None:
         self.__destroyed = True
         self._params_factory.disconnect(self._params_factory_changed_id)
+        self._preview_level_changed_conn.disconnect()
         super().destroy()
 
 
@@ -216,22 +237,33 @@ class ConanCameraAcquirerController(CameraAcquirerController):
             features_service: ConanFeaturesService,
             source_image_out: Bindable[Optional[np.ndarray]],
             show_features: Callable,
+            preview_level: Bindable[int],
     ) -> None:
         self._params_factory = params_factory
         self._features_service = features_service
         self._show_features = show_features
+        self._preview_level = preview_level
 
         self.__destroyed = False
 
         self._extracted_feature_fut = None
+        self._extract_count = 0
+        self._shown_count = 0
+        self._change_detector = FrameChangeDetector()
 
         super().__init__(
             acquirer=acquirer,
             source_image_out=source_image_out,
         )
 
+        self._params_changed_id = params_factory.connect('changed', self._params_changed)
+        self._preview_level_changed_conn = preview_level.on_changed.connect(self._params_changed)
         self._source_image_changed_conn = source_image_out.on_changed.connect(self._source_image_changed)
 
+    def _params_changed(self, *_) -> None:
+        self._change_detector.reset()
+        self._queue_update_preview()
+
     def _source_image_changed(self) -> None:
         self._queue_update_preview()
 
@@ -242,21 +274,33 @@ class ConanCameraAcquirerController(CameraAcquirerController):
         if image is None:
             return
 
-        old = self._extracted_feature_fut
-        if old is not None and not old.done():
+        params = self._params_factory.create()
+
+        # Skip extraction if the frame hasn't changed since it was last analysed, the features shown are still
+        # current.
+        if not self._change_detector.changed(image, [params.roi]):
             return
 
         fut = self._features_service.extract(
             image,
-            self._params_factory.create(),
+            params,
             labels=True,
+            scale=2.0**-self._preview_level.get(),
+            preview=True,
+            supersede=self,
         )
         self._extracted_feature_fut = fut
-        fut.add_done_callback(self._update_preview)
+        self._extract_count += 1
+        fut.add_done_callback(functools.partial(self._update_preview, self._extract_count))
+
+    def _update_preview(self, count: int, fut: asyncio.Future) -> None:
+        if self.__destroyed or fut.cancelled():
+            return
 
-    def _update_preview(self, fut: asyncio.Future) -> None:
-        if fut.cancelled():
+        # Don't replace features of a newer frame.
+        if count < self._shown_count:
             return
+        self._shown_count = count
 
         features = fut.result()
         self._show_features(features)
@@ -265,5 +309,7 @@ class ConanCameraAcquirerController(CameraAcquirerController):
         self.__destroyed = True
         if self._extracted_feature_fut is not None:
             self._extracted_feature_fut.cancel()
+        self._params_factory.disconnect(self._params_changed_id)
+        self._preview_level_changed_conn.disconnect()
         self._source_image_changed_conn.disconnect()
         super().destroy()
@@ -133,6 +133,28 @@ class ConanThreshPluginView(View['ConanThreshPluginPresenter', None]):
             prop_name='value',
         )
 
+        fit_method_lbl = Gtk.Label('Contact fit:', halign=Gtk.Align.START)
+        popover_body.attach(fit_method_lbl, 0, 1, 1, 1)
+
+        fit_method_cmb = Gtk.ComboBoxText(hexpand=True)
+        fit_method_cmb.append('arc', 'Arc')
+        fit_method_cmb.append('polynomial', 'Polynomial')
+        fit_method_cmb.append('young-laplace', 'Young-Laplace (sessile)')
+        popover_body.attach(fit_method_cmb, 1, 1, 2, 1)
+
+        self.bn_fit_method = GObjectPropertyBindable(
+            g_obj=fit_method_cmb,
+            prop_name='active-id',
+        )
+
+        subpixel_chk = Gtk.CheckButton(label='Sub-pixel edges')
+        popover_body.attach(subpixel_chk, 1, 2, 2, 1)
+
+        self.bn_subpixel = GObjectPropertyBindable(
+            g_obj=subpixel_chk,
+            prop_name='active',
+        )
+
         popover_body.show_all()
 
         self.presenter.view_ready()
@@ -161,6 +183,10 @@ class ConanThreshPluginPresenter(Presenter['ConanThreshPluginView']):
                     dst=self.view.bn_thresh,
                     to_dst=lambda x: x*100,
                     to_src=lambda x: x/100),
+            Binding(src=self._model.bn_fit_method,
+                    dst=self.view.bn_fit_method),
+            Binding(src=self._model.bn_subpixel,
+                    dst=self.view.bn_subpixel),
         ])
 
         self.__event_connections.extend([
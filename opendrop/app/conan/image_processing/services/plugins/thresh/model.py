@@ -35,3 +35,5 @@ class ConanThreshPluginModel:
         self._params_factory = params_factory
 
         self.bn_thresh = GObjectPropertyBindable(params_factory, 'thresh')
+        self.bn_fit_method = GObjectPropertyBindable(params_factory, 'fit_method')
+        self.bn_subpixel = GObjectPropertyBindable(params_factory, 'subpixel')
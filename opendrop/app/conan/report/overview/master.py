@@ -114,6 +114,9 @@ class ConanReportOverviewMasterPresenter(Presenter):
         elif status is ConanAnalysisStatus.CANCELLED:
             cell.props.icon_name = 'process-stop'
             cell.props.visible = True
+        elif status is ConanAnalysisStatus.FAILED:
+            cell.props.icon_name = 'dialog-error'
+            cell.props.visible = True
         elif status is not ConanAnalysisStatus.FITTING:
             cell.props.icon_name = ''
             cell.props.visible = True
@@ -11,20 +11,21 @@ import numpy as np
 
 from opendrop.geometry import Vector2, Rect2, Line2
 from opendrop.app.common.services.acquisition import InputImage
+from opendrop.fit import FitError, ContactAngleFitResult as ConanFitResult
 
 from .params import ConanParams, ConanParamsFactory
 from .features import ConanFeatures, ConanFeaturesService
-from .conan import ConanFitResult, ConanFitService
 
 
 class ConanAnalysisStatus(IntEnum):
     WAITING_FOR_IMAGE = 1
-    EXTRACTING_FEATURES = 2
+    # Features are extracted and fitted in the same worker task, so there is no separate extracting state.
     FITTING = 3
 
     TERMINAL = 8
     FINISHED = TERMINAL + 1
     CANCELLED = TERMINAL + 2
+    FAILED = TERMINAL + 3
 
 
 class ConanAnalysisService:
@@ -50,7 +51,6 @@ class ConanAnalysisJob(GObject.GObject):
             params: ConanParams,
             *,
             features_service: ConanFeaturesService,
-            cafit_service: ConanFitService,
     ) -> None:
         super().__init__()
         self._loop = asyncio.get_event_loop()
@@ -59,7 +59,6 @@ class ConanAnalysisJob(GObject.GObject):
 
         self._params = params
         self._features_service = features_service
-        self._cafit_service = cafit_service
 
         self._image = None
         self._timestamp = None
@@ -93,8 +92,7 @@ class ConanAnalysisJob(GObject.GObject):
         self._status = ConanAnalysisStatus.WAITING_FOR_IMAGE
         self._job_start = time.time()
         self._job_end = None
-        self._features = None
-        self._cafit = None
+        self._analysis = None
 
         self._loop.create_task(source.read()).add_done_callback(self._source_read_done)
 
@@ -106,41 +104,46 @@ class ConanAnalysisJob(GObject.GObject):
         if self.done():
             return
 
-        image, timestamp = fut.result()
+        try:
+            image, timestamp = fut.result()
+        except Exception as e:
+            self._fail(e)
+            return
+
         self._image_ready(image, timestamp)
 
     def _image_ready(self, image: np.ndarray, timestamp: float) -> None:
         self._image = image
         self._timestamp = timestamp
 
-        self._features = self._features_service.extract(image, self._params)
-        self._features.add_done_callback(self._features_done)
+        # Features are extracted and fitted by one worker, so the image is only sent once.
+        self._analysis = self._features_service.extract_and_fit(image, self._params)
+        self._analysis.add_done_callback(self._analysis_done)
 
-        self.status = ConanAnalysisStatus.EXTRACTING_FEATURES
+        self.status = ConanAnalysisStatus.FITTING
 
-    def _features_done(self, fut: asyncio.Future) -> None:
+    def _analysis_done(self, fut: asyncio.Future) -> None:
         if fut.cancelled():
             self.cancel()
         
         if self.done():
             return
 
-        features: ConanFeatures = fut.result()
-        self.drop_points = features.drop_points
-
-        self._cafit = self._cafit_service.fit(features.drop_points, self._params)
-        self._cafit.add_done_callback(self._cafit_done)
-
-        self.status = ConanAnalysisStatus.FITTING
-
-    def _cafit_done(self, fut: asyncio.Future) -> None:
-        if fut.cancelled():
-            self.cancel()
-        
-        if self.done():
+        features: ConanFeatures
+        result: ConanFitResult
+        try:
+            features, result = fut.result()
+        except FitError as e:
+            # Keep the extracted profile so the frame can still be inspected.
+            self.drop_points = e.features.drop_points
+            self._fail(e)
+            return
+        except Exception as e:
+            self._fail(e)
             return
 
-        result: ConanFitResult = fut.result()
+        self.drop_points = features.drop_points
+
         self.left_contact = result.left_contact
         self.right_contact = result.right_contact
         self.left_angle = result.left_angle
@@ -167,14 +170,20 @@ class ConanAnalysisJob(GObject.GObject):
         if self.status is ConanAnalysisStatus.WAITING_FOR_IMAGE:
             self._source.cancel()
 
-        if self._features is not None:
-            self._features.cancel()
-
-        if self._cafit is not None:
-            self._cafit.cancel()
+        if self._analysis is not None:
+            self._analysis.cancel()
 
         self.status = ConanAnalysisStatus.CANCELLED
 
+    def _fail(self, exc: Exception) -> None:
+        self._loop.call_exception_handler({
+            'message': 'Contact angle analysis failed',
+            'exception': exc,
+        })
+
+        self.status = ConanAnalysisStatus.FAILED
+        self.job_end = time.time()
+
     @GObject.Property
     def status(self) -> ConanAnalysisStatus:
         return self._status
@@ -182,6 +191,8 @@ class ConanAnalysisJob(GObject.GObject):
     @status.setter
     def status(self, status: ConanAnalysisStatus) -> None:
         self._status = status
+        if self.done():
+            self._source.release()
 
     @GObject.Property
     def job_start(self) -> float:
@@ -1,16 +1,17 @@
 from abc import abstractmethod
 import asyncio
-from concurrent.futures.process import ProcessPoolExecutor
-from typing import Optional, Protocol
+from typing import Hashable, Optional, Protocol
 
 from gi.repository import GObject
 from injector import inject
 import numpy as np
 
+from opendrop.app.common.services.workers import WorkerLane, WorkerPool
 from opendrop.geometry import Line2, Rect2
 from opendrop.features import extract_contact_angle_features, ContactAngleFeatures as ConanFeatures
+from opendrop.fit import extract_and_fit_contact_angle
 
-from .params import ConanParamsFactory
+from .params import ConanParams, ConanParamsFactory
 
 
 __all__ = (
@@ -36,11 +37,15 @@ class ConanFeaturesParams(Protocol):
     @abstractmethod
     def inverted(self) -> bool: ...
 
+    @property
+    @abstractmethod
+    def subpixel(self) -> bool: ...
+
 
 class ConanFeaturesService:
     @inject
-    def __init__(self, default_params_factory: ConanParamsFactory) -> None:
-        self._executor = ProcessPoolExecutor(max_workers=1)
+    def __init__(self, default_params_factory: ConanParamsFactory, workers: WorkerPool) -> None:
+        self._workers = workers
         self._default_params_factory = default_params_factory
 
     def extract(
@@ -48,8 +53,14 @@ class ConanFeaturesService:
             image: np.ndarray,
             params: Optional[ConanFeaturesParams] = None,
             *,
-            labels: bool = False
+            labels: bool = False,
+            scale: float = 1.0,
+            preview: bool = False,
+            supersede: Optional[Hashable] = None,
     ) -> asyncio.Future:
+        """Extract features in a worker. If `preview` is true, the job is scheduled as interactive preview work.
+        A job with a `supersede` key replaces the job with the same key that is still waiting for a worker, if
+        any, whose future is then cancelled."""
         params = params or self._default_params_factory.create()
         params_dict = {
             'baseline': params.baseline,
@@ -57,10 +68,32 @@ class ConanFeaturesService:
             'thresh': params.thresh,
             'roi': params.roi,
             'labels': labels,
+            'subpixel': params.subpixel,
+            'scale': scale,
         }
-        cfut = self._executor.submit(extract_contact_angle_features, image, **params_dict)
+        cfut = self._workers.submit(
+            extract_contact_angle_features,
+            image,
+            **params_dict,
+            lane=WorkerLane.PREVIEW if preview else WorkerLane.ANALYSIS,
+            supersede=supersede,
+        )
         fut = asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
         return fut
 
-    def destroy(self) -> None:
-        self._executor.shutdown()
+    def extract_and_fit(self, image: np.ndarray, params: Optional[ConanParams] = None) -> asyncio.Future:
+        """Extract features and fit the contact angles in the same worker, the future's result is a tuple of
+        (ConanFeatures, ConanFitResult). If only the fit fails, the future's exception is a FitError that holds
+        the extracted features."""
+        params = params or self._default_params_factory.create()
+        params_dict = {
+            'baseline': params.baseline,
+            'inverted': params.inverted,
+            'thresh': params.thresh,
+            'roi': params.roi,
+            'subpixel': params.subpixel,
+            'method': params.fit_method,
+        }
+        cfut = self._workers.submit(extract_and_fit_contact_angle, image, **params_dict)
+        fut = asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
+        return fut
@@ -10,6 +10,8 @@ class ConanParamsFactory(GObject.Object):
     _thresh: float = 0.5
     _inverted: bool = False
     _roi: Optional[Rect2[int]] = None
+    _fit_method: str = 'arc'
+    _subpixel: bool = False
 
     def create(self) -> 'ConanParams':
         return ConanParams(
@@ -17,6 +19,8 @@ class ConanParamsFactory(GObject.Object):
             thresh=self._thresh,
             inverted=self._inverted,
             roi=self._roi,
+            fit_method=self._fit_method,
+            subpixel=self._subpixel,
         )
 
     @GObject.Signal
@@ -59,6 +63,24 @@ class ConanParamsFactory(GObject.Object):
         self._roi = region
         self.changed.emit()
 
+    @GObject.Property
+    def fit_method(self) -> str:
+        return self._fit_method
+
+    @fit_method.setter
+    def fit_method(self, method: str) -> None:
+        self._fit_method = method
+        self.changed.emit()
+
+    @GObject.Property(type=bool, default=False)
+    def subpixel(self) -> bool:
+        return self._subpixel
+
+    @subpixel.setter
+    def subpixel(self, value: bool) -> None:
+        self._subpixel = value
+        self.changed.emit()
+
 
 class ConanParams(NamedTuple):
     """Plain Old Data structure"""
@@ -67,3 +89,5 @@ class ConanParams(NamedTuple):
     thresh: float
     inverted: bool
     roi: Optional[Rect2[int]]
+    fit_method: str = 'arc'
+    subpixel: bool = False
@@ -36,6 +36,7 @@ from injector import inject
 import numpy as np
 import PIL.Image
 
+from opendrop.frame import as_frame
 from opendrop.utility.bindable import VariableBindable
 from opendrop.utility.misc import clear_directory_contents
 from opendrop.app.common.analysis_saver.figure_options import FigureOptions
@@ -140,7 +141,10 @@ def _save_image(job: ConanAnalysisJob, out_file_path: Path) -> None:
         # A copy of the image already exists somewhere, we don't need to save it again.
         return
 
-    image = PIL.Image.fromarray(job.image)
+    image = as_frame(job.image)
+    image = image.convert(image.pixel_format.with_depth(is_16bit=False))
+
+    image = PIL.Image.fromarray(image)
     image.save(out_file_path)
 
 
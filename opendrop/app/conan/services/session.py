@@ -35,10 +35,10 @@ from opendrop.app.common.services.acquisition import (
     AcquirerType,
     ImageAcquisitionService,
 )
+from opendrop.app.common.services.workers import WorkerPool, WorkerPoolModule
 
 from .params import ConanParamsFactory
 from .features import ConanFeaturesService
-from .conan import ConanFitService
 from .analysis import ConanAnalysisJob, ConanAnalysisStatus, ConanAnalysisService
 from .save import ConanSaveParamsFactory, ConanSaveService
 
@@ -49,13 +49,14 @@ EXPLICIT_NOTIFY = GObject.ParamFlags.EXPLICIT_NOTIFY
 
 class ConanSessionModule(Module):
     def configure(self, binder: Binder):
+        binder.install(WorkerPoolModule())
+
         binder.bind(ImageAcquisitionService, scope=singleton)
 
         binder.bind(ConanParamsFactory, scope=singleton)
         binder.bind(ConanSaveParamsFactory, scope=singleton)
 
         binder.bind(ConanFeaturesService, scope=singleton)
-        binder.bind(ConanFitService, scope=singleton)
         binder.bind(ConanSaveService, scope=singleton)
 
         binder.bind(ConanSession, scope=singleton)
@@ -65,20 +66,20 @@ class ConanSession(GObject.Object):
     @inject
     def __init__(
             self,
+            workers: WorkerPool,
             image_acquisition: ImageAcquisitionService,
             features_service: ConanFeaturesService,
-            cafit_service: ConanFitService,
             analysis_service: ConanAnalysisService,
             save_service: ConanSaveService,
     ) -> None:
         self._analyses = ()
         self._analyses_saved = False
 
+        self._workers = workers
         self._image_acquisition = image_acquisition
         self._image_acquisition.use_acquirer_type(AcquirerType.LOCAL_STORAGE)
 
         self._features_service = features_service
-        self._cafit_service = cafit_service
         self._analysis_service = analysis_service
         self._save_service = save_service
 
@@ -150,5 +151,4 @@ class ConanSession(GObject.Object):
     def quit(self) -> None:
         self.clear_analyses()
         self._image_acquisition.destroy()
-        self._features_service.destroy()
-        self._cafit_service.destroy()
+        self._workers.shutdown()
@@ -37,6 +37,7 @@ import cv2
 import numpy as np
 
 from opendrop.app.common.analysis_saver.misc import simple_grapher
+from opendrop.frame import PixelFormat, as_frame
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
 from opendrop.utility.misc import clear_directory_contents
 from .model import IFTAnalysisSaverOptions
@@ -135,7 +136,11 @@ def _save_drop_image(drop: PendantAnalysisJob, out_file_path: Path) -> None:
     if image is None:
         return
 
-    cv2.imwrite(str(out_file_path), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    image = as_frame(image)
+    if image.pixel_format.is_mono:
+        cv2.imwrite(str(out_file_path), image.convert(PixelFormat.MONO8))
+    else:
+        cv2.imwrite(str(out_file_path), cv2.cvtColor(image.convert(PixelFormat.RGB8), cv2.COLOR_RGB2BGR))
 
 
 def _save_drop_params(drop: PendantAnalysisJob, out_file) -> None:
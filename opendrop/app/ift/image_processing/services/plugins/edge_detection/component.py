@@ -73,7 +73,10 @@ class EdgeDetectionPluginView(View['EdgeDetectionPluginPresenter', None]):
         self._popover.add(popover_body)
 
         canny_adjuster = CannyParameters()
-        popover_body.add(canny_adjuster)
+        popover_body.attach(canny_adjuster, 0, 0, 1, 1)
+
+        subpixel_chk = Gtk.CheckButton(label='Sub-pixel edges', margin_top=5)
+        popover_body.attach(subpixel_chk, 0, 1, 1, 1)
 
         self.bn_canny_min = GObjectPropertyBindable(
             g_obj=canny_adjuster,
@@ -85,6 +88,11 @@ class EdgeDetectionPluginView(View['EdgeDetectionPluginPresenter', None]):
             prop_name='max-thresh',
         )
 
+        self.bn_subpixel = GObjectPropertyBindable(
+            g_obj=subpixel_chk,
+            prop_name='active',
+        )
+
         popover_body.show_all()
 
         self.presenter.view_ready()
@@ -114,7 +122,10 @@ class EdgeDetectionPluginPresenter(Presenter['EdgeDetectionPluginView']):
             ),
             self._model.bn_canny_max.bind(
                 self.view.bn_canny_max
-            )
+            ),
+            self._model.bn_subpixel.bind(
+                self.view.bn_subpixel
+            ),
         ])
 
         self.__event_connections.extend([
@@ -36,3 +36,4 @@ class EdgeDetectionPluginModel:
 
         self.bn_canny_min = GObjectPropertyBindable(features_params_factory, 'thresh1')
         self.bn_canny_max = GObjectPropertyBindable(features_params_factory, 'thresh2')
+        self.bn_subpixel = GObjectPropertyBindable(features_params_factory, 'subpixel')
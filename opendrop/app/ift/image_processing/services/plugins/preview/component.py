@@ -38,7 +38,7 @@ from opendrop.app.common.image_processing.plugins.preview import (
     image_sequence_navigator_cs,
 )
 from opendrop.mvp import ComponentSymbol, View, Presenter
-from opendrop.geometry import Rect2
+from opendrop.geometry import Rect2, Vector2
 from opendrop.widgets.canvas import ImageArtist, PolylineArtist
 from opendrop.features import colorize_labels
 from .model import IFTPreviewPluginModel
@@ -66,6 +66,8 @@ class IFTPreviewPluginView(View['IFTPreviewPluginPresenter', None]):
         )
         self._canvas.add_artist(self._needle_artist, z_index=z_index)
 
+        self._canvas_size_allocate_id = self._canvas.connect('size-allocate', self._canvas_size_allocate)
+
         self.presenter.view_ready()
 
     def set_background_image(self, image: Optional[np.ndarray]) -> None:
@@ -82,8 +84,8 @@ class IFTPreviewPluginView(View['IFTPreviewPluginPresenter', None]):
         # Set zoom to minimum, i.e. scale image so it always fits.
         self._canvas.zoom(0)
 
-    def set_labels(self, labels: Optional[np.ndarray]) -> None:
-        if labels is None:
+    def set_labels(self, labels: Optional[np.ndarray], position: Vector2[int]) -> None:
+        if labels is None or labels.size == 0:
             self._features_artist.clear_data()
             return
 
@@ -99,7 +101,7 @@ class IFTPreviewPluginView(View['IFTPreviewPluginPresenter', None]):
         width = labels.shape[1]
         height = labels.shape[0]
 
-        self._features_artist.extents = Rect2(0, 0, width, height)
+        self._features_artist.extents = Rect2(position=position, size=(width, height))
         self._features_artist.set_data(data, cairo.Format.ARGB32, width, height)
 
     def set_needle(self, needle_rect: Optional[Tuple]) -> None:
@@ -142,9 +144,14 @@ class IFTPreviewPluginView(View['IFTPreviewPluginPresenter', None]):
 
         self._image_sequence_navigator_cid = None
 
+    def _canvas_size_allocate(self, *_) -> None:
+        # Canvas scale is updated on allocation.
+        self.presenter.canvas_zoom_changed(self._canvas.get_scale())
+
     def _do_destroy(self) -> None:
         self._canvas.remove_artist(self._bg_artist)
         self._canvas.remove_artist(self._features_artist)
+        self._canvas.disconnect(self._canvas_size_allocate_id)
 
 
 @ift_preview_plugin_cs.presenter(options=['model'])
@@ -182,7 +189,8 @@ class IFTPreviewPluginPresenter(Presenter['IFTPreviewPluginView']):
 
     def _update_labels(self) -> None:
         labels = self._model.bn_labels.get()
-        self.view.set_labels(labels)
+        position = self._model.bn_labels_position.get()
+        self.view.set_labels(labels, position)
 
     def _update_needle(self) -> None:
         needle_rect = self._model.bn_needle_rect.get()
@@ -196,6 +204,9 @@ class IFTPreviewPluginPresenter(Presenter['IFTPreviewPluginView']):
         else:
             self.view.hide_image_sequence_navigator()
 
+    def canvas_zoom_changed(self, zoom: float) -> None:
+        self._model.set_zoom(zoom)
+
     @property
     def acquirer_controller(self) -> Optional[AcquirerController]:
         return self._model.bn_acquirer_controller.get()
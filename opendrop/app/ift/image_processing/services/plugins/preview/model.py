@@ -27,8 +27,9 @@
 
 
 import asyncio
+import functools
 import operator
-from typing import Callable, Optional, Hashable, Tuple
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 
@@ -36,13 +37,16 @@ from opendrop.app.common.services.acquisition import ImageAcquisitionService, Im
 from opendrop.app.common.image_processing.plugins.preview.model import (
     AcquirerController,
     ImageSequenceAcquirerController,
-    CameraAcquirerController
+    CameraAcquirerController,
+    FrameChangeDetector,
 )
 from opendrop.app.ift.services.features import (
     PendantFeaturesParamsFactory,
     PendantFeatures,
     PendantFeaturesService,
 )
+from opendrop.geometry import Vector2
+from opendrop.features import pyramid_level
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.bindable.typing import Bindable
 
@@ -68,9 +72,13 @@ class IFTPreviewPluginModel:
 
         self.bn_source_image = VariableBindable(None)  # type: Bindable[Optional[np.ndarray]]
         self.bn_labels = VariableBindable(None)  # type: Bindable[Optional[np.ndarray]]
+        self.bn_labels_position = VariableBindable(Vector2(0, 0))  # type: Bindable[Vector2[int]]
         self.bn_drop_points = VariableBindable(None)  # type: Bindable[Optional[np.ndarray]]
         self.bn_needle_rect = VariableBindable(None)
 
+        # Pyramid level features are extracted at for the preview, chosen from the canvas zoom.
+        self.bn_preview_level = VariableBindable(0)  # type: Bindable[int]
+
         self._image_acquisition.bn_acquirer.on_changed.connect(
             self._update_acquirer_controller,
         )
@@ -83,6 +91,9 @@ class IFTPreviewPluginModel:
         self._watchers -= 1
         self._update_acquirer_controller()
 
+    def set_zoom(self, zoom: float) -> None:
+        self.bn_preview_level.set(pyramid_level(zoom))
+
     def _update_acquirer_controller(self) -> None:
         self._destroy_acquirer_controller()
 
@@ -98,6 +109,7 @@ class IFTPreviewPluginModel:
                 features_service=self._features_service,
                 out_image=self.bn_source_image,
                 show_features=self._show_features,
+                preview_level=self.bn_preview_level,
             )
         elif isinstance(new_acquirer, CameraAcquirer):
             new_acquirer_controller = IFTCameraAcquirerController(
@@ -106,6 +118,7 @@ class IFTPreviewPluginModel:
                 features_service=self._features_service,
                 out_image=self.bn_source_image,
                 show_features=self._show_features,
+                preview_level=self.bn_preview_level,
             )
         elif new_acquirer is None:
             new_acquirer_controller = None
@@ -125,6 +138,8 @@ class IFTPreviewPluginModel:
             self.bn_needle_rect.set(None)
             return
 
+        # Position first, views redraw when labels change.
+        self.bn_labels_position.set(features.labels_position)
         self.bn_labels.set(features.labels)
         self.bn_drop_points.set(features.drop_points)
         self.bn_needle_rect.set(features.needle_rect)
@@ -147,15 +162,16 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
             features_service: PendantFeaturesService,
             out_image: Bindable,
             show_features: Callable,
+            preview_level: Bindable[int],
     ) -> None:
         self._features_params_factory = features_params_factory
         self._features_service = features_service
         self._show_features = show_features
+        self._preview_level = preview_level
 
         self.__destroyed = False
 
         self._extracted_features = {}
-        self._images = {}
         self._current_image = None
         self._current_preview = None
 
@@ -166,6 +182,7 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
 
         self._features_params_changed_id = \
             features_params_factory.connect('changed', self._features_params_changed)
+        self._preview_level_changed_conn = preview_level.on_changed.connect(self._features_params_changed)
 
     def _features_params_changed(self, *_) -> None:
         for fut in self._extracted_features.values():
@@ -174,29 +191,33 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
         self._extracted_features = {}
         self._queue_update_preview()
 
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
-        self._images[image_id] = image
+    def _on_images_changed(self) -> None:
+        for fut in self._extracted_features.values():
+            fut.cancel()
 
-    def _on_image_deregistered(self, image_id: Hashable) -> None:
-        del self._images[image_id]
-        if image_id in self._extracted_features:
-            del self._extracted_features[image_id]
+        self._extracted_features = {}
+        self._current_image = None
+        self._current_preview = None
 
-    def _on_image_changed(self, image_id: Hashable) -> None:
+    def _on_image_changed(self, image_id: int) -> None:
         self._current_image = image_id
         self._queue_update_preview()
 
     def _queue_update_preview(self, *_) -> None:
-        if self.__destroyed: return
+        if self.__destroyed or self._current_image is None: return
 
         image_id = self._current_image
-        image = self._images[self._current_image]
+        image = self._get_image(image_id)
 
-        if image_id not in self._extracted_features:
+        # Extraction is cancelled if another image's extraction superseded it before it started.
+        if image_id not in self._extracted_features or self._extracted_features[image_id].cancelled():
             fut = self._features_service.extract(
                 image,
                 self._features_params_factory.create(),
                 labels=True,
+                preview=True,
+                scale=2.0**-self._preview_level.get(),
+                supersede=self,
             )
 
             self._extracted_features[image_id] = fut
@@ -220,6 +241,7 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
     def destroy(self) -> None:
         self.__destroyed = True
         self._features_params_factory.disconnect(self._features_params_changed_id)
+        self._preview_level_changed_conn.disconnect()
         super().destroy()
 
 
@@ -231,22 +253,33 @@ class IFTCameraAcquirerController(CameraAcquirerController):
             features_service: PendantFeaturesService,
             out_image: Bindable[Optional[np.ndarray]],
             show_features: Callable,
+            preview_level: Bindable[int],
     ) -> None:
         self._features_params_factory = features_params_factory
         self._features_service = features_service
         self._show_features = show_features
+        self._preview_level = preview_level
 
         self.__destroyed = False
 
         self._extracted_feature_fut = None
+        self._extract_count = 0
+        self._shown_count = 0
+        self._change_detector = FrameChangeDetector()
 
         super().__init__(
             acquirer=acquirer,
             source_image_out=out_image,
         )
 
+        self._params_changed_id = features_params_factory.connect('changed', self._params_changed)
+        self._preview_level_changed_conn = preview_level.on_changed.connect(self._params_changed)
         self._source_image_changed_conn = out_image.on_changed.connect(self._source_image_changed)
 
+    def _params_changed(self, *_) -> None:
+        self._change_detector.reset()
+        self._queue_update_preview()
+
     def _source_image_changed(self) -> None:
         self._queue_update_preview()
 
@@ -257,21 +290,33 @@ class IFTCameraAcquirerController(CameraAcquirerController):
         if image is None:
             return
 
-        old = self._extracted_feature_fut
-        if old is not None and not old.done():
+        params = self._features_params_factory.create()
+
+        # Skip extraction if the frame hasn't changed since it was last analysed, the features shown are still
+        # current.
+        if not self._change_detector.changed(image, [params.drop_region, params.needle_region]):
             return
 
         fut = self._features_service.extract(
             image,
-            self._features_params_factory.create(),
+            params,
             labels=True,
+            preview=True,
+            scale=2.0**-self._preview_level.get(),
+            supersede=self,
         )
         self._extracted_feature_fut = fut
-        fut.add_done_callback(self._update_preview)
+        self._extract_count += 1
+        fut.add_done_callback(functools.partial(self._update_preview, self._extract_count))
+
+    def _update_preview(self, count: int, fut: asyncio.Future) -> None:
+        if self.__destroyed or fut.cancelled():
+            return
 
-    def _update_preview(self, fut: asyncio.Future) -> None:
-        if fut.cancelled():
+        # Don't replace features of a newer frame.
+        if count < self._shown_count:
             return
+        self._shown_count = count
 
         features = fut.result()
         self._show_features(features)
@@ -280,5 +325,7 @@ class IFTCameraAcquirerController(CameraAcquirerController):
         self.__destroyed = True
         if self._extracted_feature_fut is not None:
             self._extracted_feature_fut.cancel()
+        self._features_params_factory.disconnect(self._params_changed_id)
+        self._preview_level_changed_conn.disconnect()
         self._source_image_changed_conn.disconnect()
         super().destroy()
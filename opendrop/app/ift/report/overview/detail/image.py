@@ -106,10 +106,10 @@ class IFTReportOverviewImagePresenter(Presenter[Gtk.Bin]):
             self.canvas.zoom(0.0)
 
         if status is PendantAnalysisJob.Status.WAITING_FOR_IMAGE \
-                or status is PendantAnalysisJob.Status.EXTRACTING_FEATURES:
+                or self._analysis.bn_drop_profile_extract.get() is None:
             self.drop_points_artist.clear_data()
         else:
-            drop_points = self._analysis.bn_drop_profile_extract.get().copy()
+            drop_points = np.round(self._analysis.bn_drop_profile_extract.get()).astype(int)
             if drop_region is not None:
                 drop_points -= drop_region.position
             data = np.zeros(image.shape[:2], np.uint32)
@@ -139,6 +139,9 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
         elif status is PendantAnalysisJob.Status.CANCELLED:
             cell.props.icon_name = 'process-stop'
             cell.props.visible = True
+        elif status is PendantAnalysisJob.Status.FAILED:
+            cell.props.icon_name = 'dialog-error'
+            cell.props.visible = True
         elif status is not PendantAnalysisJob.Status.FITTING:
             cell.props.icon_name = ''
             cell.props.visible = True
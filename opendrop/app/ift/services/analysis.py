@@ -31,19 +31,20 @@ import math
 import time
 from asyncio import Future
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 from injector import inject, Injector
 
 import numpy as np
 
 from opendrop.app.common.services.acquisition import InputImage
+from opendrop.fit import FitError, YoungLaplaceFitResult
 from .features import (
     PendantFeatures,
     PendantFeaturesParamsFactory,
+    PendantFeaturesPriors,
     PendantFeaturesService,
 )
 from .quantities import PendantPhysicalParamsFactory
-from .younglaplace import YoungLaplaceFitService, YoungLaplaceFitResult
 
 from opendrop.utility.bindable import AccessorBindable, VariableBindable
 from opendrop.geometry import Vector2
@@ -57,19 +58,35 @@ class PendantAnalysisService:
     def __init__(self, *, injector: Injector) -> None:
         self._injector = injector
 
-    def analyse(self, image: InputImage) -> 'PendantAnalysisJob':
+    def analyse(
+            self,
+            image: InputImage,
+            *,
+            priors: Optional[PendantFeaturesPriors] = None,
+            frame: int = 0,
+    ) -> 'PendantAnalysisJob':
         return self._injector.create_object(
             PendantAnalysisJob,
-            {'input_image': image},
+            {'input_image': image, 'priors': priors, 'frame': frame},
+        )
+
+    def analyse_sequence(self, images: Sequence[InputImage]) -> Tuple['PendantAnalysisJob', ...]:
+        """Analyse `images` as consecutive frames of one sequence, the extraction of each frame is seeded by the
+        latest earlier frame that finished before it was handed to a worker."""
+        priors = PendantFeaturesPriors()
+        return tuple(
+            self.analyse(image, priors=priors, frame=frame)
+            for frame, image in enumerate(images)
         )
 
 
 class PendantAnalysisJob:
     class Status(Enum):
         WAITING_FOR_IMAGE = ('Waiting for image', False)
-        EXTRACTING_FEATURES = ('Extracting features', False)
+        # Features are extracted and fitted in the same worker task, so there is no separate extracting state.
         FITTING = ('Fitting', False)
         FINISHED = ('Finished', True)
+        FAILED = ('Failed', True)
         CANCELLED = ('Cancelled', True)
 
         def __init__(self, display_name: str, is_terminal: bool) -> None:
@@ -83,11 +100,12 @@ class PendantAnalysisJob:
     def __init__(
             self,
             input_image: InputImage,
+            priors: Optional[PendantFeaturesPriors],
+            frame: int,
             *,
             physical_params_factory: PendantPhysicalParamsFactory,
             features_params_factory: PendantFeaturesParamsFactory,
             features_service: PendantFeaturesService,
-            ylfit_service: YoungLaplaceFitService,
     ) -> None:
         self._loop = asyncio.get_event_loop()
 
@@ -95,7 +113,8 @@ class PendantAnalysisJob:
         self._physical_params_factory = physical_params_factory
 
         self._features_service = features_service
-        self._ylfit_service = ylfit_service
+        self._priors = priors
+        self._frame = frame
 
         self._time_start = time.time()
         self._time_end = math.nan
@@ -150,8 +169,7 @@ class PendantAnalysisJob:
 
         self._loop.create_task(self._input_image.read()).add_done_callback(self._input_image_read_done)
 
-        self._features = None
-        self._ylfit = None
+        self._analysis = None
 
     def _input_image_read_done(self, read_task: Future) -> None:
         if read_task.cancelled():
@@ -161,7 +179,12 @@ class PendantAnalysisJob:
         if self.bn_is_done.get():
             return
 
-        image, image_timestamp = read_task.result()
+        try:
+            image, image_timestamp = read_task.result()
+        except Exception as e:
+            self._fail(e)
+            return
+
         self._image_ready(image, image_timestamp)
 
     def _image_ready(self, image: np.ndarray, image_timestamp: float) -> None:
@@ -179,44 +202,43 @@ class PendantAnalysisJob:
         self.bn_canny_max.set(features_params.thresh2)
         self.bn_canny_min.set(features_params.thresh1)
 
-        self._features = self._features_service.extract(image, features_params)
-        self._features.add_done_callback(self._features_done)
+        # Features are extracted and fitted by one worker, so the image is only sent once.
+        self._analysis = self._features_service.extract_and_fit(
+            image,
+            features_params,
+            priors=self._priors,
+            frame=self._frame,
+        )
+        self._analysis.add_done_callback(self._analysis_done)
 
         self.bn_image.poke()
         self.bn_image_timestamp.poke()
 
-        self.bn_status.set(self.Status.EXTRACTING_FEATURES)
+        self.bn_status.set(self.Status.FITTING)
 
-    def _features_done(self, fut: asyncio.Future) -> None:
+    def _analysis_done(self, fut: asyncio.Future) -> None:
         features: PendantFeatures
+        result: YoungLaplaceFitResult
 
         if fut.cancelled():
             self.cancel()
             return
         try:
-            features = fut.result()
+            features, result = fut.result()
+        except FitError as e:
+            # Keep the extracted profile so the frame can still be inspected.
+            self.bn_drop_profile_extract.set(e.features.drop_points.T)
+            self.bn_needle_width_px.set(e.features.needle_diameter)
+            self._fail(e)
+            return
         except Exception as e:
-            raise e
+            # Failed jobs are terminal, so the input image is still released back to its acquirer.
+            self._fail(e)
+            return
 
         self.bn_drop_profile_extract.set(features.drop_points.T)
         self.bn_needle_width_px.set(features.needle_diameter)
 
-        self._ylfit = self._ylfit_service.fit(features.drop_points)
-        self._ylfit.add_done_callback(self._ylfit_done)
-
-        self.bn_status.set(self.Status.FITTING)
-
-    def _ylfit_done(self, fut: asyncio.Future) -> None:
-        result: YoungLaplaceFitResult
-
-        if fut.cancelled():
-            self.cancel()
-            return
-        try:
-            result = fut.result()
-        except Exception as e:
-            raise e
-
         physical_params = self._physical_params_factory.create()
         drop_density = physical_params.drop_density
         continuous_density = physical_params.continuous_density
@@ -287,14 +309,19 @@ class PendantAnalysisJob:
         if self.bn_status.get() is self.Status.WAITING_FOR_IMAGE:
             self._input_image.cancel()
 
-        if self._features is not None:
-            self._features.cancel()
-
-        if self._ylfit is not None:
-            self._ylfit.cancel()
+        if self._analysis is not None:
+            self._analysis.cancel()
 
         self.bn_status.set(self.Status.CANCELLED)
 
+    def _fail(self, exc: Exception) -> None:
+        self._loop.call_exception_handler({
+            'message': 'Pendant drop analysis failed',
+            'exception': exc,
+        })
+
+        self.bn_status.set(self.Status.FAILED)
+
     def _get_status(self) -> Status:
         return self._status
 
@@ -304,6 +331,7 @@ class PendantAnalysisJob:
 
         if new_status.is_terminal:
             self._time_end = time.time()
+            self._input_image.release()
 
     def _get_image(self) -> Optional[np.ndarray]:
         return self._image
@@ -27,21 +27,26 @@
 
 
 import asyncio
-from concurrent.futures.process import ProcessPoolExecutor
+from concurrent.futures import Future
+import functools
+import threading
 from injector import inject
-from typing import Optional
+from typing import Hashable, Optional, Tuple
 
 from gi.repository import GObject
 import numpy as np
 
+from opendrop.app.common.services.workers import WorkerLane, WorkerPool
 from opendrop.geometry import Rect2
 from opendrop.features.pendant import PendantFeatures, extract_pendant_features
+from opendrop.fit import FitError, extract_and_fit_pendant
 
 
 __all__ = (
     'PendantFeaturesParams',
     'PendantFeatures',
     'PendantFeaturesParamsFactory',
+    'PendantFeaturesPriors',
     'PendantFeaturesService',
 )
 
@@ -51,6 +56,7 @@ class PendantFeaturesParamsFactory(GObject.Object):
     _needle_region: Optional[Rect2[int]] = None
     _thresh1 = 80.0
     _thresh2 = 160.0
+    _subpixel = False
 
     def create(self) -> 'PendantFeaturesParams':
         return PendantFeaturesParams(
@@ -58,6 +64,7 @@ class PendantFeaturesParamsFactory(GObject.Object):
             needle_region=self._needle_region,
             thresh1=self._thresh1,
             thresh2=self._thresh2,
+            subpixel=self._subpixel,
         )
 
     @GObject.Signal
@@ -82,6 +89,15 @@ class PendantFeaturesParamsFactory(GObject.Object):
         self._thresh2 = value
         self.changed.emit()
 
+    @GObject.Property(type=bool, default=False)
+    def subpixel(self) -> bool:
+        return self._subpixel
+
+    @subpixel.setter
+    def subpixel(self, value: bool) -> None:
+        self._subpixel = value
+        self.changed.emit()
+
     @GObject.Property
     def drop_region(self) -> Optional[Rect2[int]]:
         return self._drop_region
@@ -108,6 +124,7 @@ class PendantFeaturesParams:
     thresh2: float
     needle_region: Optional[Rect2[int]]
     drop_region: Optional[Rect2[int]]
+    subpixel: bool
 
     def __init__(
             self,
@@ -115,41 +132,196 @@ class PendantFeaturesParams:
             thresh2: float,
             needle_region: Optional[Rect2[int]],
             drop_region: Optional[Rect2[int]],
+            subpixel: bool = False,
     ) -> None:
         self.thresh1 = thresh1
         self.thresh2 = thresh2
         self.needle_region = needle_region
         self.drop_region = drop_region
+        self.subpixel = subpixel
+
+
+class PendantFeaturesPriors:
+    """Apex and drop edge bounding box of the latest extracted frame of one image sequence, used to speed up
+    extraction of later frames. Priors are only given to frames after the one they were found in, and only while
+    the extraction parameters stay the same.
+
+    Priors are read when a job is handed to a worker and updated when a job finishes, both of which can happen on
+    any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key = None  # type: Optional[tuple]
+        self._frame = -1
+        self._apex_prior = None
+        self._drop_edge_prior = None
+
+    def get(self, key: tuple, frame: int) -> Tuple[Optional[tuple], Optional[Rect2[int]]]:
+        """Return (apex_prior, drop_edge_prior) for extracting `frame` with parameters `key`."""
+        with self._lock:
+            if key != self._key or frame <= self._frame:
+                return None, None
+
+            return self._apex_prior, self._drop_edge_prior
+
+    def update(self, key: tuple, frame: int, features: PendantFeatures) -> None:
+        with self._lock:
+            self._update(key, frame, features)
+
+    def _update(self, key: tuple, frame: int, features: PendantFeatures) -> None:
+        if key != self._key:
+            # Extraction parameters changed, priors found with the old ones are dropped.
+            self._key = key
+            self._frame = -1
+            self._apex_prior = None
+            self._drop_edge_prior = None
+
+        if frame <= self._frame or features.drop_apex is None:
+            return
+
+        drop_points = features.drop_points
+
+        self._frame = frame
+        self._apex_prior = (features.drop_apex, features.drop_radius, features.drop_rotation)
+        self._drop_edge_prior = Rect2(
+            pt0=np.floor(drop_points.min(axis=1)).astype(int),
+            pt1=np.ceil(drop_points.max(axis=1)).astype(int),
+        )
 
 
 class PendantFeaturesService:
     @inject
-    def __init__(self, default_params_factory: PendantFeaturesParamsFactory) -> None:
-        self._executor = ProcessPoolExecutor(max_workers=1)
+    def __init__(self, default_params_factory: PendantFeaturesParamsFactory, workers: WorkerPool) -> None:
+        self._workers = workers
         self._default_params_factory = default_params_factory
 
+        # Preview extractions seed each other but never analyses, which keep their own priors per sequence.
+        self._preview_priors = PendantFeaturesPriors()
+        self._preview_count = 0
+
     def extract(
             self,
             image: np.ndarray,
             params: Optional[PendantFeaturesParams] = None,
             *,
             labels: bool = False,
+            scale: float = 1.0,
+            preview: bool = False,
+            supersede: Optional[Hashable] = None,
     ) -> asyncio.Future:
+        """Extract features in a worker. If `preview` is true, the job is scheduled as interactive preview work.
+        A job with a `supersede` key replaces the job with the same key that is still waiting for a worker, if
+        any, whose future is then cancelled."""
         if params is None:
             params = self._default_params_factory.create()
 
-        cfut = self._executor.submit(
+        if preview:
+            priors = self._preview_priors
+            key = self._priors_key(params, scale)
+            self._preview_count += 1
+            frame = self._preview_count
+            prepare = functools.partial(self._priors_kwargs, priors, key, frame)
+        else:
+            priors = None
+            prepare = None
+
+        cfut = self._workers.submit(
             extract_pendant_features,
             image,
+            **self._extract_kwargs(params),
+            labels=labels,
+            scale=scale,
+            lane=WorkerLane.PREVIEW if preview else WorkerLane.ANALYSIS,
+            supersede=supersede,
+            prepare=prepare,
+        )
+
+        if priors is not None:
+            # Updated before the worker takes its next job, so that job already gets these priors.
+            cfut.add_done_callback(functools.partial(self._extract_done, priors, key, frame))
+
+        return asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
+
+    def extract_and_fit(
+            self,
+            image: np.ndarray,
+            params: Optional[PendantFeaturesParams] = None,
+            *,
+            priors: Optional[PendantFeaturesPriors] = None,
+            frame: int = 0,
+    ) -> asyncio.Future:
+        """Extract features and fit the drop profile in the same worker, the future's result is a tuple of
+        (PendantFeatures, YoungLaplaceFitResult). If only the fit fails, the future's exception is a FitError that
+        holds the extracted features.
+
+        If `priors` is given, `frame` is the index of the image in its sequence. Extraction is seeded from the
+        latest earlier frame found in `priors` by the time the job is handed to a worker, and `priors` is then
+        updated with this frame's features. Jobs of a sequence can all be submitted at once, later frames still
+        get the priors of frames that finished while they were waiting."""
+        if params is None:
+            params = self._default_params_factory.create()
+
+        if priors is not None:
+            key = self._priors_key(params)
+            prepare = functools.partial(self._priors_kwargs, priors, key, frame)
+        else:
+            prepare = None
+
+        cfut = self._workers.submit(
+            extract_and_fit_pendant,
+            image,
+            **self._extract_kwargs(params),
+            prepare=prepare,
+        )
+
+        if priors is not None:
+            cfut.add_done_callback(functools.partial(self._extract_and_fit_done, priors, key, frame))
+
+        return asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
+
+    def _extract_kwargs(self, params: PendantFeaturesParams) -> dict:
+        return {
+            'drop_region': params.drop_region,
+            'needle_region': params.needle_region,
+            'thresh1': params.thresh1,
+            'thresh2': params.thresh2,
+            'subpixel': params.subpixel,
+        }
+
+    @staticmethod
+    def _priors_key(params: PendantFeaturesParams, scale: float = 1.0) -> tuple:
+        return (
             params.drop_region,
             params.needle_region,
-            thresh1=params.thresh1,
-            thresh2=params.thresh2,
-            labels=labels,
+            params.thresh1,
+            params.thresh2,
+            params.subpixel,
+            scale,
         )
 
-        fut = asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
-        return fut
+    @staticmethod
+    def _priors_kwargs(priors: PendantFeaturesPriors, key: tuple, frame: int) -> dict:
+        apex_prior, drop_edge_prior = priors.get(key, frame)
+        return {'apex_prior': apex_prior, 'drop_edge_prior': drop_edge_prior}
+
+    @staticmethod
+    def _extract_done(priors: PendantFeaturesPriors, key: tuple, frame: int, fut: Future) -> None:
+        if fut.cancelled() or fut.exception() is not None:
+            return
+
+        priors.update(key, frame, fut.result())
+
+    @staticmethod
+    def _extract_and_fit_done(priors: PendantFeaturesPriors, key: tuple, frame: int, fut: Future) -> None:
+        if fut.cancelled():
+            return
+
+        exc = fut.exception()
+        if isinstance(exc, FitError):
+            features = exc.features
+        elif exc is not None:
+            return
+        else:
+            features, _ = fut.result()
 
-    def destroy(self) -> None:
-        self._executor.shutdown()
+        priors.update(key, frame, features)
@@ -32,24 +32,25 @@ from gi.repository import GObject
 from injector import Binder, Module, inject, singleton
 
 from opendrop.app.common.services.acquisition import AcquirerType, ImageAcquisitionService
+from opendrop.app.common.services.workers import WorkerPool, WorkerPoolModule
 from opendrop.app.ift.analysis_saver import IFTAnalysisSaverOptions
 from opendrop.app.ift.analysis_saver.save_functions import save_drops
 
 from .analysis import PendantAnalysisService, PendantAnalysisJob
 from .features import PendantFeaturesParamsFactory, PendantFeaturesService
 from .quantities import PendantPhysicalParamsFactory
-from .younglaplace import YoungLaplaceFitService
 
 
 class IFTSessionModule(Module):
     def configure(self, binder: Binder):
+        binder.install(WorkerPoolModule())
+
         binder.bind(ImageAcquisitionService, scope=singleton)
 
         binder.bind(PendantPhysicalParamsFactory, scope=singleton)
         binder.bind(PendantFeaturesParamsFactory, scope=singleton)
 
         binder.bind(PendantFeaturesService, scope=singleton)
-        binder.bind(YoungLaplaceFitService, scope=singleton)
 
         binder.bind(PendantAnalysisService, scope=singleton)
 
@@ -60,18 +61,18 @@ class IFTSession(GObject.Object):
     @inject
     def __init__(
             self,
+            workers: WorkerPool,
             image_acquisition: ImageAcquisitionService,
             features_service: PendantFeaturesService,
-            ylfit_service: YoungLaplaceFitService,
             analysis_service: PendantAnalysisService,
     ) -> None:
         self._analyses = ()
         self._analyses_saved = False
 
+        self._workers = workers
         self._image_acquisition = image_acquisition
 
         self._features_service = features_service
-        self._ylfit_service = ylfit_service
 
         self._analysis_service = analysis_service
 
@@ -108,9 +109,7 @@ class IFTSession(GObject.Object):
 
         input_images = self._image_acquisition.acquire_images()
 
-        self._analyses = tuple(
-            self._analysis_service.analyse(im) for im in input_images
-        )
+        self._analyses = self._analysis_service.analyse_sequence(input_images)
         self._analyses_saved = False
         self.notify('analyses')
         self.notify('analyses_saved')
@@ -147,5 +146,4 @@ class IFTSession(GObject.Object):
     def quit(self) -> None:
         self.clear_analyses()
         self._image_acquisition.destroy()
-        self._features_service.destroy()
-        self._ylfit_service.destroy()
+        self._workers.shutdown()
@@ -0,0 +1,262 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import collections
+from multiprocessing import resource_tracker, shared_memory
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from opendrop.frame import Frame, PixelFormat
+
+
+__all__ = ('FrameArena', 'MappedFrame', 'SharedFrame', 'call_with_shared_frames', 'map_frame')
+
+
+# Number of shared memory blocks a worker process keeps mapped.
+WORKER_MAPPINGS = 16
+
+
+class SharedFrame(NamedTuple):
+    """Handle to an image stored in a FrameArena slot. Handles are small and cheap to pickle, open() returns the
+    image in any process.
+
+    `generation` counts the slots the arena had unlinked when the handle was made. A process that sees a newer
+    generation drops the mappings it keeps, so unlinked blocks are not kept alive and a block name reused by the
+    OS is never served from a stale mapping."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    pixel_format: Optional[PixelFormat] = None
+    bit_depth: Optional[int] = None
+    generation: int = 0
+
+    def open(self) -> np.ndarray:
+        """Return a read-only view of the image. It is only valid until the slot is released by the arena's
+        owner."""
+        shm = _attach(self.name, self.generation)
+        image = np.ndarray(self.shape, self.dtype, buffer=shm.buf)
+        image.flags.writeable = False
+
+        if self.pixel_format is not None:
+            image = Frame(image, self.pixel_format, self.bit_depth)
+
+        return image
+
+
+class MappedFrame(NamedTuple):
+    """Handle to an image that is stored contiguously in a read-only memory-mapped file. open() maps the same
+    pages in any process, so the image is passed to worker processes without being copied."""
+
+    filename: str
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+    pixel_format: Optional[PixelFormat] = None
+    bit_depth: Optional[int] = None
+
+    def open(self) -> np.ndarray:
+        image = np.memmap(self.filename, self.dtype, mode='r', offset=self.offset, shape=self.shape)
+
+        if self.pixel_format is not None:
+            image = Frame(image, self.pixel_format, self.bit_depth)
+
+        return image
+
+
+def map_frame(image: np.ndarray) -> Optional[MappedFrame]:
+    """Return a MappedFrame for `image` if it is a C-contiguous view into a read-only np.memmap of a file (e.g.
+    a frame of a stack opened with np.load(mmap_mode='r')), otherwise None."""
+    if not image.flags.c_contiguous:
+        return None
+
+    mapped = image
+    while isinstance(mapped.base, np.ndarray):
+        mapped = mapped.base
+
+    if not isinstance(mapped, np.memmap) or mapped.filename is None or mapped.mode != 'r':
+        return None
+
+    offset = mapped.offset + image.__array_interface__['data'][0] - mapped.__array_interface__['data'][0]
+
+    if isinstance(image, Frame):
+        return MappedFrame(mapped.filename, offset, image.shape, image.dtype.str, image.pixel_format, image.bit_depth)
+    else:
+        return MappedFrame(mapped.filename, offset, image.shape, image.dtype.str)
+
+
+class FrameArena:
+    """Pool of shared memory blocks used to pass images to worker processes without pickling them.
+
+    put() copies an image into a free slot, holding one reference to it. Slots are reference counted with
+    acquire() and release() and can be reused by later images once the count drops to zero. Up to `max_free`
+    free slots are kept around for reuse, the rest are unlinked.
+    """
+
+    def __init__(self, max_free: int = 8) -> None:
+        self._max_free = max_free
+
+        self._lock = threading.Lock()
+        self._slots: Dict[str, shared_memory.SharedMemory] = {}
+        self._refs: Dict[str, int] = {}
+        self._free: List[str] = []
+        self._closed = False
+
+        # Number of slots unlinked so far.
+        self._generation = 0
+
+    def put(self, image: np.ndarray) -> SharedFrame:
+        shm, generation = self._alloc(image.nbytes)
+
+        view = np.ndarray(image.shape, image.dtype, buffer=shm.buf)
+        np.copyto(view, image)
+        del view
+
+        if isinstance(image, Frame):
+            pixel_format, bit_depth = image.pixel_format, image.bit_depth
+        else:
+            pixel_format, bit_depth = None, None
+
+        return SharedFrame(shm.name, image.shape, image.dtype.str, pixel_format, bit_depth, generation)
+
+    def acquire(self, frame: SharedFrame) -> None:
+        with self._lock:
+            self._refs[frame.name] += 1
+
+    def release(self, frame: SharedFrame) -> None:
+        with self._lock:
+            self._refs[frame.name] -= 1
+            if self._refs[frame.name] > 0:
+                return
+
+            del self._refs[frame.name]
+            _track(self._slots[frame.name])
+            if self._closed or len(self._free) >= self._max_free:
+                self._unlink(frame.name)
+            else:
+                self._free.append(frame.name)
+
+    def close(self) -> None:
+        """Unlink free slots now and the remaining slots when they are released."""
+        with self._lock:
+            self._closed = True
+            for name in self._free:
+                self._unlink(name)
+            self._free.clear()
+
+    def _alloc(self, size: int) -> Tuple[shared_memory.SharedMemory, int]:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Arena is closed')
+
+            # Smallest free slot that fits.
+            fits = [name for name in self._free if self._slots[name].size >= size]
+            if fits:
+                name = min(fits, key=lambda name: self._slots[name].size)
+                self._free.remove(name)
+                self._refs[name] = 1
+                return self._slots[name], self._generation
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        with self._lock:
+            self._slots[shm.name] = shm
+            self._refs[shm.name] = 1
+            # Read after creating the block, so any earlier block with the same name has already been counted.
+            return shm, self._generation
+
+    def _unlink(self, name: str) -> None:
+        shm = self._slots.pop(name)
+        shm.close()
+        shm.unlink()
+        self._generation += 1
+
+
+def call_with_shared_frames(fn: Callable, args: tuple, kwargs: dict):
+    """Call fn(*args, **kwargs) with SharedFrame and MappedFrame arguments replaced by the images they refer
+    to."""
+    args = tuple(arg.open() if isinstance(arg, (SharedFrame, MappedFrame)) else arg for arg in args)
+    kwargs = {k: v.open() if isinstance(v, (SharedFrame, MappedFrame)) else v for k, v in kwargs.items()}
+    return fn(*args, **kwargs)
+
+
+_mappings: 'collections.OrderedDict[str, shared_memory.SharedMemory]' = collections.OrderedDict()
+# Newest arena generation seen by this process.
+_mappings_generation = 0
+
+
+def _attach(name: str, generation: int = 0) -> shared_memory.SharedMemory:
+    global _mappings_generation
+
+    if generation > _mappings_generation:
+        # Some slots were unlinked since the mappings were made, we can't tell which so drop them all.
+        _mappings_generation = generation
+        while _mappings:
+            _close_mapping(_mappings.popitem(last=False)[1])
+
+    try:
+        shm = _mappings[name]
+        _mappings.move_to_end(name)
+        return shm
+    except KeyError:
+        pass
+
+    try:
+        # Attaching process doesn't own the block, don't let the resource tracker unlink it (Python 3.13+).
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # Older versions always register the block. A tracker of our own would unlink it (and report it as
+        # leaked) when this process exits.
+        if os.name == 'posix':
+            resource_tracker.unregister(shm._name, 'shared_memory')
+
+    _mappings[name] = shm
+    while len(_mappings) > WORKER_MAPPINGS:
+        _close_mapping(_mappings.popitem(last=False)[1])
+
+    return shm
+
+
+def _track(shm: shared_memory.SharedMemory) -> None:
+    # Worker processes usually share the owner's resource tracker, so unregistering a block they attach also
+    # unregisters it for the owner. Register it again once the workers are done with it, so it is still cleaned
+    # up if the owner crashes and unlinking it doesn't trip up the tracker.
+    if os.name == 'posix':
+        resource_tracker.register(shm._name, 'shared_memory')
+
+
+def _close_mapping(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # Still referenced by an array, the mapping is closed when that is collected.
+        pass
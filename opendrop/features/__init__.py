@@ -1,3 +1,7 @@
 from .colorize import *
+from .contour import *
+from .edges import *
+from .labels import *
+from .pyramid import *
 from .pendant import *
 from .conan import *
@@ -3,15 +3,23 @@ from typing import NamedTuple, Optional, Any
 import cv2
 import numpy as np
 
-from opendrop.geometry import Line2, Rect2
+from opendrop.geometry import Line2, Rect2, Vector2
+
+from .contour import trace_contour
+from .edges import get_edge_detector
+from .labels import label_points
+from .pyramid import pyramid_level, pyramid_down, _region_down, _point_down, _points_up
 
 
 __all__ = ('ContactAngleFeatures', 'extract_contact_angle_features')
 
 
 class ContactAngleFeatures(NamedTuple):
+    # Labels only cover the bounding box of the edge points, labels_position is the image position of its
+    # top-left pixel.
     labels: np.ndarray
     drop_points: np.ndarray = np.empty((2, 0), dtype=int)
+    labels_position: Vector2[int] = Vector2(0, 0)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, ContactAngleFeatures):
@@ -34,7 +42,19 @@ def extract_contact_angle_features(
         roi: Optional[Rect2[int]] = None,
         thresh: float = 0.5,
         labels: bool = False,
+        subpixel: bool = False,
+        ordered: bool = False,
+        scale: float = 1.0,
 ) -> ContactAngleFeatures:
+    """If `scale` is less than 1, edges are detected on the coarsest image pyramid level with at least that
+    resolution. Returned coordinates are always in full resolution pixels."""
+    level = pyramid_level(scale)
+    if level > 0:
+        image = pyramid_down(image, level)
+        roi = _region_down(roi, level)
+        if baseline is not None:
+            baseline = Line2(_point_down(baseline.pt0, level), _point_down(baseline.pt1, level))
+
     if roi is None:
         roi = Rect2(0, 0, image.shape[1] - 1, image.shape[0] - 1)
 
@@ -46,7 +66,6 @@ def extract_contact_angle_features(
         min(image.shape[0], roi.y1),
     )
 
-    subimage = image[roi.y0:roi.y1+1, roi.x0:roi.x1+1]
     if baseline is not None:
         baseline -= roi.position
 
@@ -64,17 +83,10 @@ def extract_contact_angle_features(
             right = baseline.unit
             origin = np.array(baseline.pt0)
 
-    if len(subimage.shape) > 2:
-        subimage = cv2.cvtColor(subimage, cv2.COLOR_RGB2GRAY)
-
-    blur = cv2.GaussianBlur(subimage, ksize=(5, 5), sigmaX=0)
-    dx = cv2.Scharr(blur, cv2.CV_16S, dx=1, dy=0)
-    dy = cv2.Scharr(blur, cv2.CV_16S, dx=0, dy=1)
+    detector = get_edge_detector()
+    detector.load(image, [roi])
 
-    # Use magnitude of gradient squared to get sharper edges.
-    mask = (dx.astype(float)**2 + dy.astype(float)**2)
-    mask = np.sqrt(mask)
-    mask = (mask/mask.max() * (2**8 - 1)).astype(np.uint8)
+    mask = detector.strength(roi)
 
     # Ignore weak gradients.
     mask[mask < thresh * mask.max()] = 0
@@ -91,8 +103,8 @@ def extract_contact_angle_features(
 
     if labels:
         # Hack: Thin edges using cv2.Canny()
-        grad_max = (abs(dx) + abs(dy)).max()
-        edges = cv2.Canny(mask*dx, mask*dy, grad_max*thresh/2, grad_max*thresh)
+        grad_max = detector.max_gradient(roi)
+        edges = detector.canny(roi, mask, grad_max*thresh/2, grad_max*thresh)
         edge_points = np.array(edges.nonzero()[::-1])
     else:
         edges = None
@@ -146,60 +158,82 @@ def extract_contact_angle_features(
 
         # Hack: Thin edges using cv2.Canny()
         if edges is None:
-            grad_max = (abs(dx) + abs(dy)).max()
-            drop_edges = cv2.Canny(mask*dx, mask*dy, grad_max*thresh/2, grad_max*thresh)
+            grad_max = detector.max_gradient(roi)
+            drop_edges = detector.canny(roi, mask, grad_max*thresh/2, grad_max*thresh)
         else:
             drop_edges = edges & mask
 
-        drop_points = np.array(drop_edges.nonzero()[::-1])
+        if ordered:
+            drop_points = trace_contour(drop_edges)
+        else:
+            drop_points = np.array(drop_edges.nonzero()[::-1])
 
-        if drop_points.shape[1] > 0:
-            mask = np.zeros(drop_points.shape[1], dtype=bool)
+        if subpixel:
+            drop_points = detector.subpixel(roi, drop_points)
 
+        if drop_points.shape[1] > 0:
             x, y = [up, right] @ (drop_points - origin.reshape(2, 1))
-            
-            # Sort in ascending y coordinate.
-            ix = y.argsort()
-            x, y = x[ix], y[ix]
-            drop_points = drop_points[:, ix]
-
-            # Divide into 2 pixel high level sets.
-            levels = np.histogram_bin_edges(y, bins=max(1, int(y.max()/2)))
-            levels_ix = (0, *np.searchsorted(y, levels[1:], side='right'))
-
-            # Find left and right-most edges in pairs of level sets.
-            for start, stop in zip(levels_ix, levels_ix[min(2, len(levels_ix)-1):]):
-                level_set = x[start:stop]
-
-                # Left-to-right index.
-                ltr_ix = level_set.argsort()
-
-                # Split into clusters where x distances are less than 2*sqrt(2) ~ 2.828.
-                # We use 2*sqrt(2) instead of sqrt(2) to allow for single pixel gaps.
-                contiguous_groups = np.split(
-                    ltr_ix,
-                    #  (np.diff(level_set[ltr_ix]) > 2.828).nonzero()[0] + 1,
-                    (np.diff(level_set[ltr_ix]) > 2.828).nonzero()[0] + 1,
-                )
-                mask[start + contiguous_groups[0]] = True
-                mask[start + contiguous_groups[-1]] = True
-
-            drop_points = drop_points[:, mask]
+            drop_points = drop_points[:, _outermost_edges(x, y)]
     else:
         drop_points = np.empty((2, 0), dtype=int)
 
-    edge_points = edge_points + np.reshape(roi.position, (2, 1))
-    drop_points = drop_points + np.reshape(roi.position, (2, 1))
+    edge_points = _points_up(edge_points + np.reshape(roi.position, (2, 1)), level)
+    drop_points = _points_up(drop_points + np.reshape(roi.position, (2, 1)), level)
 
     if labels:
-        labels_array = np.zeros(image.shape[:2], np.uint8)
-        labels_array[tuple(edge_points)[::-1]] = 1
-        labels_array[tuple(drop_points)[::-1]] = 2
+        labels_array, labels_position = label_points(edge_points, drop_points)
     else:
         labels_array = None
-
+        labels_position = Vector2(0, 0)
 
     return ContactAngleFeatures(
         labels=labels_array,
         drop_points=drop_points,
+        labels_position=labels_position,
     )
+
+
+def _outermost_edges(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Return a mask of the left and right-most edge points in each pair of adjacent 2 pixel high level sets.
+
+    Within a pair of level sets, points are split into clusters where x distances are more than 2*sqrt(2) ~ 2.828
+    (allowing single pixel gaps), and the points of the first and last clusters are kept.
+    """
+    n = len(y)
+
+    # Divide into 2 pixel high level sets.
+    n_levels = max(1, int(y.max()/2))
+    levels = np.histogram_bin_edges(y, bins=n_levels)
+    level = np.searchsorted(levels[1:], y, side='left')
+
+    # Each point belongs to the pair starting at its own level and to the one starting at the level below.
+    n_pairs = max(1, n_levels - 1)
+    pair = np.concatenate((level - 1, level))
+    point = np.concatenate((np.arange(n), np.arange(n)))
+    valid = (0 <= pair) & (pair < n_pairs)
+    pair = pair[valid]
+    point = point[valid]
+
+    # Sort by pair, then left to right.
+    order = np.lexsort((x[point], pair))
+    pair = pair[order]
+    point = point[order]
+    px = x[point]
+
+    # Number the clusters, a new one starts at each pair and at each large x gap.
+    new_cluster = np.empty(len(pair), dtype=bool)
+    new_cluster[:1] = True
+    np.not_equal(pair[1:], pair[:-1], out=new_cluster[1:])
+    new_cluster[1:] |= np.diff(px) > 2.828
+    cluster = np.cumsum(new_cluster)
+
+    # First and last cluster of each pair.
+    pair_start = np.flatnonzero(np.diff(pair, prepend=-1))
+    pair_stop = np.append(pair_start[1:], len(pair)) - 1
+    first = np.repeat(cluster[pair_start], pair_stop - pair_start + 1)
+    last = np.repeat(cluster[pair_stop], pair_stop - pair_start + 1)
+
+    mask = np.zeros(n, dtype=bool)
+    mask[point[(cluster == first) | (cluster == last)]] = True
+
+    return mask
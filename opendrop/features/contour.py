@@ -0,0 +1,168 @@
+import math
+
+import cv2
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+
+
+__all__ = ('trace_contour', 'contour_arclength')
+
+
+# Curves enclosing a hole larger than this (in square pixels) are treated as closed loops. Smaller holes are gaps
+# left where an edge is locally more than a pixel thick.
+CLOSED_CURVE_MIN_AREA = 10.0
+
+# Largest number of pixel distances computed at once when matching hole pixels to the outer border of a curve.
+BORDER_DISTANCE_BLOCK = 2**20
+
+
+def trace_contour(edges: np.ndarray) -> np.ndarray:
+    """Order the nonzero pixels of a thin edge image along the curves they form.
+
+    Closed curves are ordered by border following (cv2.findContours()). Open curves are ordered by geodesic
+    distance from their left-most end, which stays monotone where an edge is locally thicker than a pixel or has
+    short spurs. Curves are chained end to end, nearest first, starting from the left-most. Return a 2xN array
+    of pixel coordinates in path order.
+    """
+    mask = (edges != 0).astype(np.uint8)
+
+    y, x = mask.nonzero()
+    n = len(x)
+    if n == 0:
+        return np.empty((2, 0), dtype=int)
+
+    _, cc_labels = cv2.connectedComponents(mask, connectivity=8)
+    component = cc_labels[y, x]
+
+    index = np.full(mask.shape, -1, dtype=int)
+    index[y, x] = np.arange(n)
+
+    param = _geodesic_param(_pixel_graph(x, y, index), component, x, y)
+
+    # Closed curves are parameterized by position along their border instead.
+    contours, hierarchy = cv2.findContours(mask, mode=cv2.RETR_CCOMP, method=cv2.CHAIN_APPROX_NONE)
+    for contour, (_, _, child, parent) in zip(contours, hierarchy[0]):
+        if parent >= 0 or child < 0:
+            continue
+
+        hole_area = 0.0
+        while child >= 0:
+            hole_area = max(hole_area, cv2.contourArea(contours[child]))
+            child = hierarchy[0][child][0]
+
+        if hole_area > CLOSED_CURVE_MIN_AREA:
+            border = contour.reshape(-1, 2)
+            _border_param(param, index[border[:, 1], border[:, 0]], component, x, y)
+
+    # Order each curve by its parameter, then chain the curves.
+    order = np.lexsort((param, component))
+    paths = np.split(order, np.flatnonzero(np.diff(component[order])) + 1)
+
+    path = paths.pop(min(range(len(paths)), key=lambda i: (x[paths[i][0]], y[paths[i][0]])))
+    chain = [path]
+    while paths:
+        end = chain[-1][-1]
+        dist_head = [abs(x[p[0]] - x[end]) + abs(y[p[0]] - y[end]) for p in paths]
+        dist_tail = [abs(x[p[-1]] - x[end]) + abs(y[p[-1]] - y[end]) for p in paths]
+        i = int(np.argmin(np.minimum(dist_head, dist_tail)))
+        path = paths.pop(i)
+        if dist_tail[i] < dist_head[i]:
+            path = path[::-1]
+        chain.append(path)
+
+    order = np.concatenate(chain)
+
+    return np.array([x[order], y[order]])
+
+
+def contour_arclength(points: np.ndarray) -> np.ndarray:
+    """Return the cumulative arclength at each point of an ordered 2xN contour, starting from zero."""
+    s = np.zeros(points.shape[1])
+    if points.shape[1] > 1:
+        np.cumsum(np.hypot(*np.diff(points, axis=1)), out=s[1:])
+    return s
+
+
+def _pixel_graph(x: np.ndarray, y: np.ndarray, index: np.ndarray) -> scipy.sparse.csr_matrix:
+    """Return the 8-connected adjacency graph of the pixels, weighted by distance."""
+    height, width = index.shape
+    n = len(x)
+
+    rows = []
+    cols = []
+    weights = []
+    for dx, dy in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+        nx = x + dx
+        ny = y + dy
+        inside = (0 <= nx) & (nx < width) & (ny < height)
+        neighbour = np.full(n, -1)
+        neighbour[inside] = index[ny[inside], nx[inside]]
+        has_neighbour = neighbour >= 0
+
+        rows.append(has_neighbour.nonzero()[0])
+        cols.append(neighbour[has_neighbour])
+        weights.append(np.full(has_neighbour.sum(), math.hypot(dx, dy)))
+
+    return scipy.sparse.csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n),
+    )
+
+
+def _geodesic_param(graph, component: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Return the geodesic distance of each pixel from the left-most end of its curve."""
+    def sweep(sources: np.ndarray) -> np.ndarray:
+        # Curves are disconnected so each pixel is reached only from the source on its own curve.
+        return scipy.sparse.csgraph.dijkstra(graph, directed=False, indices=sources, min_only=True)
+
+    def farthest(dist: np.ndarray) -> np.ndarray:
+        order = np.lexsort((dist, component))
+        return order[np.append(np.flatnonzero(np.diff(component[order])), len(order) - 1)]
+
+    # Double sweep: the pixel farthest from any pixel is an end of the curve, and the pixel farthest from that
+    # end is the other end.
+    _, first = np.unique(component, return_index=True)
+    end0 = farthest(sweep(first))
+    dist = sweep(end0)
+    end1 = farthest(dist)
+
+    # Measure from the left-most end.
+    flip = (x[end1] < x[end0]) | ((x[end1] == x[end0]) & (y[end1] < y[end0]))
+    length = np.zeros(component.max() + 1)
+    length[component[end1]] = dist[end1]
+    flipped = np.zeros(component.max() + 1, dtype=bool)
+    flipped[component[end1]] = flip
+    flipped = flipped[component]
+    dist[flipped] = length[component[flipped]] - dist[flipped]
+
+    return dist
+
+
+def _border_param(
+        param: np.ndarray,
+        border: np.ndarray,
+        component: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+) -> None:
+    """Set the parameter of the pixels of a closed curve, given as the pixel indices of its outer border, to their
+    position along the border starting from the left-most pixel."""
+    start = np.lexsort((y[border], x[border]))[0]
+    border = np.roll(border, -start)
+
+    # Position of the first visit of each pixel.
+    _, first = np.unique(border, return_index=True)
+    param[border[first]] = first
+
+    # Pixels only on the border of a hole follow their nearest neighbour on the outer border.
+    members = (component == component[border[0]]).nonzero()[0]
+    inner = np.setdiff1d(members, border)
+
+    border_x = x[border]
+    border_y = y[border]
+    block = max(1, BORDER_DISTANCE_BLOCK // len(border))
+    for start in range(0, len(inner), block):
+        i = inner[start:start + block]
+        dist = np.abs(border_x - x[i, np.newaxis]) + np.abs(border_y - y[i, np.newaxis])
+        param[i] = dist.argmin(axis=1) + 0.5
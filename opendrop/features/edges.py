@@ -0,0 +1,275 @@
+from typing import Dict, List, Sequence, Tuple
+import threading
+
+import cv2
+import numpy as np
+
+from opendrop.frame import PixelFormat, as_frame
+from opendrop.geometry import Rect2
+
+
+__all__ = ('EdgeDetector', 'get_edge_detector')
+
+
+_edge_detector = threading.local()
+
+
+def get_edge_detector() -> 'EdgeDetector':
+    """Return an edge detector for the current thread. Its buffers are reused across calls, so results must be
+    consumed before the next image is loaded. The detector and its buffers are freed when the thread exits."""
+    try:
+        detector = _edge_detector.instance
+    except AttributeError:
+        detector = _edge_detector.instance = EdgeDetector()
+
+    return detector
+
+
+class EdgeDetector:
+    """Edge detection steps shared by the feature extractors.
+
+    load() converts to grayscale, blurs and computes the Scharr gradient once per image. Regions that overlap or
+    touch are loaded as one window, so they share the work. Intermediate images are written into buffers that
+    are kept between calls, and no float64 images are created. Arrays returned by the methods are views into
+    these buffers and are only valid until the next call that uses the same buffer.
+
+    16-bit images are processed without reducing them to 8-bit first. Their gradients are stored in units of
+    1/GRADIENT_GAIN of an 8-bit grey level, so thresholds keep their 8-bit meaning while the extra precision is
+    used for edge localization.
+
+    Buffers grow to fit the largest image loaded. Once BUFFER_SHRINK_LOADS images in a row have needed less than
+    1/BUFFER_SHRINK of a buffer, it is freed, so one large image doesn't pin memory for the life of the thread
+    while interleaved small previews don't make the buffers thrash.
+    """
+
+    GRADIENT_GAIN = 8
+    BUFFER_SHRINK = 4
+    BUFFER_SHRINK_LOADS = 8
+
+    def __init__(self) -> None:
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._windows: List[Tuple[Rect2[int], np.ndarray, np.ndarray]] = []
+        self._image_shape = (0, 0)
+        self._gain = 1
+        # Consecutive loads that needed much smaller buffers than the ones kept.
+        self._small_loads = 0
+
+    def load(self, image: np.ndarray, regions: Sequence[Rect2[int]]) -> None:
+        self._image_shape = image.shape[:2]
+        self._windows = []
+
+        windows = _merge_regions([self._clip(region) for region in regions])
+        self._trim_buffers(windows)
+
+        frame = as_frame(image)
+        if frame.pixel_format.is_16bit:
+            gray_format = PixelFormat.MONO16
+            gray_dtype = np.uint16
+            self._gain = self.GRADIENT_GAIN
+        else:
+            gray_format = PixelFormat.MONO8
+            gray_dtype = np.uint8
+            self._gain = 1
+
+        for i, window in enumerate(windows):
+            subimage = frame[window.y0:window.y1+1, window.x0:window.x1+1]
+            shape = subimage.shape[:2]
+
+            # Only converted if not already grayscale.
+            gray_buffer = self._buffer('gray{}'.format(i), shape, gray_dtype)
+            gray = subimage.convert(gray_format, dst=gray_buffer)
+
+            blur = self._buffer('blur{}'.format(i), shape, gray_dtype)
+            dx = self._buffer('dx{}'.format(i), shape, np.int16)
+            dy = self._buffer('dy{}'.format(i), shape, np.int16)
+
+            cv2.GaussianBlur(gray, ksize=(5, 5), sigmaX=0, dst=blur)
+
+            if gray_dtype == np.uint8:
+                cv2.Scharr(blur, cv2.CV_16S, dx=1, dy=0, dst=dx)
+                cv2.Scharr(blur, cv2.CV_16S, dx=0, dy=1, dst=dy)
+            else:
+                # Scharr of 16-bit images is only available as float, rescale into the int16 gradient buffers.
+                scale = self._gain * 2.0**(8 - gray.bit_depth)
+                tmp = self._buffer('scharr', shape, np.float32)
+                cv2.Scharr(blur, cv2.CV_32F, dx=1, dy=0, dst=tmp, scale=scale)
+                np.clip(tmp, -2**15, 2**15 - 1, out=tmp)
+                np.copyto(dx, tmp, casting='unsafe')
+                cv2.Scharr(blur, cv2.CV_32F, dx=0, dy=1, dst=tmp, scale=scale)
+                np.clip(tmp, -2**15, 2**15 - 1, out=tmp)
+                np.copyto(dy, tmp, casting='unsafe')
+
+            self._windows.append((window, dx, dy))
+
+    def gradient(self, region: Rect2[int]) -> Tuple[np.ndarray, np.ndarray]:
+        region = self._clip(region)
+
+        for window, dx, dy in self._windows:
+            if window.x0 <= region.x0 and region.x1 <= window.x1 \
+                    and window.y0 <= region.y0 and region.y1 <= window.y1:
+                rows = slice(region.y0 - window.y0, region.y1 - window.y0 + 1)
+                cols = slice(region.x0 - window.x0, region.x1 - window.x0 + 1)
+                return dx[rows, cols], dy[rows, cols]
+
+        raise ValueError('Region {} was not loaded'.format(region))
+
+    def strength(self, region: Rect2[int], *, squared: bool = False) -> np.ndarray:
+        """Return the gradient magnitude (or squared magnitude) in `region`, normalized to the range 0-255."""
+        dx, dy = self.gradient(region)
+
+        mag = self._buffer('magnitude', dx.shape, np.float32)
+        tmp = self._buffer('tmp', dx.shape, np.float32)
+        np.multiply(dx, dx, out=mag, dtype=np.float32)
+        mag += np.multiply(dy, dy, out=tmp, dtype=np.float32)
+
+        if not squared:
+            np.sqrt(mag, out=mag)
+
+        mag_max = mag.max()
+        if mag_max > 0:
+            mag *= (2**8 - 1)/mag_max
+
+        out = self._buffer('strength', dx.shape, np.uint8)
+        np.copyto(out, mag, casting='unsafe')
+
+        return out
+
+    def max_gradient(self, region: Rect2[int]) -> float:
+        """Return the largest L1 norm of the gradient in `region`, in 8-bit grey levels."""
+        dx, dy = self.gradient(region)
+
+        tmp0 = self._buffer('l1', dx.shape, np.int32)
+        tmp1 = self._buffer('l1_tmp', dx.shape, np.int32)
+        np.abs(dx, out=tmp0)
+        tmp0 += np.abs(dy, out=tmp1)
+
+        return int(tmp0.max())/self._gain
+
+    def canny(self, region: Rect2[int], mask: np.ndarray, thresh1: float, thresh2: float) -> np.ndarray:
+        """Thin edges with cv2.Canny() using the gradient in `region`, zeroed where `mask` is zero. Thresholds
+        are in 8-bit grey levels."""
+        dx, dy = self.gradient(region)
+
+        masked_dx = self._buffer('masked_dx', dx.shape, np.int16)
+        masked_dy = self._buffer('masked_dy', dx.shape, np.int16)
+        np.multiply(dx, mask, out=masked_dx, casting='unsafe')
+        np.multiply(dy, mask, out=masked_dy, casting='unsafe')
+
+        edges = self._buffer('edges', dx.shape, np.uint8)
+        cv2.Canny(masked_dx, masked_dy, thresh1*self._gain, thresh2*self._gain, edges=edges)
+
+        return edges
+
+    def subpixel(self, region: Rect2[int], points: np.ndarray) -> np.ndarray:
+        """Refine integer edge `points` (relative to `region`) to sub-pixel precision.
+
+        Each point is moved along its gradient direction to the peak of a parabola through the gradient
+        magnitude sampled one pixel either side of it.
+        """
+        dx, dy = self.gradient(region)
+
+        mag = self._buffer('magnitude', dx.shape, np.float32)
+        tmp = self._buffer('tmp', dx.shape, np.float32)
+        np.multiply(dx, dx, out=mag, dtype=np.float32)
+        mag += np.multiply(dy, dy, out=tmp, dtype=np.float32)
+        np.sqrt(mag, out=mag)
+
+        x, y = points
+        gx = dx[y, x].astype(float)
+        gy = dy[y, x].astype(float)
+        norm = np.hypot(gx, gy)
+        norm[norm == 0] = 1.0
+        ux = gx/norm
+        uy = gy/norm
+
+        m0 = mag[y, x]
+        m_minus = _bilinear(mag, x - ux, y - uy)
+        m_plus = _bilinear(mag, x + ux, y + uy)
+
+        curvature = m_minus - 2*m0 + m_plus
+        offset = np.zeros(len(x))
+        np.divide(m_minus - m_plus, 2*curvature, out=offset, where=curvature < 0)
+        np.clip(offset, -0.5, 0.5, out=offset)
+
+        return np.array([x + offset*ux, y + offset*uy])
+
+    def _clip(self, region: Rect2[int]) -> Rect2[int]:
+        height, width = self._image_shape
+        return Rect2(
+            max(0, region.x0),
+            max(0, region.y0),
+            min(width - 1, region.x1),
+            min(height - 1, region.y1),
+        )
+
+    def clear(self) -> None:
+        """Free all buffers."""
+        self._buffers.clear()
+        self._windows = []
+        self._small_loads = 0
+
+    def _trim_buffers(self, windows: Sequence[Rect2[int]]) -> None:
+        max_size = max(((window.x1 - window.x0 + 1) * (window.y1 - window.y0 + 1) for window in windows), default=0)
+
+        oversized = [
+            name for name, buffer in self._buffers.items()
+            if buffer.size > self.BUFFER_SHRINK * max_size
+        ]
+        if not oversized:
+            self._small_loads = 0
+            return
+
+        self._small_loads += 1
+        if self._small_loads < self.BUFFER_SHRINK_LOADS:
+            return
+
+        for name in oversized:
+            del self._buffers[name]
+        self._small_loads = 0
+
+    def _buffer(self, name: str, shape: Tuple[int, int], dtype) -> np.ndarray:
+        size = shape[0] * shape[1]
+        buffer = self._buffers.get(name)
+
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = np.empty(size, dtype)
+            self._buffers[name] = buffer
+
+        return buffer[:size].reshape(shape)
+
+
+def _merge_regions(regions: Sequence[Rect2[int]]) -> List[Rect2[int]]:
+    """Merge regions that overlap or touch into their bounding rectangles."""
+    windows = list(regions)
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(windows)):
+            for j in range(i + 1, len(windows)):
+                a, b = windows[i], windows[j]
+                if a.x0 <= b.x1 + 1 and b.x0 <= a.x1 + 1 and a.y0 <= b.y1 + 1 and b.y0 <= a.y1 + 1:
+                    windows[i] = Rect2(min(a.x0, b.x0), min(a.y0, b.y0), max(a.x1, b.x1), max(a.y1, b.y1))
+                    del windows[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return windows
+
+
+def _bilinear(image: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    height, width = image.shape
+    x = np.clip(x, 0, width - 1)
+    y = np.clip(y, 0, height - 1)
+
+    x0 = np.minimum(x.astype(int), max(0, width - 2))
+    y0 = np.minimum(y.astype(int), max(0, height - 2))
+    x1 = np.minimum(x0 + 1, width - 1)
+    y1 = np.minimum(y0 + 1, height - 1)
+    tx = x - x0
+    ty = y - y0
+
+    return (image[y0, x0]*(1 - tx) + image[y0, x1]*tx)*(1 - ty) \
+        + (image[y1, x0]*(1 - tx) + image[y1, x1]*tx)*ty
@@ -0,0 +1,28 @@
+from typing import Tuple
+
+import numpy as np
+
+from opendrop.geometry import Vector2
+
+
+__all__ = ('label_points',)
+
+
+def label_points(*point_sets: np.ndarray) -> Tuple[np.ndarray, Vector2[int]]:
+    """Rasterize 2xN arrays of image coordinates into a uint8 labels array just large enough to contain them.
+    Points in the i-th set are labelled i + 1 and later sets are drawn over earlier ones. Return the labels
+    array and the image position of its top-left pixel."""
+    point_sets = [np.round(points).astype(int) for points in point_sets]
+    nonempty = [points for points in point_sets if points.shape[1] > 0]
+
+    if not nonempty:
+        return np.zeros((0, 0), dtype=np.uint8), Vector2(0, 0)
+
+    x0, y0 = np.min([points.min(axis=1) for points in nonempty], axis=0)
+    x1, y1 = np.max([points.max(axis=1) for points in nonempty], axis=0)
+
+    labels = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=np.uint8)
+    for i, (x, y) in enumerate(point_sets):
+        labels[y - y0, x - x0] = i + 1
+
+    return labels, Vector2(int(x0), int(y0))
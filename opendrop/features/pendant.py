@@ -1,5 +1,6 @@
 from typing import NamedTuple, Optional, Tuple
 import math
+import threading
 
 import cv2
 import numpy as np
@@ -7,17 +8,38 @@ import numpy as np
 from opendrop.geometry import Rect2, Vector2
 from opendrop.utility.misc import rotation_mat2d
 
+from .contour import trace_contour
+from .edges import EdgeDetector, get_edge_detector
+from .labels import label_points
+from .pyramid import pyramid_level, pyramid_down, _region_down, _point_down, _point_up, _points_up
 
-__all__ = ('PendantFeatures', 'extract_pendant_features', 'find_pendant_apex')
+
+__all__ = ('PendantFeatures', 'extract_pendant_features', 'PendantApexFinder', 'find_pendant_apex')
 
 
 # Math constants.
 PI = math.pi
 
+# Largest change in rotation (radians) and sideways shift of the apex (relative to the apex radius) for which a
+# previous result is still used to orient the symmetry axis.
+PRIOR_ROTATION_TOL = 0.1
+PRIOR_OFFSET_TOL   = 0.1
+
+# Search margin (relative to its size) around the previous drop edge's bounding box for the drop edge's
+# connected component, and padding around the component for the Canny stage.
+CC_SEED_MARGIN = 0.1
+CC_PADDING = 2
+
+
+# Apex finder used by find_pendant_apex(), one per thread since its buffers are reused between calls.
+_apex_finder = threading.local()
+
 RotatedRect = Tuple[Vector2[float], Vector2[float], Vector2[float], Vector2[float]]
 
 
 class PendantFeatures(NamedTuple):
+    # Labels only cover the bounding box of the edge points, labels_position is the image position of its
+    # top-left pixel.
     labels: np.ndarray
 
     drop_points: np.ndarray = np.empty((2, 0), dtype=int)
@@ -29,6 +51,8 @@ class PendantFeatures(NamedTuple):
     needle_rect: Optional[RotatedRect] = None
     needle_diameter: Optional[float] = None
 
+    labels_position: Vector2[int] = Vector2(0, 0)
+
     def __eq__(self, other: 'PendantFeatures') -> bool:
         if not isinstance(other, PendantFeatures):
             return False
@@ -52,33 +76,53 @@ def extract_pendant_features(
         thresh1: float = 80.0,
         thresh2: float = 160.0,
         labels: bool = False,
+        subpixel: bool = False,
+        ordered: bool = False,
+        apex_prior: Optional[Tuple[Vector2[float], float, float]] = None,
+        drop_edge_prior: Optional[Rect2[int]] = None,
+        scale: float = 1.0,
 ) -> PendantFeatures:
+    """If `scale` is less than 1, edges are detected on the coarsest image pyramid level with at least that
+    resolution, which is much faster when a preview is displayed smaller than the image. Returned coordinates
+    and lengths are always in full resolution pixels."""
     from opendrop.fit import needle_fit
 
-    if drop_region is not None:
-        drop_image = image[drop_region.y0:drop_region.y1+1, drop_region.x0:drop_region.x1+1]
-    else:
-        drop_image = None
+    level = pyramid_level(scale)
+    if level > 0:
+        image = pyramid_down(image, level)
+        drop_region = _region_down(drop_region, level)
+        needle_region = _region_down(needle_region, level)
+        drop_edge_prior = _region_down(drop_edge_prior, level)
+        if apex_prior is not None:
+            apex_prior = (_point_down(apex_prior[0], level), apex_prior[1]/2**level, apex_prior[2])
 
-    if needle_region is not None:
-        needle_image = image[needle_region.y0:needle_region.y1+1, needle_region.x0:needle_region.x1+1]
-    else:
-        needle_image = None
+    # Compute gradients once, shared by the drop and needle regions where they overlap.
+    detector = get_edge_detector()
+    detector.load(image, [region for region in (drop_region, needle_region) if region is not None])
 
     drop_points = np.empty((2, 0), dtype=int)
     drop_apex = None
     drop_radius = None
     drop_rotation = None
 
-    if drop_image is not None:
-        if len(drop_image.shape) > 2:
-            drop_image = cv2.cvtColor(drop_image, cv2.COLOR_RGB2GRAY)
-
-        drop_points = _extract_drop_edge(drop_image, thresh1, thresh2)
+    if drop_region is not None:
+        if drop_edge_prior is not None:
+            drop_edge_prior -= drop_region.position
+        drop_points = _extract_drop_edge(
+            detector,
+            drop_region,
+            thresh1,
+            thresh2,
+            subpixel=subpixel,
+            ordered=ordered,
+            seed=drop_edge_prior,
+        )
 
         # There shouldn't be more points than the perimeter of the image.
         if drop_points.shape[1] < 2*(image.shape[0] + image.shape[1]):
-            ans = find_pendant_apex(drop_points)
+            if apex_prior is not None and drop_region is not None:
+                apex_prior = (apex_prior[0] - drop_region.position, *apex_prior[1:])
+            ans = find_pendant_apex(drop_points, apex_prior)
             if ans is not None:
                 drop_apex, drop_radius, drop_rotation = ans
 
@@ -86,17 +130,9 @@ def extract_pendant_features(
     needle_rect = None
     needle_diameter = None
 
-    if needle_image is not None:
-        if len(needle_image.shape) > 2:
-            needle_image = cv2.cvtColor(needle_image, cv2.COLOR_RGB2GRAY)
-
-        blur = cv2.GaussianBlur(needle_image, ksize=(5, 5), sigmaX=0)
-        dx = cv2.Scharr(blur, cv2.CV_16S, dx=1, dy=0)
-        dy = cv2.Scharr(blur, cv2.CV_16S, dx=0, dy=1)
-
+    if needle_region is not None:
         # Use magnitude of gradient squared to get sharper edges.
-        mask = (dx.astype(float)**2 + dy.astype(float)**2)
-        mask = (mask/mask.max() * (2**8 - 1)).astype(np.uint8)
+        mask = detector.strength(needle_region, squared=True)
         cv2.adaptiveThreshold(
             mask,
             maxValue=1,
@@ -108,7 +144,7 @@ def extract_pendant_features(
         )
 
         # Hack: Thin edges using cv2.Canny()
-        needle_edges = cv2.Canny(dx=mask*dx, dy=mask*dy, threshold1=0.0, threshold2=0.0)
+        needle_edges = detector.canny(needle_region, mask, 0.0, 0.0)
 
         needle_points = np.array(needle_edges.nonzero()[::-1])
 
@@ -170,12 +206,21 @@ def extract_pendant_features(
                 needle_region.position + needle_rect[3],
             )
 
+    if level > 0:
+        drop_points = _points_up(drop_points, level)
+        needle_points = _points_up(needle_points, level)
+        if drop_apex is not None:
+            drop_apex = _point_up(drop_apex, level)
+            drop_radius *= 2**level
+        if needle_rect is not None:
+            needle_rect = tuple(_point_up(corner, level) for corner in needle_rect)
+            needle_diameter *= 2**level
+
     if labels:
-        labels_array = np.zeros(image.shape[:2], dtype=np.uint8)
-        labels_array[tuple(drop_points)[::-1]] = 1
-        labels_array[tuple(needle_points)[::-1]] = 2
+        labels_array, labels_position = label_points(drop_points, needle_points)
     else:
         labels_array = None
+        labels_position = Vector2(0, 0)
 
     return PendantFeatures(
         labels=labels_array,
@@ -187,18 +232,22 @@ def extract_pendant_features(
 
         needle_rect = needle_rect,
         needle_diameter = needle_diameter,
-    )
 
+        labels_position=labels_position,
+    )
 
-def _extract_drop_edge(gray: np.ndarray, thresh1: float, thresh2: float) -> np.ndarray:
-    blur = cv2.GaussianBlur(gray, ksize=(5, 5), sigmaX=0)
-    dx = cv2.Scharr(blur, cv2.CV_16S, dx=1, dy=0)
-    dy = cv2.Scharr(blur, cv2.CV_16S, dx=0, dy=1)
 
+def _extract_drop_edge(
+        detector: EdgeDetector,
+        region: Rect2[int],
+        thresh1: float,
+        thresh2: float,
+        subpixel: bool = False,
+        ordered: bool = False,
+        seed: Optional[Rect2[int]] = None,
+) -> np.ndarray:
     # Use magnitude of gradient squared to get sharper edges.
-    grad = dx.astype(float)**2 + dy.astype(float)**2
-    grad /= grad.max()
-    grad = (grad * (2**8 - 1)).astype(np.uint8)
+    grad = detector.strength(region, squared=True)
 
     cv2.adaptiveThreshold(
         grad,
@@ -210,16 +259,62 @@ def _extract_drop_edge(gray: np.ndarray, thresh1: float, thresh2: float) -> np.n
         dst=grad
     )
 
+    mask, bbox = _largest_connected_component(grad, seed)
+
+    # Only run Canny inside the component's bounding box, padded so edges on its boundary aren't clipped.
+    x0 = max(0, bbox.x0 - CC_PADDING)
+    y0 = max(0, bbox.y0 - CC_PADDING)
+    x1 = min(grad.shape[1] - 1, bbox.x1 + CC_PADDING)
+    y1 = min(grad.shape[0] - 1, bbox.y1 + CC_PADDING)
+    padded_mask = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=bool)
+    padded_mask[bbox.y0 - y0:bbox.y1 - y0 + 1, bbox.x0 - x0:bbox.x1 - x0 + 1] = mask
+    subregion = Rect2(x0, y0, x1, y1) + region.position
+
     # Hack: Use cv2.Canny() to do non-max suppression edge thinning.
-    mask = _largest_connected_component(grad)
-    edges = cv2.Canny(dx*mask, dy*mask, thresh1, thresh2)
-    points = np.array(edges.nonzero()[::-1])
+    edges = detector.canny(subregion, padded_mask, thresh1, thresh2)
+    if ordered:
+        points = trace_contour(edges)
+    else:
+        points = np.array(edges.nonzero()[::-1])
+
+    if subpixel:
+        points = detector.subpixel(subregion, points)
+
+    points += np.reshape((x0, y0), (2, 1))
 
     return points
 
 
-def _largest_connected_component(gray: np.ndarray) -> np.ndarray:
-    mask: np.ndarray
+def _largest_connected_component(
+        gray: np.ndarray,
+        seed: Optional[Rect2[int]] = None,
+) -> Tuple[np.ndarray, Rect2[int]]:
+    """Return a mask of the connected component with the largest bounding box, cropped to that bounding box,
+    and the bounding box. If `seed` is given, only look in a window around it, unless the component found
+    there reaches the edge of the window."""
+    height, width = gray.shape
+
+    if seed is not None:
+        margin_x = int(CC_SEED_MARGIN*seed.w) + CC_PADDING
+        margin_y = int(CC_SEED_MARGIN*seed.h) + CC_PADDING
+        window = Rect2(
+            max(0, seed.x0 - margin_x),
+            max(0, seed.y0 - margin_y),
+            min(width - 1, seed.x1 + margin_x),
+            min(height - 1, seed.y1 + margin_y),
+        )
+
+        if window.x0 < window.x1 and window.y0 < window.y1:
+            ans = _largest_connected_component(gray[window.y0:window.y1+1, window.x0:window.x1+1])
+            mask, bbox = ans
+            bbox += window.position
+
+            # Component might continue outside the window.
+            if (bbox.x0 > window.x0 or window.x0 == 0) \
+                    and (bbox.y0 > window.y0 or window.y0 == 0) \
+                    and (bbox.x1 < window.x1 or window.x1 == width - 1) \
+                    and (bbox.y1 < window.y1 or window.y1 == height - 1):
+                return mask, bbox
 
     # Values returned are n_labels, labels, stats, centroids.
     _, labels, stats, _ = cv2.connectedComponentsWithStats(gray, connectivity=4)
@@ -232,114 +327,224 @@ def _largest_connected_component(gray: np.ndarray) -> np.ndarray:
         else:
             biggest_label = ix[0]
 
-        mask = (labels == biggest_label)
+        bbox = Rect2(
+            x=stats[biggest_label, cv2.CC_STAT_LEFT],
+            y=stats[biggest_label, cv2.CC_STAT_TOP],
+            w=stats[biggest_label, cv2.CC_STAT_WIDTH] - 1,
+            h=stats[biggest_label, cv2.CC_STAT_HEIGHT] - 1,
+        )
+        mask = (labels[bbox.y0:bbox.y1+1, bbox.x0:bbox.x1+1] == biggest_label)
     else:
+        bbox = Rect2(0, 0, width - 1, height - 1)
         mask = np.ones(gray.shape, dtype=bool)
     
-    return mask
+    return mask, bbox
 
 
-def find_pendant_apex(data: Tuple[np.ndarray, np.ndarray]) -> Optional[tuple]:
-    from opendrop.fit import circle_fit
+class PendantApexFinder:
+    """Find the apex, apex radius and rotation of a pendant drop profile.
 
-    x, y = data
+    Work buffers are kept between calls, so reuse the same finder for consecutive frames. If the result of a
+    previous frame is passed as `prior` and the new profile is still consistent with it, the symmetry axis
+    search is skipped and the prior is used to orient the axis instead.
+    """
 
-    if len(x) == 0 or len(y) == 0:
-        return None
+    def __init__(self) -> None:
+        # Rows are x, y, bowl x, bowl y, bowl r, bowl z and a temporary.
+        self._buffer = np.empty((7, 0))
+        self._mask = np.empty(0, dtype=bool)
 
-    xc = x.mean()
-    yc = y.mean()
-    radius = np.hypot(x - xc, y - yc).mean()
+    def __call__(
+            self,
+            data: Tuple[np.ndarray, np.ndarray],
+            prior: Optional[Tuple[Vector2[float], float, float]] = None,
+    ) -> Optional[tuple]:
+        from opendrop.fit import circle_fit
 
-    # Fit a circle to the most circular part of the data.
-    circle_fit_result = circle_fit(
-        data,
-        loss='arctan',
-        f_scale=radius/100,
-    )
-    if circle_fit_result is None:
-        return None
+        n = len(data[0])
+        if n == 0:
+            return None
 
-    xc, yc = circle_fit_result.center
-    radius = circle_fit_result.radius
-    resids = np.abs(circle_fit_result.residuals)
-    resids_50ptile = np.quantile(resids, 0.5)
+        self._reserve(n)
 
-    # The somewhat circular-ish part of the drop profile.
-    bowl_mask = resids < 10*resids_50ptile
-    bowl_x = x[bowl_mask]
-    bowl_y = y[bowl_mask]
+        xy = self._buffer[:2, :n]
+        xy[:] = data
+        x, y = xy
+        tmp = self._buffer[6, :n]
 
-    if len(bowl_x) == 0:
-        return None
+        xc = x.mean()
+        yc = y.mean()
+        np.subtract(x, xc, out=self._buffer[2, :n])
+        np.subtract(y, yc, out=self._buffer[3, :n])
+        radius = np.hypot(self._buffer[2, :n], self._buffer[3, :n], out=tmp).mean()
 
-    # Don't need these variables anymore.
-    del resids, resids_50ptile
-
-    # Find the symmetry axis of bowl.
-    Ixx, Iyy, Ixy = _calculate_inertia(bowl_x, bowl_y)
-
-    # Eigenvector calculation for a symmetric 2x2 matrix.
-    rotation = 0.5 * np.arctan2(2 * Ixy, Ixx - Iyy)
-    unit_r = np.array([ np.cos(rotation), np.sin(rotation)])
-    unit_z = np.array([-np.sin(rotation), np.cos(rotation)])
-
-    bowl_r = unit_r @ [bowl_x - xc, bowl_y - yc]
-    bowl_z = unit_z @ [bowl_x - xc, bowl_y - yc]
-    bowl_r_ix = np.argsort(bowl_r)
-    bowl_z_ix = np.argsort(bowl_z)
-
-    # Calculate "asymmetry" along each axis. We define this to be the squared difference between the left and
-    # right points, integrated along the axis.
-    ma_kernel = np.ones(max(1, len(bowl_r)//10))
-    ma_kernel /= len(ma_kernel)
-    asymm_r = (np.convolve((bowl_z - bowl_z.mean())[bowl_r_ix], ma_kernel, mode='valid')**2).sum()
-    asymm_z = (np.convolve((bowl_r - bowl_r.mean())[bowl_z_ix], ma_kernel, mode='valid')**2).sum()
-    if asymm_z > asymm_r:
-        # Swap axes so z is the symmetry axis.
-        rotation -= PI/2
-        unit_r, unit_z = -unit_z, unit_r
-        bowl_r, bowl_z = -bowl_z, bowl_r
-        bowl_r_ix, bowl_z_ix = bowl_z_ix[::-1], bowl_r_ix
-
-    # No longer useful variables (and potentially incorrect after axes swapping).
-    del asymm_r, asymm_z
-
-    bowl_z_hist, _ = np.histogram(bowl_z, bins=2 + len(bowl_z)//10)
-    if bowl_z_hist.argmax() > len(bowl_z_hist)/2:
-        # Rotate by 180 degrees since points are accumulating (where dz/ds ~ 0) at high z, i.e. drop apex is
-        # not on the bottom.
-        rotation += PI
-        unit_r *= -1
-        unit_z *= -1
-        bowl_r *= -1
-        bowl_z *= -1
-        bowl_r_ix = bowl_r_ix[::-1]
-        bowl_z_ix = bowl_z_ix[::-1]
-
-    bowl_z_ix_apex_arc_stop = np.searchsorted(np.abs(bowl_r), 0.3*radius, side='right', sorter=bowl_z_ix)
-    apex_arc_ix = bowl_z_ix[:bowl_z_ix_apex_arc_stop]
-    apex_arc_x = bowl_x[apex_arc_ix]
-    apex_arc_y = bowl_y[apex_arc_ix]
-
-    if len(apex_arc_ix) > 10:
-        # Fit another circle to a smaller arc around the apex. Points within 0.3 radians of the apex should
-        # have roughly constant curvature across typical Bond values.
+        # Fit a circle to the most circular part of the data.
         circle_fit_result = circle_fit(
-            np.array([apex_arc_x, apex_arc_y]),
-            xc=xc,
-            yc=yc,
+            xy,
+            loss='arctan',
+            f_scale=radius/100,
+        )
+        if circle_fit_result is None:
+            return None
+
+        xc, yc = circle_fit_result.center
+        radius = circle_fit_result.radius
+        resids = np.abs(circle_fit_result.residuals, out=tmp)
+        resids_50ptile = np.quantile(resids, 0.5)
+
+        # The somewhat circular-ish part of the drop profile.
+        bowl_mask = np.less(resids, 10*resids_50ptile, out=self._mask[:n])
+        m = np.count_nonzero(bowl_mask)
+
+        if m == 0:
+            return None
+
+        # Bowl points relative to the circle center.
+        bowl_dx, bowl_dy, bowl_r, bowl_z, tmp = self._buffer[2:, :m]
+        np.compress(bowl_mask, x, out=bowl_dx)
+        np.compress(bowl_mask, y, out=bowl_dy)
+        bowl_dx -= xc
+        bowl_dy -= yc
+
+        # Find the symmetry axis of bowl.
+        Ixx, Iyy, Ixy = _calculate_inertia(bowl_dx, bowl_dy)
+
+        # Eigenvector calculation for a symmetric 2x2 matrix.
+        rotation = 0.5 * np.arctan2(2 * Ixy, Ixx - Iyy)
+
+        if prior is not None:
+            prior_rotation = _orient_from_prior(prior, Vector2(xc, yc), radius, rotation)
+        else:
+            prior_rotation = None
+
+        if prior_rotation is not None:
+            # Skip the symmetry axis search.
+            rotation = prior_rotation
+            _project(bowl_dx, bowl_dy, rotation, out=(bowl_r, bowl_z), tmp=tmp)
+            bowl_z_ix = np.argsort(bowl_z)
+        else:
+            rotation, bowl_r, bowl_z, bowl_z_ix = self._search_axis(bowl_dx, bowl_dy, rotation)
+
+        bowl_z_ix_apex_arc_stop = np.searchsorted(
+            np.abs(bowl_r, out=tmp),
+            0.3*radius,
+            side='right',
+            sorter=bowl_z_ix,
         )
-        if circle_fit_result is not None:
-            xc, yc = circle_fit_result.center
-            radius = circle_fit_result.radius
+        apex_arc_ix = bowl_z_ix[:bowl_z_ix_apex_arc_stop]
+
+        if len(apex_arc_ix) > 10:
+            # Fit another circle to a smaller arc around the apex. Points within 0.3 radians of the apex should
+            # have roughly constant curvature across typical Bond values.
+            circle_fit_result = circle_fit(
+                np.array([bowl_dx[apex_arc_ix] + xc, bowl_dy[apex_arc_ix] + yc]),
+                xc=xc,
+                yc=yc,
+            )
+            if circle_fit_result is not None:
+                xc, yc = circle_fit_result.center
+                radius = circle_fit_result.radius
+
+        unit_z = np.array([-np.sin(rotation), np.cos(rotation)])
+        apex_x, apex_y = [xc, yc] - radius * unit_z
+
+        # Restrict rotation to [-pi, pi].
+        rotation = (rotation + PI) % (2*PI) - PI
+
+        return Vector2(apex_x, apex_y), radius, rotation
+
+    def _reserve(self, n: int) -> None:
+        capacity = self._buffer.shape[1]
+        if capacity >= n:
+            return
+
+        capacity = max(n, 2*capacity)
+        self._buffer = np.empty((self._buffer.shape[0], capacity))
+        self._mask = np.empty(capacity, dtype=bool)
+
+    def _search_axis(self, bowl_dx: np.ndarray, bowl_dy: np.ndarray, rotation: float) -> tuple:
+        m = len(bowl_dx)
+        bowl_r, bowl_z, tmp = self._buffer[4:, :m]
+
+        _project(bowl_dx, bowl_dy, rotation, out=(bowl_r, bowl_z), tmp=tmp)
+        bowl_r_ix = np.argsort(bowl_r)
+        bowl_z_ix = np.argsort(bowl_z)
+
+        # Calculate "asymmetry" along each axis. We define this to be the squared difference between the left and
+        # right points, integrated along the axis.
+        ma_kernel = np.ones(max(1, m//10))
+        ma_kernel /= len(ma_kernel)
+        np.subtract(bowl_z, bowl_z.mean(), out=tmp)
+        asymm_r = (np.convolve(tmp[bowl_r_ix], ma_kernel, mode='valid')**2).sum()
+        np.subtract(bowl_r, bowl_r.mean(), out=tmp)
+        asymm_z = (np.convolve(tmp[bowl_z_ix], ma_kernel, mode='valid')**2).sum()
+        if asymm_z > asymm_r:
+            # Swap axes so z is the symmetry axis.
+            rotation -= PI/2
+            bowl_r, bowl_z = np.negative(bowl_z, out=bowl_z), bowl_r
+            bowl_z_ix = bowl_r_ix
+
+        bowl_z_hist, _ = np.histogram(bowl_z, bins=2 + m//10)
+        if bowl_z_hist.argmax() > len(bowl_z_hist)/2:
+            # Rotate by 180 degrees since points are accumulating (where dz/ds ~ 0) at high z, i.e. drop apex is
+            # not on the bottom.
+            rotation += PI
+            np.negative(bowl_r, out=bowl_r)
+            np.negative(bowl_z, out=bowl_z)
+            bowl_z_ix = bowl_z_ix[::-1]
+
+        return rotation, bowl_r, bowl_z, bowl_z_ix
+
+
+def _orient_from_prior(
+        prior: Tuple[Vector2[float], float, float],
+        center: Vector2[float],
+        radius: float,
+        rotation: float,
+) -> Optional[float]:
+    """Return the principal axis orientation closest to the prior rotation, or None if the prior is no longer
+    consistent with the bowl."""
+    prior_apex, _, prior_rotation = prior
+
+    rotation += round((prior_rotation - rotation)/(PI/2)) * PI/2
+    if abs(rotation - prior_rotation) > PRIOR_ROTATION_TOL:
+        return None
+
+    # Previous apex should still be below the bowl center and close to the symmetry axis.
+    prior_r, prior_z = _project(*(prior_apex - center), rotation)
+    if prior_z > 0 or abs(prior_r) > PRIOR_OFFSET_TOL*radius:
+        return None
+
+    return rotation
+
+
+def _project(dx, dy, rotation: float, out=None, tmp=None):
+    """Rotate (dx, dy) by -rotation, i.e. into the (r, z) coordinates of a drop with the given rotation."""
+    cos_rot = math.cos(rotation)
+    sin_rot = math.sin(rotation)
+
+    if out is None:
+        return cos_rot*dx + sin_rot*dy, -sin_rot*dx + cos_rot*dy
+
+    r, z = out
+    np.multiply(dx, cos_rot, out=r)
+    r += np.multiply(dy, sin_rot, out=tmp)
+    np.multiply(dy, cos_rot, out=z)
+    z -= np.multiply(dx, sin_rot, out=tmp)
+
+    return r, z
 
-    apex_x, apex_y = [xc, yc] - radius * unit_z
 
-    # Restrict rotation to [-pi, pi].
-    rotation = (rotation + PI) % (2*PI) - PI
+def find_pendant_apex(
+        data: Tuple[np.ndarray, np.ndarray],
+        prior: Optional[Tuple[Vector2[float], float, float]] = None,
+) -> Optional[tuple]:
+    try:
+        finder = _apex_finder.instance
+    except AttributeError:
+        finder = _apex_finder.instance = PendantApexFinder()
 
-    return Vector2(apex_x, apex_y), radius, rotation
+    return finder(data, prior)
 
 
 def _calculate_inertia(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float]:
@@ -0,0 +1,71 @@
+from typing import Optional
+import math
+
+import cv2
+import numpy as np
+
+from opendrop.frame import Frame
+from opendrop.geometry import Rect2, Vector2
+
+
+__all__ = ('pyramid_level', 'pyramid_down')
+
+
+# Coarsest level used, regions shrink by half at each level.
+MAX_PYRAMID_LEVEL = 4
+
+
+def pyramid_level(scale: float) -> int:
+    """Return the coarsest pyramid level whose resolution (2**-level) is still at least `scale`."""
+    if not scale < 1.0:
+        return 0
+
+    level = int(math.floor(-math.log2(max(scale, 2.0**-MAX_PYRAMID_LEVEL)) + 1e-9))
+
+    return min(level, MAX_PYRAMID_LEVEL)
+
+
+def pyramid_down(image: np.ndarray, level: int) -> np.ndarray:
+    """Return `image` downsampled by cv2.pyrDown() `level` times."""
+    downsampled = image
+    for _ in range(level):
+        downsampled = cv2.pyrDown(downsampled)
+
+    if isinstance(image, Frame):
+        downsampled = Frame(downsampled, image.pixel_format, image.bit_depth)
+
+    return downsampled
+
+
+def _region_down(region: Optional[Rect2[int]], level: int) -> Optional[Rect2[int]]:
+    """Return the pixels at `level` covering `region`, the far edges are rounded up to include partly covered
+    pixels."""
+    if region is None or level == 0:
+        return region
+
+    return Rect2(
+        int(region.x0) >> level,
+        int(region.y0) >> level,
+        -(-int(region.x1) >> level),
+        -(-int(region.y1) >> level),
+    )
+
+
+def _point_down(point: Vector2[float], level: int) -> Vector2[float]:
+    factor = 2**level
+    return Vector2((point.x + 0.5)/factor - 0.5, (point.y + 0.5)/factor - 0.5)
+
+
+def _point_up(point: Vector2[float], level: int) -> Vector2[float]:
+    factor = 2**level
+    return Vector2((point.x + 0.5)*factor - 0.5, (point.y + 0.5)*factor - 0.5)
+
+
+def _points_up(points: np.ndarray, level: int) -> np.ndarray:
+    """Map a 2xN array of coordinates at `level` back to full resolution. Pixel i at a level covers pixels
+    2*i and 2*i + 1 of the level above it."""
+    if level == 0:
+        return points
+
+    factor = 2**level
+    return (points + 0.5)*factor - 0.5
@@ -3,3 +3,4 @@ from .circle import *
 from .needle import *
 from .younglaplace import *
 from .conan import *
+from .pipeline import *
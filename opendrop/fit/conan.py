@@ -1,19 +1,43 @@
 import math
-from typing import NamedTuple, Optional
+from typing import List, NamedTuple, Optional, Sequence
 
 import numpy as np
+import scipy.optimize
 
 from opendrop.geometry import Line2, Vector2
 from opendrop.utility.misc import rotation_mat2d
-from opendrop.fit import line_fit, circle_fit
+from opendrop.fit import line_fit, circle_fit, young_laplace_fit
+from opendrop.fit.younglaplace.model import get_shape
+from opendrop.fit.younglaplace.types import YoungLaplaceParam
 
 
-__all__ = ('ContactAngleFitResult', 'contact_angle_fit')
+__all__ = ('ContactAngleFitResult', 'contact_angle_fit', 'contact_angle_fit_batch', 'CONTACT_ANGLE_FIT_METHODS')
 
 # Math constants
 PI = math.pi
 NAN = math.nan
 
+# 'arc': line or circular arc near each contact point.
+# 'polynomial': local quadratic in the frame of the contact tangent near each contact point.
+# 'young-laplace': axisymmetric sessile drop profile fitted to the whole drop.
+CONTACT_ANGLE_FIT_METHODS = ('arc', 'polynomial', 'young-laplace')
+
+# Degree of the local polynomial used by the 'polynomial' fit method.
+POLYNOMIAL_DEGREE = 2
+# Refinements of the contact point and tangent used as the frame of the local polynomial.
+POLYNOMIAL_STEPS = 3
+# Once the curvature at the contact is known, only points within this fraction of the radius of curvature from the
+# contact are fitted, so the quadratic stays accurate for strongly curved profiles.
+POLYNOMIAL_WINDOW = 0.3
+# Fewest points the window may shrink to.
+POLYNOMIAL_MIN_POINTS = 10
+
+# Number of samples along each side of the fitted Young-Laplace profile used to bracket the contact points.
+YOUNG_LAPLACE_CONTACT_SAMPLES = 200
+
+# Newton iterations used to solve the Taubin characteristic polynomial in contact_angle_fit_batch().
+TAUBIN_STEPS = 20
+
 
 class ContactAngleFitResult(NamedTuple):
     left_contact: Optional[Vector2[float]]
@@ -38,7 +62,13 @@ class ContactAngleFitResult(NamedTuple):
     right_mask: Optional[np.ndarray]
 
 
-def contact_angle_fit(data: np.ndarray, baseline: Line2) -> ContactAngleFitResult:
+def contact_angle_fit(data: np.ndarray, baseline: Line2, *, method: str = 'arc') -> ContactAngleFitResult:
+    if method not in CONTACT_ANGLE_FIT_METHODS:
+        raise ValueError(
+            "Unknown fit method '{}', must be one of {}"
+            .format(method, CONTACT_ANGLE_FIT_METHODS)
+        )
+
     # Drop points in (x, y) image coordinates.
     xy = data
 
@@ -53,12 +83,8 @@ def contact_angle_fit(data: np.ndarray, baseline: Line2) -> ContactAngleFitResul
         Q[1] *= -1
         rz[1] *= -1
 
-    # Sort in ascending height from baseline.
-    z_ix = rz[1].argsort()
-    z_ix_inv = z_ix.argsort()
-
-    rz = rz[:, z_ix]
-    xy = xy[:, z_ix]
+    if method == 'young-laplace':
+        return _young_laplace_contact_fit(rz, Q, baseline.pt0)
 
     rc = rz[0].mean()
 
@@ -67,13 +93,14 @@ def contact_angle_fit(data: np.ndarray, baseline: Line2) -> ContactAngleFitResul
 
     left_rz  = rz[:, left_mask]
     right_rz = rz[:, right_mask]
-    
-    # Approximates for left and right contact points.
-    left_contact_rz  = left_rz[:, 0]
-    right_contact_rz = right_rz[:, 0]
 
-    left_dists = np.linalg.norm(left_rz - np.reshape(left_contact_rz, (2, 1)), axis=0)
-    right_dists = np.linalg.norm(right_rz - np.reshape(right_contact_rz, (2, 1)), axis=0)
+    # Approximates for left and right contact points, i.e. the lowest point on each side. Points are never sorted,
+    # all masks and per-point results stay in the order of the input data.
+    left_contact_rz  = left_rz[:, left_rz[1].argmin()]
+    right_contact_rz = right_rz[:, right_rz[1].argmin()]
+
+    left_dists = np.hypot(*(left_rz - np.reshape(left_contact_rz, (2, 1))))
+    right_dists = np.hypot(*(right_rz - np.reshape(right_contact_rz, (2, 1))))
 
     base_width = right_contact_rz[0] - left_contact_rz[0]
 
@@ -96,8 +123,12 @@ def contact_angle_fit(data: np.ndarray, baseline: Line2) -> ContactAngleFitResul
     right_arclengths = None
     right_residuals = None
 
-    left_arc_fit = _arc_fit(left_rz)
-    right_arc_fit = _arc_fit(right_rz)
+    if method == 'polynomial':
+        left_arc_fit = _polynomial_fit(left_rz)
+        right_arc_fit = _polynomial_fit(right_rz)
+    else:
+        left_arc_fit = _arc_fit(left_rz)
+        right_arc_fit = _arc_fit(right_rz)
 
     if left_arc_fit is not None:
         left_angle = left_arc_fit.angle
@@ -139,8 +170,8 @@ def contact_angle_fit(data: np.ndarray, baseline: Line2) -> ContactAngleFitResul
         right_arclengths,
         left_residuals,
         right_residuals,
-        left_mask[z_ix_inv],
-        right_mask[z_ix_inv],
+        left_mask,
+        right_mask,
     )
 
 
@@ -159,7 +190,7 @@ def _arc_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
         # A simple line fit somehow failed, this does not bode well.
         return None
 
-    if not (line_fit_result.residuals < 1.0).all():
+    if not _fits_line(line_fit_result.residuals):
         circular_fit_result = _arc_circular_fit(data)
         if circular_fit_result is not None:
             return circular_fit_result
@@ -169,8 +200,8 @@ def _arc_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
     angle = line_fit_result.angle
     angle %= PI
 
-    # Arbitrary point on line of best fit.
-    pt = rotation_mat2d(angle) @ [0, line_fit_result.rho]
+    # Arbitrary point on line of best fit. Rho is relative to the fitted angle, before it was wrapped.
+    pt = rotation_mat2d(line_fit_result.angle) @ [0, line_fit_result.rho]
     unit = Vector2(np.cos(angle), np.sin(angle))
     if not np.isclose(unit.y, 0):
         grad = unit.x/unit.y
@@ -192,6 +223,11 @@ def _arc_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
     )
 
 
+def _fits_line(residuals: np.ndarray) -> bool:
+    """Whether a line fits to within a pixel. If not, a circular arc is tried instead."""
+    return (np.abs(residuals) < 1.0).all()
+
+
 def _arc_circular_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
     circle_fit_result = circle_fit(data)
     if circle_fit_result is None:
@@ -231,14 +267,8 @@ def _arc_circular_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
     if curvature < 0.0:
         arclengths *= -1
 
-    ix = arclengths.argsort()
-    arclengths = arclengths[ix]
-    start = np.searchsorted(ix, 0.0, side='left')
-    arclengths = np.roll(arclengths, -start)
-    arclengths = np.unwrap(arclengths)
+    # Wrap angles to [0, 2*pi) so arclengths are measured in one direction around the circle from the contact.
     arclengths %= 2*PI
-    arclengths = np.roll(arclengths, start)
-    arclengths = arclengths[ix.argsort()]
     arclengths *= radius
 
     return _ArcFitResult(
@@ -249,3 +279,507 @@ def _arc_circular_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
         arclengths,
         residuals,
     )
+
+
+def _polynomial_fit(data: np.ndarray) -> Optional[_ArcFitResult]:
+    """Fit a quadratic to the profile near the contact point in a frame aligned with the contact tangent, i.e.
+    v = p(u) where u is the distance along the tangent and v the distance along the normal. In this frame the
+    profile is close to flat for any contact angle, unlike r = p(z) which is badly biased for low angles. The
+    contact point and tangent are refined over a few steps, starting from the principal direction of the points."""
+    if data.shape[1] <= POLYNOMIAL_DEGREE:
+        return None
+
+    # Initial guess of the contact is the lowest point.
+    origin = data[:, data[1].argmin()]
+
+    centered = data - data.mean(axis=1, keepdims=True)
+    try:
+        _, _, vh = np.linalg.svd(centered.T, full_matrices=False)
+    except np.linalg.LinAlgError:
+        return None
+    # Tangent always points away from the baseline.
+    tangent = vh[0] if vh[0][1] >= 0 else -vh[0]
+
+    window = np.ones(data.shape[1], dtype=bool)
+
+    for _ in range(POLYNOMIAL_STEPS):
+        normal = np.array([-tangent[1], tangent[0]])
+        u = tangent @ (data - origin.reshape(2, 1))
+        v = normal @ (data - origin.reshape(2, 1))
+
+        try:
+            poly = np.polynomial.Polynomial.fit(u[window], v[window], POLYNOMIAL_DEGREE).convert()
+        except np.linalg.LinAlgError:
+            return None
+
+        dpoly = poly.deriv()
+
+        # Height of the polynomial curve above the baseline as a function of u, the contact is the root closest to
+        # the current origin.
+        height = origin[1] + np.polynomial.Polynomial([0.0, tangent[1]]) + normal[1] * poly
+        roots = height.roots()
+        roots = roots[np.isreal(roots)].real
+        if roots.size == 0:
+            return None
+        u0 = roots[np.abs(roots).argmin()]
+
+        origin = origin + u0 * tangent + poly(u0) * normal
+        origin[1] = 0.0
+
+        tangent = tangent + dpoly(u0) * normal
+        tangent /= np.hypot(*tangent)
+        if tangent[1] < 0:
+            tangent *= -1
+
+        curvature = abs(dpoly.deriv()(u0))
+        if curvature > 0:
+            new_window = np.abs(tangent @ (data - origin.reshape(2, 1))) < POLYNOMIAL_WINDOW/curvature
+            if np.count_nonzero(new_window) >= max(POLYNOMIAL_MIN_POINTS, POLYNOMIAL_DEGREE + 1):
+                window = new_window
+
+    # Final fit about the refined contact point and tangent.
+    normal = np.array([-tangent[1], tangent[0]])
+    u = tangent @ (data - origin.reshape(2, 1))
+    v = normal @ (data - origin.reshape(2, 1))
+
+    try:
+        poly = np.polynomial.Polynomial.fit(u[window], v[window], POLYNOMIAL_DEGREE).convert()
+    except np.linalg.LinAlgError:
+        return None
+
+    dpoly = poly.deriv()
+    d2poly = dpoly.deriv()
+
+    contact = origin[0]
+    # Angle of the tangent measured from the baseline.
+    angle = math.atan2(tangent[1], tangent[0])
+    # Signed curvature of the profile traversed away from the baseline, same convention as _arc_fit().
+    curvature = d2poly(0.0) / (1 + dpoly(0.0)**2)**1.5
+
+    # Distance of each point from the polynomial, approximated using the local slope.
+    residuals = (v - poly(u)) / np.sqrt(1 + dpoly(u)**2)
+    # Chord length from the contact point.
+    arclengths = np.hypot(u, poly(u))
+
+    return _ArcFitResult(
+        contact,
+        angle,
+        curvature,
+        None,
+        arclengths,
+        residuals,
+    )
+
+
+def _young_laplace_contact_fit(rz: np.ndarray, Q: np.ndarray, origin: Vector2[float]) -> ContactAngleFitResult:
+    # Fit in a frame where height is measured downwards from the baseline, so an unrotated sessile profile (apex
+    # at the origin, increasing depth into the drop) sits on the baseline with its apex at the top.
+    data = rz * [[1], [-1]]
+
+    left_mask = np.zeros(rz.shape[1], dtype=bool)
+    right_mask = np.zeros(rz.shape[1], dtype=bool)
+    no_result = ContactAngleFitResult(*(None,)*12, left_mask, right_mask)
+
+    initial_params = _young_laplace_sessile_guess(rz)
+    if initial_params is None:
+        return no_result
+
+    try:
+        result = young_laplace_fit(data, sessile=True, initial_params=initial_params)
+    except ValueError:
+        return no_result
+
+    # Shape is shared with the fit, so the profile is already solved up to the furthest data point.
+    shape = get_shape(-result.bond)
+    radius = result.radius
+    apex = np.array([result.apex_x, result.apex_y])
+    rot = rotation_mat2d(result.rotation)
+
+    def profile(s: float) -> np.ndarray:
+        return rot @ (radius * shape(s)) + apex
+
+    s_data = result.arclengths
+    left_mask[:] = s_data < 0
+    right_mask[:] = ~left_mask
+
+    sides = []
+    for mask, sign in ((left_mask, -1), (right_mask, 1)):
+        if not mask.any():
+            sides.append((None,)*5)
+            continue
+
+        # Find where the profile first crosses the baseline, searching a bit past the furthest data point.
+        s_end = min(1.5 * np.abs(s_data[mask]).max(), 99.0)
+        s_grid = sign * np.linspace(0.0, s_end, YOUNG_LAPLACE_CONTACT_SAMPLES)
+        depth = (rot @ (radius * shape(s_grid)))[1] + apex[1]
+        crossing = np.flatnonzero(depth >= 0.0)
+        if len(crossing) == 0 or crossing[0] == 0:
+            # Profile does not reach the baseline.
+            sides.append((None,)*5)
+            continue
+
+        s_contact = scipy.optimize.brentq(
+            lambda s: profile(s)[1],
+            s_grid[crossing[0] - 1],
+            s_grid[crossing[0]],
+        )
+        contact = profile(s_contact)
+
+        h = 1.e-6
+        dr, dd = (profile(s_contact + h) - profile(s_contact - h)) / (2*h)
+        # Direction along the profile towards the apex, in (r, z) baseline coordinates, is (-sign*dr, sign*dd).
+        if sign < 0:
+            angle = math.atan2(-dd, dr)
+        else:
+            angle = math.atan2(dd, dr)
+
+        # Meridional curvature at the contact point from the Young-Laplace equation, in units of 1/px.
+        shape_r, shape_z = shape(abs(s_contact))
+        shape_dr, shape_dz = (shape(abs(s_contact) + h) - shape(abs(s_contact) - h)) / (2*h)
+        phi = math.atan2(shape_dz, shape_dr)
+        curvature = (2 + result.bond*shape_z - math.sin(phi)/shape_r) / radius
+
+        sides.append((
+            Vector2(Q.T @ [contact[0], 0.0] + origin),
+            angle,
+            sign * curvature,
+            sign * (s_contact - s_data[mask]) * radius,
+            result.residuals[mask],
+        ))
+
+    (left_contact, left_angle, left_curvature, left_arclengths, left_residuals), \
+    (right_contact, right_angle, right_curvature, right_arclengths, right_residuals) = sides
+
+    return ContactAngleFitResult(
+        left_contact,
+        right_contact,
+        left_angle,
+        right_angle,
+        left_curvature,
+        right_curvature,
+        None,
+        None,
+        left_arclengths,
+        right_arclengths,
+        left_residuals,
+        right_residuals,
+        left_mask,
+        right_mask,
+    )
+
+
+def _young_laplace_sessile_guess(rz: np.ndarray) -> Optional[np.ndarray]:
+    if rz.shape[1] < 2*len(YoungLaplaceParam):
+        return None
+
+    r, z = rz
+    z_max = z.max()
+
+    # Estimate apex curvature from the upper half of the drop.
+    circle_fit_result = circle_fit(rz[:, z > 0.5*z_max])
+    if circle_fit_result is not None:
+        apex_r = circle_fit_result.center.x
+        radius = circle_fit_result.radius
+    else:
+        apex_r = r[z.argmax()]
+        radius = (r.max() - r.min())/2
+
+    params = np.empty(len(YoungLaplaceParam))
+    params[YoungLaplaceParam.BOND] = 0.1
+    params[YoungLaplaceParam.RADIUS] = radius
+    params[YoungLaplaceParam.APEX_X] = apex_r
+    params[YoungLaplaceParam.APEX_Y] = -z_max
+    params[YoungLaplaceParam.ROTATION] = 0.0
+
+    return params
+
+
+def contact_angle_fit_batch(
+        data: Sequence[np.ndarray],
+        baselines: Sequence[Line2],
+) -> List[ContactAngleFitResult]:
+    """Fit many frames at once, returning one result per (data, baseline) pair.
+
+    The left and right sides of every frame are processed together in vectorized form. Instead of the iterative
+    solvers used by contact_angle_fit(), arcs are found with closed-form algebraic fits (a total least squares
+    line and a Taubin circle), so results agree with contact_angle_fit() to within the usual fitting tolerance
+    but are not bit-for-bit identical. Per-point results are in the order of each frame's input points, as in
+    contact_angle_fit().
+    """
+    n_frames = len(data)
+    if len(baselines) != n_frames:
+        raise ValueError(
+            "data and baselines must have equal lengths, got {} and {}"
+            .format(n_frames, len(baselines))
+        )
+
+    if n_frames == 0:
+        return []
+
+    sizes = np.array([pts.shape[1] for pts in data], dtype=int)
+    frame_starts = np.cumsum(sizes) - sizes
+    frame_ix = np.repeat(np.arange(n_frames), sizes)
+    nonempty = sizes > 0
+
+    # Drop points of all frames in (x, y) image coordinates.
+    xy = np.concatenate([np.reshape(pts, (2, -1)) for pts in data], axis=1).astype(float)
+
+    # Rotation matrices to transform each frame to "baseline" coordinates.
+    Q = np.array([[line.unit, line.perp] for line in baselines], dtype=float)
+    origins = np.array([line.pt0 for line in baselines], dtype=float)
+
+    # Drop points in (r, z) baseline coordinates.
+    dx, dy = xy - origins[frame_ix].T
+    r = Q[frame_ix, 0, 0]*dx + Q[frame_ix, 0, 1]*dy
+    z = Q[frame_ix, 1, 0]*dx + Q[frame_ix, 1, 1]*dy
+
+    # Drop is probably on the other side of the line.
+    flip = np.zeros(n_frames, dtype=bool)
+    if nonempty.any():
+        z_min = np.minimum.reduceat(z, frame_starts[nonempty])
+        z_max = np.maximum.reduceat(z, frame_starts[nonempty])
+        flip[nonempty] = np.abs(z_min) > np.abs(z_max)
+    Q[flip, 1] *= -1
+    z[flip[frame_ix]] *= -1
+
+    # Split each frame into left (even group) and right (odd group) sides about the mean r coordinate.
+    rc = np.bincount(frame_ix, r, minlength=n_frames) / np.maximum(sizes, 1)
+    right = r >= rc[frame_ix]
+    group_ix = 2*frame_ix + right
+    n_groups = 2*n_frames
+
+    # Order points by group, then in ascending height from baseline. The first point of each group is then the
+    # approximate contact point for that side.
+    order = np.lexsort((z, group_ix))
+    group_counts = np.bincount(group_ix, minlength=n_groups)
+    group_starts = np.cumsum(group_counts) - group_counts
+    has_points = group_counts > 0
+
+    contact_r = np.full(n_groups, NAN)
+    contact_z = np.full(n_groups, NAN)
+    contact_r[has_points] = r[order[group_starts[has_points]]]
+    contact_z[has_points] = z[order[group_starts[has_points]]]
+
+    base_width = contact_r[1::2] - contact_r[0::2]
+
+    # Fit an arc to points near the contact using base_width as a distance scale.
+    dists = np.hypot(r - contact_r[group_ix], z - contact_z[group_ix])
+    with np.errstate(invalid='ignore'):
+        fit_mask = dists < 0.25 * base_width[frame_ix]
+
+    # Indices of the points to fit, still ordered by group then height.
+    fit_ix = order[fit_mask[order]]
+    fit_group_ix = group_ix[fit_ix]
+    fit_counts = np.bincount(fit_group_ix, minlength=n_groups)
+    fit_starts = np.cumsum(fit_counts) - fit_counts
+
+    arcs = _arc_fit_batch(r[fit_ix], z[fit_ix], fit_group_ix, fit_counts, fit_starts)
+
+    # Per-point results back in the order of the input data, like contact_angle_fit().
+    arclengths = np.full(len(r), NAN)
+    residuals = np.full(len(r), NAN)
+    arclengths[fit_ix] = arcs.arclengths
+    residuals[fit_ix] = arcs.residuals
+
+    results = []
+    for i in range(n_frames):
+        frame_slice = slice(frame_starts[i], frame_starts[i] + sizes[i])
+        frame_fit_mask = fit_mask[frame_slice]
+        frame_right = right[frame_slice]
+        side_masks = (frame_fit_mask & ~frame_right, frame_fit_mask & frame_right)
+
+        sides = []
+        for g, side_mask in zip((2*i, 2*i + 1), side_masks):
+            if not arcs.fitted[g]:
+                sides.append((None,)*6)
+                continue
+
+            Qi = Q[i]
+            pt0 = origins[i]
+
+            angle = arcs.angle[g]
+            if g % 2 == 1:
+                angle = PI - angle
+
+            if math.isfinite(arcs.contact[g]):
+                contact = Vector2(Qi.T @ [arcs.contact[g], 0] + pt0)
+            else:
+                # Use initial guess.
+                contact = Vector2(Qi.T @ [contact_r[g], contact_z[g]] + pt0)
+
+            if math.isfinite(arcs.center_r[g]):
+                arc_center = Vector2(Qi.T @ [arcs.center_r[g], arcs.center_z[g]] + pt0)
+            else:
+                arc_center = None
+
+            sides.append((
+                contact,
+                angle,
+                arcs.curvature[g],
+                arc_center,
+                arclengths[frame_slice][side_mask],
+                residuals[frame_slice][side_mask],
+            ))
+
+        (left_contact, left_angle, left_curvature, left_arc_center, left_arclengths, left_residuals), \
+        (right_contact, right_angle, right_curvature, right_arc_center, right_arclengths, right_residuals) = sides
+
+        results.append(ContactAngleFitResult(
+            left_contact,
+            right_contact,
+            left_angle,
+            right_angle,
+            left_curvature,
+            right_curvature,
+            left_arc_center,
+            right_arc_center,
+            left_arclengths,
+            right_arclengths,
+            left_residuals,
+            right_residuals,
+            *side_masks,
+        ))
+
+    return results
+
+
+class _ArcFitBatchResult(NamedTuple):
+    fitted: np.ndarray
+    contact: np.ndarray
+    angle: np.ndarray
+    curvature: np.ndarray
+    center_r: np.ndarray
+    center_z: np.ndarray
+    arclengths: np.ndarray
+    residuals: np.ndarray
+
+
+def _arc_fit_batch(
+        r: np.ndarray,
+        z: np.ndarray,
+        group_ix: np.ndarray,
+        counts: np.ndarray,
+        starts: np.ndarray,
+) -> _ArcFitBatchResult:
+    """Vectorized counterpart of _arc_fit(). Points must be sorted by group, per-group values are returned in
+    arrays indexed by group and per-point values in the same order as the input."""
+    n_groups = len(counts)
+    nonempty = counts > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_mean = np.bincount(group_ix, r, minlength=n_groups) / counts
+        z_mean = np.bincount(group_ix, z, minlength=n_groups) / counts
+
+        u = r - r_mean[group_ix]
+        v = z - z_mean[group_ix]
+        w = u**2 + v**2
+
+        Muu = np.bincount(group_ix, u*u, minlength=n_groups) / counts
+        Mvv = np.bincount(group_ix, v*v, minlength=n_groups) / counts
+        Muv = np.bincount(group_ix, u*v, minlength=n_groups) / counts
+        Muw = np.bincount(group_ix, u*w, minlength=n_groups) / counts
+        Mvw = np.bincount(group_ix, v*w, minlength=n_groups) / counts
+        Mww = np.bincount(group_ix, w*w, minlength=n_groups) / counts
+
+    # Total least squares line, the direction of the line is the principal axis of the points.
+    line_angle = (0.5 * np.arctan2(2*Muv, Muu - Mvv)) % PI
+    line_sin = np.sin(line_angle)
+    line_cos = np.cos(line_angle)
+    line_rho = line_cos*z_mean - line_sin*r_mean
+    line_residuals = line_cos[group_ix]*z - line_sin[group_ix]*r - line_rho[group_ix]
+
+    # A simple line fit needs at least two points.
+    fitted = counts >= 2
+
+    # Only try a circle if the line does not fit to within a pixel, same as _fits_line().
+    needs_circle = fitted & (np.bincount(group_ix, ~(np.abs(line_residuals) < 1.0), minlength=n_groups) > 0)
+
+    circle_r, circle_z, radius = _taubin_circle_fit(Muu, Mvv, Muv, Muw, Mvw, Mww)
+    circle_r += r_mean
+    circle_z += z_mean
+
+    with np.errstate(invalid='ignore'):
+        # Make sure circle intersects the baseline, otherwise fallback to line fit.
+        use_circle = needs_circle & (counts >= 3) & np.isfinite(radius) & (circle_z <= radius)
+        l = np.sqrt(radius**2 - circle_z**2)
+
+    intersect1 = circle_r - l
+    intersect2 = circle_r + l
+
+    # Set contact point to be the intersection closest to the drop arc.
+    dist1 = np.full(n_groups, np.inf)
+    dist2 = np.full(n_groups, np.inf)
+    if nonempty.any():
+        dist1[nonempty] = np.minimum.reduceat(np.hypot(r - intersect1[group_ix], z), starts[nonempty])
+        dist2[nonempty] = np.minimum.reduceat(np.hypot(r - intersect2[group_ix], z), starts[nonempty])
+    circle_contact = np.where(dist1 < dist2, intersect1, intersect2)
+
+    q = np.arctan2(circle_z, circle_r - circle_contact)
+    circle_angle = (q + PI/2) % PI
+
+    with np.errstate(divide='ignore'):
+        curvature = 1/radius
+    # In the unlikely event that the center lies directly above the contact, use the side of the data instead.
+    concave = np.where(circle_r == circle_contact, r_mean > circle_contact, circle_r > circle_contact)
+    curvature[concave] *= -1
+
+    circle_arclengths = np.arctan2(circle_z[group_ix] - z, circle_r[group_ix] - r) - q[group_ix]
+    circle_arclengths[concave[group_ix]] *= -1
+    circle_arclengths %= 2*PI
+    circle_arclengths *= radius[group_ix]
+
+    circle_residuals = np.hypot(r - circle_r[group_ix], z - circle_z[group_ix]) - radius[group_ix]
+
+    # Line of best fit and baseline could be roughly parallel, then contact point can't be determined.
+    line_parallel = np.isclose(line_sin, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        line_contact = np.where(line_parallel, NAN, -line_rho/line_sin)
+    line_arclengths = line_cos[group_ix]*(r - np.nan_to_num(line_contact)[group_ix]) + line_sin[group_ix]*z
+
+    point_use_circle = use_circle[group_ix]
+
+    return _ArcFitBatchResult(
+        fitted=fitted,
+        contact=np.where(use_circle, circle_contact, line_contact),
+        angle=np.where(use_circle, circle_angle, line_angle),
+        curvature=np.where(use_circle, curvature, 0.0),
+        center_r=np.where(use_circle, circle_r, NAN),
+        center_z=np.where(use_circle, circle_z, NAN),
+        arclengths=np.where(point_use_circle, circle_arclengths, line_arclengths),
+        residuals=np.where(point_use_circle, circle_residuals, line_residuals),
+    )
+
+
+def _taubin_circle_fit(
+        Muu: np.ndarray,
+        Mvv: np.ndarray,
+        Muv: np.ndarray,
+        Muw: np.ndarray,
+        Mvw: np.ndarray,
+        Mww: np.ndarray,
+) -> tuple:
+    """Taubin algebraic circle fit of many point sets given their central moments (where w = u**2 + v**2). The
+    smallest root of the characteristic polynomial is found with Newton's method starting at zero. Returns the
+    circle center relative to the centroid, and the radius. Degenerate sets give non-finite values."""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        Mw = Muu + Mvv
+        cov_uv = Muu*Mvv - Muv**2
+        var_w = Mww - Mw**2
+
+        A3 = 4*Mw
+        A2 = -3*Mw**2 - Mww
+        A1 = var_w*Mw + 4*cov_uv*Mw - Muw**2 - Mvw**2
+        A0 = Muw*(Muw*Mvv - Mvw*Muv) + Mvw*(Mvw*Muu - Muw*Muv) - var_w*cov_uv
+
+        x = np.zeros_like(Mw)
+        for _ in range(TAUBIN_STEPS):
+            y = A0 + x*(A1 + x*(A2 + x*A3))
+            dy = A1 + x*(2*A2 + 3*x*A3)
+            x -= y/dy
+
+        det = x**2 - x*Mw + cov_uv
+        uc = (Muw*(Mvv - x) - Mvw*Muv) / det / 2
+        vc = (Mvw*(Muu - x) - Muw*Muv) / det / 2
+        radius = np.sqrt(uc**2 + vc**2 + Mw)
+
+    return uc, vc, radius
@@ -0,0 +1,68 @@
+from typing import Optional, Tuple
+
+from opendrop.geometry import Line2, Rect2
+from opendrop.features import (
+    ContactAngleFeatures,
+    PendantFeatures,
+    extract_contact_angle_features,
+    extract_pendant_features,
+)
+from opendrop.fit.younglaplace import YoungLaplaceFitResult, young_laplace_fit
+from opendrop.fit.conan import ContactAngleFitResult, contact_angle_fit
+
+
+__all__ = ('FitError', 'extract_and_fit_pendant', 'extract_and_fit_contact_angle')
+
+
+class FitError(Exception):
+    """Raised by the extract_and_fit_*() functions when features were extracted but the fit failed. The
+    extracted features are kept in `features`."""
+
+    def __init__(self, features, message: str) -> None:
+        # Pass everything to Exception so that the error pickles when raised in a worker process.
+        super().__init__(features, message)
+        self.features = features
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def extract_and_fit_pendant(
+        image,
+        drop_region: Optional[Rect2[int]] = None,
+        needle_region: Optional[Rect2[int]] = None,
+        **kwargs,
+) -> Tuple[PendantFeatures, YoungLaplaceFitResult]:
+    """Extract the features of a pendant drop image and fit the drop profile. Keyword arguments are passed on to
+    extract_pendant_features().
+
+    Doing both in one call lets a worker process receive the image once and send back only the results, instead
+    of sending the drop points back and forth between the two steps. If the fit fails, FitError is raised with
+    the extracted features."""
+    features = extract_pendant_features(image, drop_region, needle_region, **kwargs)
+    try:
+        result = young_laplace_fit(features.drop_points)
+    except Exception as exc:
+        raise FitError(features, '{}: {}'.format(type(exc).__name__, exc)) from exc
+
+    return features, result
+
+
+def extract_and_fit_contact_angle(
+        image,
+        baseline: Optional[Line2],
+        inverted: bool,
+        *,
+        method: str = 'arc',
+        **kwargs,
+) -> Tuple[ContactAngleFeatures, ContactAngleFitResult]:
+    """Extract the features of a sessile drop image and fit its contact angles with `method`. Keyword arguments
+    are passed on to extract_contact_angle_features(). See extract_and_fit_pendant()."""
+    features = extract_contact_angle_features(image, baseline, inverted, **kwargs)
+    try:
+        result = contact_angle_fit(features.drop_points, baseline, method=method)
+    except Exception as exc:
+        raise FitError(features, '{}: {}'.format(type(exc).__name__, exc)) from exc
+
+    return features, result
@@ -1,4 +1,4 @@
-from typing import Sequence, Tuple, NamedTuple
+from typing import Optional, Sequence, Tuple, NamedTuple
 
 import numpy as np
 import scipy.optimize
@@ -33,8 +33,14 @@ class YoungLaplaceFitResult(NamedTuple):
     surface_area: float
 
 
-def young_laplace_fit(data: Tuple[np.ndarray, np.ndarray], verbose: bool = False):
-    model = YoungLaplaceModel(data)
+def young_laplace_fit(
+        data: Tuple[np.ndarray, np.ndarray],
+        verbose: bool = False,
+        *,
+        sessile: bool = False,
+        initial_params: Optional[Sequence[float]] = None,
+):
+    model = YoungLaplaceModel(data, sessile=sessile)
 
     def fun(params: Sequence[float], model: YoungLaplaceModel) -> np.ndarray:
         model.set_params(params)
@@ -44,7 +50,11 @@ def young_laplace_fit(data: Tuple[np.ndarray, np.ndarray], verbose: bool = False
         model.set_params(params)
         return model.jac
     
-    initial_params = young_laplace_guess(data)
+    if initial_params is None:
+        if sessile:
+            raise ValueError("initial_params must be given for sessile drops")
+        initial_params = young_laplace_guess(data)
+
     if initial_params is None:
         raise ValueError("Parameter estimatation failed for this data set")
     
@@ -26,8 +26,10 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from collections import OrderedDict
 import math
-from typing import Optional, Sequence, Tuple
+import threading
+from typing import Sequence, Tuple
 
 import numpy as np
 
@@ -41,14 +43,44 @@ from .types import YoungLaplaceParam
 PI = math.pi
 NAN = math.nan
 
+# Number of solved shapes kept per thread. Shapes are integrated lazily and are not thread-safe, so each thread
+# keeps its own cache.
+SHAPE_CACHE_SIZE = 16
 
-class YoungLaplaceModel:
-    _shape: Optional[YoungLaplaceShape] = None
 
-    def __init__(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
+_shape_cache = threading.local()
+
+
+def get_shape(bond: float) -> YoungLaplaceShape:
+    """Return a (possibly already solved) shape for this Bond number. The cache is shared by all models, so
+    pendant and sessile fits reuse each other's solutions."""
+    try:
+        cache = _shape_cache.shapes
+    except AttributeError:
+        cache = _shape_cache.shapes = OrderedDict()
+
+    shape = cache.get(bond)
+    if shape is None:
+        shape = YoungLaplaceShape(bond)
+        cache[bond] = shape
+        if len(cache) > SHAPE_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(bond)
+
+    return shape
+
+
+class YoungLaplaceModel:
+    def __init__(self, data: Tuple[np.ndarray, np.ndarray], *, sessile: bool = False) -> None:
         self.data = np.copy(data)
         self.data.flags.writeable = False
 
+        # A sessile drop is the same shape as a pendant drop with the sign of gravity flipped, the Bond number
+        # parameter itself stays positive.
+        self.sessile = sessile
+        self._gravity = -1.0 if sessile else 1.0
+
         self._params = np.empty(len(YoungLaplaceParam))
         self._params_set = False
         self._s = np.empty(shape=(self.data.shape[1],))
@@ -82,7 +114,7 @@ class YoungLaplaceModel:
 
         s[:] = shape.closest(data_r/radius, data_z/radius)
         r, z = radius * shape(s)
-        dr_dBo, dz_dBo = radius * shape.DBo(s)
+        dr_dBo, dz_dBo = self._gravity * radius * shape.DBo(s)
         e_r = data_r - r
         e_z = data_z - z
         e = np.hypot(e_r, e_z)
@@ -99,10 +131,7 @@ class YoungLaplaceModel:
         self._params[:] = params
 
     def _get_shape(self, bond: float) -> YoungLaplaceShape:
-        if self._shape is None or self._shape.bond != bond:
-            self._shape = YoungLaplaceShape(bond)
-
-        return self._shape
+        return get_shape(self._gravity * bond)
 
     @property
     def params(self) -> Sequence[int]:
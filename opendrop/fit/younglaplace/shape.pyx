@@ -57,10 +57,11 @@ cdef class YoungLaplaceShape:
         out = np.empty((2, s.shape[0]))
         outview = out
 
-        for i in range(s.shape[0]):
-            v = self.shape(<double>s[i])
-            outview[0, i] = v[0]
-            outview[1, i] = v[1]
+        with nogil:
+            for i in range(s.shape[0]):
+                v = self.shape(<double>s[i])
+                outview[0, i] = v[0]
+                outview[1, i] = v[1]
 
         return out
 
@@ -84,10 +85,11 @@ cdef class YoungLaplaceShape:
         out = np.empty((2, s.shape[0]))
         outview = out
 
-        for i in range(s.shape[0]):
-            v = self.shape.DBo(<double>s[i])
-            outview[0, i] = v[0]
-            outview[1, i] = v[1]
+        with nogil:
+            for i in range(s.shape[0]):
+                v = self.shape.DBo(<double>s[i])
+                outview[0, i] = v[0]
+                outview[1, i] = v[1]
 
         return out
 
@@ -111,10 +113,13 @@ cdef class YoungLaplaceShape:
         if r.shape[0] != z.shape[0]:
             raise ValueError("r and z must have equal lengths")
 
+        cdef size_t i
+
         out = np.empty(r.shape[0])
         cdef double[:] outview = out
-        for i in range(r.shape[0]):
-            outview[i] = self.shape.closest(<double>r[i], <double>z[i])
+        with nogil:
+            for i in range(r.shape[0]):
+                outview[i] = self.shape.closest(<double>r[i], <double>z[i])
         return out
 
     def volume(self, double s):
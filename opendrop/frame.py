@@ -0,0 +1,177 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import enum
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+__all__ = ('PixelFormat', 'Frame', 'as_frame')
+
+
+class PixelFormat(enum.Enum):
+    MONO8 = 'Mono8'
+    RGB8 = 'RGB8'
+
+    # 16-bit frames keep the camera's bit depth, e.g. Mono12 data is stored as is in the low 12 bits.
+    MONO16 = 'Mono16'
+    RGB16 = 'RGB16'
+
+    @property
+    def is_mono(self) -> bool:
+        return self in (PixelFormat.MONO8, PixelFormat.MONO16)
+
+    @property
+    def is_16bit(self) -> bool:
+        return self in (PixelFormat.MONO16, PixelFormat.RGB16)
+
+    def with_channels(self, mono: bool) -> 'PixelFormat':
+        if self.is_16bit:
+            return PixelFormat.MONO16 if mono else PixelFormat.RGB16
+        else:
+            return PixelFormat.MONO8 if mono else PixelFormat.RGB8
+
+    def with_depth(self, is_16bit: bool) -> 'PixelFormat':
+        if self.is_mono:
+            return PixelFormat.MONO16 if is_16bit else PixelFormat.MONO8
+        else:
+            return PixelFormat.RGB16 if is_16bit else PixelFormat.RGB8
+
+
+class Frame(np.ndarray):
+    """An image array tagged with its pixel format.
+
+    Frames are kept in the format they were acquired in, consumers that need a particular format call
+    convert(), which returns the frame itself if it is already in that format. Views (e.g. slices) of a frame
+    keep its tags, results of arithmetic on a frame are plain arrays.
+    """
+
+    pixel_format = PixelFormat.MONO8
+    bit_depth = 8
+
+    def __new__(
+            cls,
+            array: np.ndarray,
+            pixel_format: Optional[PixelFormat] = None,
+            bit_depth: Optional[int] = None,
+    ) -> 'Frame':
+        frame = np.asarray(array).view(cls)
+
+        if pixel_format is None:
+            pixel_format = _guess_pixel_format(frame)
+        if bit_depth is None:
+            bit_depth = 16 if pixel_format.is_16bit else 8
+
+        frame.pixel_format = pixel_format
+        frame.bit_depth = bit_depth
+
+        return frame
+
+    def __array_finalize__(self, obj: Optional[np.ndarray]) -> None:
+        if obj is None: return
+        self.pixel_format = getattr(obj, 'pixel_format', Frame.pixel_format)
+        self.bit_depth = getattr(obj, 'bit_depth', Frame.bit_depth)
+
+    def __array_wrap__(self, array, *args, **kwargs):
+        result = super().__array_wrap__(array, *args, **kwargs)
+
+        # Pixel format of a computed result is unknown.
+        if isinstance(result, Frame):
+            result = result.view(np.ndarray)
+            if result.ndim == 0:
+                result = result[()]
+
+        return result
+
+    def __reduce__(self):
+        # Keep tags when sent to worker processes.
+        reconstruct, args, state = super().__reduce__()
+        return reconstruct, args, (state, self.pixel_format, self.bit_depth)
+
+    def __setstate__(self, state) -> None:
+        array_state, self.pixel_format, self.bit_depth = state
+        super().__setstate__(array_state)
+
+    def convert(self, pixel_format: PixelFormat, dst: Optional[np.ndarray] = None) -> 'Frame':
+        """Return this frame in `pixel_format`, written into `dst` if given and a conversion is needed. 16-bit
+        frames converted from 8-bit have a bit depth of 8."""
+        frame = self
+
+        # Drop colour first and add it last, so the fewest values are converted.
+        if pixel_format.is_mono and not frame.pixel_format.is_mono:
+            step = frame.pixel_format.with_channels(mono=True)
+            frame = frame._convert_channels(step, dst if step is pixel_format else None)
+
+        if pixel_format.is_16bit != frame.pixel_format.is_16bit:
+            step = frame.pixel_format.with_depth(pixel_format.is_16bit)
+            frame = frame._convert_depth(step, dst if step is pixel_format else None)
+
+        if pixel_format is not frame.pixel_format:
+            frame = frame._convert_channels(pixel_format, dst)
+
+        return frame
+
+    def _convert_channels(self, pixel_format: PixelFormat, dst: Optional[np.ndarray]) -> 'Frame':
+        code = cv2.COLOR_RGB2GRAY if pixel_format.is_mono else cv2.COLOR_GRAY2RGB
+        return Frame(cv2.cvtColor(self, code, dst=dst), pixel_format, self.bit_depth)
+
+    def _convert_depth(self, pixel_format: PixelFormat, dst: Optional[np.ndarray]) -> 'Frame':
+        if pixel_format.is_16bit:
+            if dst is None:
+                dst = np.empty(self.shape, np.uint16)
+            np.copyto(dst, self)
+            return Frame(dst, pixel_format, bit_depth=8)
+
+        # Keep the most significant 8 bits.
+        if dst is None:
+            dst = np.empty(self.shape, np.uint8)
+        np.right_shift(self, self.bit_depth - 8, out=dst, casting='unsafe')
+        return Frame(dst, pixel_format)
+
+
+def as_frame(image: np.ndarray) -> Frame:
+    """Return `image` as a Frame, guessing the pixel format from its shape and type if it is a plain array."""
+    if isinstance(image, Frame):
+        return image
+
+    return Frame(image)
+
+
+def _guess_pixel_format(image: np.ndarray) -> PixelFormat:
+    if image.ndim == 3 and image.shape[2] == 3 and image.dtype == np.uint8:
+        return PixelFormat.RGB8
+    elif image.ndim == 3 and image.shape[2] == 3 and image.dtype == np.uint16:
+        return PixelFormat.RGB16
+    elif image.ndim == 2 and image.dtype == np.uint8:
+        return PixelFormat.MONO8
+    elif image.ndim == 2 and image.dtype == np.uint16:
+        return PixelFormat.MONO16
+    else:
+        raise ValueError(f"Unrecognized image, got shape {image.shape} and type {image.dtype}")
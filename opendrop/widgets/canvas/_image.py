@@ -6,6 +6,7 @@ import cv2
 from gi.repository import GObject, Gdk
 import numpy as np
 
+from opendrop.frame import as_frame
 from opendrop.geometry import Rect2
 
 from ._artist import Artist
@@ -57,8 +58,13 @@ class ImageArtist(Artist):
 
     def set_array(self, arr: np.ndarray) -> None:
         """If arr is a 2D array, it is interpreted as a grayscale image. If arr is a 3D array, it is
-        interpreted as an RGB (if last axis has length 3) or RGBA (if last axis has length 4).
+        interpreted as an RGB (if last axis has length 3) or RGBA (if last axis has length 4). 16-bit images are
+        reduced to 8-bit.
         """
+        if arr.dtype == np.uint16:
+            arr = as_frame(arr)
+            arr = arr.convert(arr.pixel_format.with_depth(is_16bit=False))
+
         if len(arr.shape) == 2:
             data = cv2.cvtColor(arr, cv2.COLOR_GRAY2BGRA).view(np.uint32)
             if sys.byteorder == 'big':
@@ -0,0 +1,127 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.image_processing.plugins.preview.model import FrameChangeDetector
+from opendrop.frame import Frame, PixelFormat
+from opendrop.geometry import Rect2
+
+
+SHAPE = (120, 160)
+DROP_REGION = Rect2(20, 20, 99, 99)
+EDGE_X = 60
+
+
+def scene(edge_x: int = EDGE_X) -> np.ndarray:
+    """Dark drop on the left of a vertical edge inside DROP_REGION, bright background elsewhere."""
+    image = np.full(SHAPE, 200.0)
+    image[20:100, 20:edge_x] = 100.0
+    return image
+
+
+def noisy(image: np.ndarray, rng: np.random.Generator, sigma: float = 3.0) -> np.ndarray:
+    return np.clip(image + rng.normal(0.0, sigma, image.shape), 0, 255).astype(np.uint8)
+
+
+def test_first_frame_changed():
+    detector = FrameChangeDetector()
+    assert detector.changed(scene().astype(np.uint8), [DROP_REGION])
+
+
+def test_noise_unchanged():
+    rng = np.random.default_rng(0)
+    for regions in [[DROP_REGION], []]:
+        detector = FrameChangeDetector()
+        detector.changed(noisy(scene(), rng), regions)
+
+        for _ in range(20):
+            assert not detector.changed(noisy(scene(), rng), regions)
+
+
+def test_edge_shift_changed():
+    rng = np.random.default_rng(0)
+    detector = FrameChangeDetector()
+    detector.changed(noisy(scene(), rng), [DROP_REGION])
+
+    assert detector.changed(noisy(scene(EDGE_X + 1), rng), [DROP_REGION])
+
+    # Shifted frame is the new reference.
+    assert not detector.changed(noisy(scene(EDGE_X + 1), rng), [DROP_REGION])
+
+
+def test_change_outside_regions_ignored():
+    rng = np.random.default_rng(0)
+    detector = FrameChangeDetector()
+    detector.changed(noisy(scene(), rng), [DROP_REGION, None])
+
+    image = scene()
+    image[:, 120:] = 0.0
+    image[105:, :] = 0.0
+    assert not detector.changed(noisy(image, rng), [DROP_REGION, None])
+
+    # Without regions the whole image is compared.
+    detector.changed(noisy(scene(), rng), [])
+    assert detector.changed(noisy(image, rng), [])
+
+
+def test_region_change_changed():
+    image = scene().astype(np.uint8)
+    detector = FrameChangeDetector()
+    detector.changed(image, [DROP_REGION])
+
+    assert detector.changed(image, [Rect2(20, 20, 100, 99)])
+    assert detector.changed(image, [Rect2(20, 20, 100, 99), Rect2(0, 0, 10, 10)])
+
+
+def test_reset():
+    image = scene().astype(np.uint8)
+    detector = FrameChangeDetector()
+    detector.changed(image, [DROP_REGION])
+    assert not detector.changed(image, [DROP_REGION])
+
+    detector.reset()
+    assert detector.changed(image, [DROP_REGION])
+    assert not detector.changed(image, [DROP_REGION])
+
+
+def test_high_bit_depth_threshold_in_8bit_levels():
+    rng = np.random.default_rng(0)
+    detector = FrameChangeDetector()
+
+    def mono12(image: np.ndarray) -> Frame:
+        return Frame(noisy(image, rng).astype(np.uint16) << 4, PixelFormat.MONO16, bit_depth=12)
+
+    detector.changed(mono12(scene()), [DROP_REGION])
+    assert not detector.changed(mono12(scene()), [DROP_REGION])
+    assert detector.changed(mono12(scene(EDGE_X + 1)), [DROP_REGION])
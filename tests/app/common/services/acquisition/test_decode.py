@@ -0,0 +1,135 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer.decode import DecodeQueue, DecodedInputImage
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class Loader:
+    """Records the order images are loaded in."""
+
+    def __init__(self) -> None:
+        self.loaded = []
+        self._lock = threading.Lock()
+
+    def __call__(self, index: int):
+        with self._lock:
+            self.loaded.append(index)
+        return np.full((2, 2), index, np.uint8), float(index)
+
+
+def make_images(loader, n, *, queue, loop):
+    return [DecodedInputImage(lambda i=i: loader(i), queue=queue, loop=loop) for i in range(n)]
+
+
+def test_decodes_in_order_up_to_capacity(loop, executor):
+    loader = Loader()
+    queue = DecodeQueue(executor, capacity=2)
+    images = make_images(loader, 5, queue=queue, loop=loop)
+
+    assert loop.run_until_complete(images[0].read())[1] == 0.0
+    assert loop.run_until_complete(images[1].read())[1] == 1.0
+
+    # Nothing is released yet, so no more images are decoded.
+    loop.run_until_complete(asyncio.sleep(0.05))
+    assert loader.loaded == [0, 1]
+
+    images[0].release()
+    assert loop.run_until_complete(images[2].read())[1] == 2.0
+    assert loader.loaded == [0, 1, 2]
+
+
+def test_release_is_idempotent(loop, executor):
+    loader = Loader()
+    queue = DecodeQueue(executor, capacity=1)
+    images = make_images(loader, 3, queue=queue, loop=loop)
+
+    loop.run_until_complete(images[0].read())
+    images[0].release()
+    images[0].release()
+
+    loop.run_until_complete(images[1].read())
+    loop.run_until_complete(asyncio.sleep(0.05))
+
+    # Releasing twice must not free a second slot.
+    assert loader.loaded == [0, 1]
+
+
+def test_cancel_waiting_image_is_never_decoded(loop, executor):
+    loader = Loader()
+    queue = DecodeQueue(executor, capacity=1)
+    images = make_images(loader, 3, queue=queue, loop=loop)
+
+    images[1].cancel()
+
+    loop.run_until_complete(images[0].read())
+    images[0].release()
+    loop.run_until_complete(images[2].read())
+
+    assert loader.loaded == [0, 2]
+    with pytest.raises(asyncio.CancelledError):
+        loop.run_until_complete(images[1].read())
+
+
+def test_load_error_frees_slot(loop, executor):
+    def fail():
+        raise OSError('unreadable')
+
+    loader = Loader()
+    queue = DecodeQueue(executor, capacity=1)
+    bad = DecodedInputImage(fail, queue=queue, loop=loop)
+    good = DecodedInputImage(lambda: loader(1), queue=queue, loop=loop)
+
+    with pytest.raises(OSError):
+        loop.run_until_complete(bad.read())
+
+    assert loop.run_until_complete(good.read())[1] == 1.0
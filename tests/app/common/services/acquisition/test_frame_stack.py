@@ -0,0 +1,149 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer.frame_stack import FrameStack, is_frame_stack
+from opendrop.frame import PixelFormat
+
+
+@pytest.fixture
+def frames():
+    return np.random.default_rng(0).integers(0, 256, size=(3, 20, 30), dtype=np.uint8)
+
+
+def test_is_frame_stack(tmp_path):
+    assert is_frame_stack(tmp_path/'a.npy')
+    assert is_frame_stack(tmp_path/'a.TIF')
+    assert is_frame_stack(tmp_path/'a.raw')
+    assert not is_frame_stack(tmp_path/'a.png')
+
+
+def test_npy(tmp_path, frames):
+    path = tmp_path/'stack.npy'
+    np.save(path, frames)
+
+    stack = FrameStack(path)
+
+    assert len(stack) == 3
+    for i in range(3):
+        np.testing.assert_array_equal(stack[i], frames[i])
+    assert stack[-1].pixel_format is PixelFormat.MONO8
+
+    # Frames are read-only views of the mapped file.
+    assert not stack[0].flags.owndata
+    assert not stack[0].flags.writeable
+
+
+def test_npy_single_rgb_frame(tmp_path):
+    frame = np.zeros((20, 30, 3), np.uint8)
+    path = tmp_path/'frame.npy'
+    np.save(path, frame)
+
+    stack = FrameStack(path)
+
+    assert len(stack) == 1
+    assert stack[0].pixel_format is PixelFormat.RGB8
+
+
+def test_raw_with_sidecar(tmp_path):
+    frames = np.arange(2*20*30, dtype='<u2').reshape(2, 20, 30) & 0xfff
+    path = tmp_path/'stack.raw'
+    path.write_bytes(b'\0'*16 + frames.tobytes())
+    (tmp_path/'stack.json').write_text(json.dumps({
+        'width': 30,
+        'height': 20,
+        'dtype': '<u2',
+        'offset': 16,
+        'bit_depth': 12,
+    }))
+
+    stack = FrameStack(path)
+
+    assert len(stack) == 2
+    np.testing.assert_array_equal(stack[1], frames[1])
+    assert stack[1].pixel_format is PixelFormat.MONO16
+    assert stack[1].bit_depth == 12
+
+
+def test_raw_without_sidecar(tmp_path):
+    path = tmp_path/'stack.raw'
+    path.write_bytes(bytes(100))
+
+    with pytest.raises(ValueError):
+        FrameStack(path)
+
+
+def test_uncompressed_tiff_pages_are_mapped(tmp_path, frames):
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(str(path), list(frames), [cv2.IMWRITE_TIFF_COMPRESSION, 1])
+
+    stack = FrameStack(path)
+
+    assert len(stack) == 3
+    assert all(page is not None for page in stack._pages)
+    for i in range(3):
+        np.testing.assert_array_equal(stack[i], frames[i])
+
+
+def test_compressed_tiff_pages_are_decoded(tmp_path, frames):
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(str(path), list(frames), [cv2.IMWRITE_TIFF_COMPRESSION, 5])
+
+    stack = FrameStack(path)
+
+    assert len(stack) == 3
+    np.testing.assert_array_equal(stack[2], frames[2])
+    assert stack[2].pixel_format is PixelFormat.MONO8
+
+
+@pytest.mark.parametrize('dtype, pixel_format', [
+    (np.uint8, PixelFormat.RGB8),
+    (np.uint16, PixelFormat.RGB16),
+])
+def test_compressed_rgb_tiff_pages_keep_colour(tmp_path, dtype, pixel_format):
+    rgb = np.random.default_rng(0).integers(0, 256, size=(2, 20, 30, 3)).astype(dtype)
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(
+        str(path),
+        [cv2.cvtColor(frame, cv2.COLOR_RGB2BGR) for frame in rgb],
+        [cv2.IMWRITE_TIFF_COMPRESSION, 5],
+    )
+
+    stack = FrameStack(path)
+
+    assert stack[1].pixel_format is pixel_format
+    np.testing.assert_array_equal(stack[1], rgb[1])
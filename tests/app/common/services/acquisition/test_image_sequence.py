@@ -0,0 +1,121 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer.image_sequence import (
+    ImageSequenceAcquirer,
+    LazyImageSequence,
+)
+
+
+class Loader:
+    """Records the sources images are loaded from."""
+
+    def __init__(self) -> None:
+        self.loaded = []
+
+    def __call__(self, source: str) -> np.ndarray:
+        self.loaded.append(source)
+        return np.full((2, 3), ord(source), np.uint8)
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_loads_on_demand():
+    loader = Loader()
+    images = LazyImageSequence('abcd', loader)
+
+    assert len(images) == 4
+    assert loader.loaded == []
+
+    assert images[1][0, 0] == ord('b')
+    assert images[-1][0, 0] == ord('d')
+    assert loader.loaded == ['b', 'd']
+
+
+def test_cache_keeps_most_recent_images():
+    loader = Loader()
+    images = LazyImageSequence('abcd', loader, cache_size=2)
+
+    images[0]
+    images[1]
+    images[0]
+    assert loader.loaded == ['a', 'b']
+
+    # Evicts b, the least recently accessed.
+    images[2]
+    images[0]
+    assert loader.loaded == ['a', 'b', 'c']
+
+    images[1]
+    assert loader.loaded == ['a', 'b', 'c', 'b']
+
+
+def test_load_does_not_evict():
+    loader = Loader()
+    images = LazyImageSequence('abcd', loader, cache_size=1)
+
+    images[0]
+    assert images.load(0)[0, 0] == ord('a')
+    assert images.load(1)[0, 0] == ord('b')
+    images[0]
+
+    assert loader.loaded == ['a', 'b']
+
+
+def test_slice():
+    loader = Loader()
+    images = LazyImageSequence('abcd', loader)
+
+    assert [image[0, 0] for image in images[1:3]] == [ord('b'), ord('c')]
+
+
+def test_acquirer_reads_lazily(loop):
+    loader = Loader()
+    acquirer = ImageSequenceAcquirer()
+    acquirer.bn_images.set(LazyImageSequence('abc', loader))
+    acquirer.bn_frame_interval.set(2)
+
+    input_images = acquirer.acquire_images()
+    assert loader.loaded == []
+
+    image, timestamp = loop.run_until_complete(input_images[2].read())
+    assert image[0, 0] == ord('c')
+    assert timestamp == 4
+    assert loader.loaded == ['c']
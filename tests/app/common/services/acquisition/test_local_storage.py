@@ -0,0 +1,161 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import asyncio
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer import local_storage
+from opendrop.app.common.services.acquisition._acquirer.local_storage import LocalStorageAcquirer
+
+
+NUM_IMAGES = 5
+
+
+def level(index: int) -> int:
+    """Grey level of image `index`."""
+    return 40*index
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for i in range(NUM_IMAGES):
+        path = tmp_path/'image{}.png'.format(i)
+        cv2.imwrite(str(path), np.full((24, 32), level(i), np.uint8))
+        paths.append(path)
+
+    (tmp_path/'subdirectory').mkdir()
+
+    return paths
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+@pytest.fixture
+def acquirer(loop):
+    acquirer = LocalStorageAcquirer()
+    yield acquirer
+    acquirer.destroy()
+
+
+@pytest.fixture
+def decode_threads(monkeypatch):
+    """Records the threads images are decoded on."""
+    threads = []
+    decode_image = local_storage._decode_image
+
+    def spy(path):
+        threads.append(threading.current_thread().name)
+        return decode_image(path)
+
+    monkeypatch.setattr(local_storage, '_decode_image', spy)
+    return threads
+
+
+def test_load_image_paths(acquirer, image_paths, decode_threads):
+    directory = image_paths[0].parent/'subdirectory'
+    acquirer.load_image_paths([*reversed(image_paths), directory])
+
+    assert acquirer.bn_last_loaded_paths.get() == tuple(image_paths)
+    assert len(acquirer.bn_images.get()) == NUM_IMAGES
+
+    # Nothing is decoded until it's needed.
+    assert decode_threads == []
+
+
+def test_read_decodes_in_background(loop, acquirer, image_paths, decode_threads):
+    acquirer.load_image_paths(image_paths)
+    acquirer.bn_frame_interval.set(0.5)
+    input_images = acquirer.acquire_images()
+
+    async def read_all():
+        return await asyncio.gather(*(input_image.read() for input_image in input_images))
+
+    results = loop.run_until_complete(read_all())
+
+    for i, (image, timestamp) in enumerate(results):
+        assert image.shape == (24, 32)
+        assert (image == level(i)).all()
+        assert not image.flags.writeable
+        assert timestamp == 0.5*i
+
+    assert len(decode_threads) == NUM_IMAGES
+    assert all(name.startswith('ImageDecoder') for name in decode_threads)
+
+    for input_image in input_images:
+        input_image.release()
+
+
+def test_undecodable_image_raises_when_read(loop, acquirer, image_paths):
+    # Valid header, truncated data.
+    data = image_paths[2].read_bytes()
+    image_paths[2].write_bytes(data[:len(data)//2])
+
+    acquirer.load_image_paths(image_paths)
+    acquirer.bn_frame_interval.set(1)
+    input_images = acquirer.acquire_images()
+
+    image, _ = loop.run_until_complete(input_images[1].read())
+    assert (image == level(1)).all()
+    input_images[1].release()
+
+    with pytest.raises(ValueError):
+        loop.run_until_complete(input_images[2].read())
+
+    image, _ = loop.run_until_complete(input_images[3].read())
+    assert (image == level(3)).all()
+
+    for input_image in input_images:
+        input_image.release()
+
+
+def test_unsupported_file_fails_to_load(acquirer, image_paths):
+    image_paths[0].write_bytes(b'not an image')
+
+    with pytest.raises(ValueError):
+        acquirer.load_image_paths(image_paths)
+
+
+def test_acquire_without_images(acquirer):
+    with pytest.raises(ValueError):
+        acquirer.acquire_images()
@@ -0,0 +1,156 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer.pipeline import Backpressure, FramePipeline
+
+
+class FakeImage:
+    def __init__(self, name: str, *, capturable: bool = True) -> None:
+        self.name = name
+        self.est_ready = time.time()
+        self.state = 'due'
+        self._capturable = capturable
+
+    def capture(self) -> bool:
+        if not self._capturable:
+            return False
+        self.state = 'captured'
+        return True
+
+    def drop(self) -> None:
+        self.state = 'dropped'
+
+    def deliver(self) -> None:
+        self.state = 'delivered'
+
+    def __repr__(self) -> str:
+        return 'FakeImage({!r})'.format(self.name)
+
+
+def fill(pipeline: FramePipeline, *names):
+    images = [FakeImage(name) for name in names]
+    for image in images:
+        pipeline.due(image)
+    return images
+
+
+def test_delivers_up_to_capacity_then_queues():
+    pipeline = FramePipeline(capacity=2)
+
+    a, b, c, d = fill(pipeline, 'a', 'b', 'c', 'd')
+
+    assert [image.state for image in (a, b, c, d)] == ['delivered', 'delivered', 'captured', 'captured']
+    assert pipeline.bn_in_flight.get() == 2
+    assert pipeline.bn_queue_depth.get() == 2
+
+    pipeline.release(a)
+
+    assert c.state == 'delivered'
+    assert pipeline.bn_in_flight.get() == 2
+    assert pipeline.bn_queue_depth.get() == 1
+
+
+def test_block():
+    pipeline = FramePipeline(capacity=1, policy=Backpressure.BLOCK)
+
+    a, b, c = fill(pipeline, 'a', 'b', 'c')
+
+    # c is not captured until there is room.
+    assert c.state == 'due'
+    assert pipeline.bn_queue_depth.get() == 2
+    assert pipeline.bn_dropped.get() == 0
+
+    pipeline.release(a)
+
+    assert b.state == 'delivered'
+    assert c.state == 'captured'
+    assert pipeline.bn_queue_depth.get() == 1
+
+
+def test_drop_oldest():
+    pipeline = FramePipeline(capacity=1, policy=Backpressure.DROP_OLDEST)
+
+    a, b, c = fill(pipeline, 'a', 'b', 'c')
+
+    assert b.state == 'dropped'
+    assert c.state == 'captured'
+    assert pipeline.bn_dropped.get() == 1
+
+    pipeline.release(a)
+
+    assert c.state == 'delivered'
+
+
+def test_downsample():
+    pipeline = FramePipeline(capacity=1, policy=Backpressure.DOWNSAMPLE)
+
+    a, b, c = fill(pipeline, 'a', 'b', 'c')
+
+    assert b.state == 'captured'
+    assert c.state == 'dropped'
+    assert pipeline.bn_dropped.get() == 1
+
+    pipeline.release(a)
+
+    assert b.state == 'delivered'
+    assert pipeline.bn_queue_depth.get() == 0
+
+
+def test_failed_capture_is_not_queued():
+    pipeline = FramePipeline(capacity=1)
+
+    image = FakeImage('a', capturable=False)
+    pipeline.due(image)
+
+    assert image.state == 'due'
+    assert pipeline.bn_queue_depth.get() == 0
+    assert pipeline.bn_in_flight.get() == 0
+
+
+def test_discard():
+    pipeline = FramePipeline(capacity=1, policy=Backpressure.BLOCK)
+
+    a, b, c = fill(pipeline, 'a', 'b', 'c')
+
+    pipeline.discard(c)
+    assert pipeline.bn_queue_depth.get() == 1
+
+    pipeline.discard(b)
+    assert pipeline.bn_queue_depth.get() == 0
+
+    pipeline.discard(a)
+    assert pipeline.bn_in_flight.get() == 0
+
+    # Discarding an unknown image does nothing.
+    pipeline.discard(a)
@@ -0,0 +1,143 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+import cv2
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.acquisition._acquirer.video_file import VideoFileAcquirer
+
+
+FPS = 10
+NUM_FRAMES = 10
+SIZE = (64, 48)
+
+
+def level(index: int) -> int:
+    """Grey level of frame `index` of the test video."""
+    return 20*index
+
+
+def frame_index(image: np.ndarray) -> int:
+    return int(round(image.mean() / 20))
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path/'video.avi'
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), FPS, SIZE)
+    if not writer.isOpened():
+        pytest.skip('No MJPG video encoder')
+
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((SIZE[1], SIZE[0], 3), level(i), np.uint8))
+    writer.release()
+
+    return path
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+@pytest.fixture
+def acquirer(loop, video_path):
+    acquirer = VideoFileAcquirer()
+    acquirer.load_video_path(video_path)
+    yield acquirer
+    acquirer.destroy()
+
+
+def test_properties(acquirer, video_path):
+    assert acquirer.bn_duration.get() == pytest.approx(NUM_FRAMES/FPS)
+    assert acquirer.get_image_size_hint() == SIZE
+    assert acquirer.bn_last_loaded_path.get() == video_path
+    assert len(acquirer.bn_images.get()) == NUM_FRAMES
+
+
+def test_preview_seeks(acquirer):
+    images = acquirer.bn_images.get()
+
+    for i in (5, 2, 3, 9, 0):
+        image = images[i]
+        assert image.shape == SIZE[::-1]
+        assert frame_index(image) == i
+
+
+def test_time_range_and_stride(acquirer):
+    acquirer.bn_start_time.set(0.2)
+    acquirer.bn_end_time.set(0.75)
+    acquirer.bn_stride.set(2)
+
+    images = acquirer.bn_images.get()
+
+    assert [frame_index(images[i]) for i in range(len(images))] == [2, 4, 6]
+
+
+def test_end_before_start(acquirer):
+    acquirer.bn_start_time.set(0.5)
+    acquirer.bn_end_time.set(0.2)
+
+    assert len(acquirer.bn_images.get()) == 0
+    with pytest.raises(ValueError):
+        acquirer.acquire_images()
+
+
+def test_acquire_images(acquirer, loop):
+    acquirer.bn_start_time.set(0.1)
+    acquirer.bn_stride.set(3)
+
+    input_images = acquirer.acquire_images()
+
+    assert len(input_images) == 3
+
+    for input_image, i in zip(input_images, (1, 4, 7)):
+        image, timestamp = loop.run_until_complete(input_image.read())
+        assert frame_index(image) == i
+        assert timestamp == pytest.approx(i/FPS)
+        input_image.release()
+
+
+def test_missing_file(loop, tmp_path):
+    acquirer = VideoFileAcquirer()
+    try:
+        with pytest.raises(ValueError):
+            acquirer.load_video_path(tmp_path/'missing.avi')
+        assert acquirer.get_image_size_hint() is None
+    finally:
+        acquirer.destroy()
@@ -0,0 +1,291 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+from concurrent.futures import CancelledError
+import threading
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services import workers
+from opendrop.app.common.services.workers import WorkerLane, WorkerMode, WorkerPool
+
+
+TIMEOUT = 10
+
+
+class Gate:
+    """Jobs that block until opened, so tests control when workers become free."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def open(self) -> None:
+        self._event.set()
+
+    def __call__(self, value=None):
+        assert self._event.wait(TIMEOUT)
+        return value
+
+
+def total(*images: np.ndarray) -> int:
+    return sum(int(image.sum()) for image in images)
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(max_workers=1, mode=WorkerMode.THREAD)
+    yield pool
+    pool.shutdown()
+
+
+def test_result_and_exception(pool):
+    assert pool.submit(pow, 2, 10).result(TIMEOUT) == 1024
+
+    with pytest.raises(ZeroDivisionError):
+        pool.submit(divmod, 1, 0).result(TIMEOUT)
+
+
+def test_jobs_wait_for_a_free_worker(pool):
+    gate = Gate()
+    running = pool.submit(gate, 'a')
+    waiting = pool.submit(gate, 'b')
+
+    assert not waiting.running()
+
+    gate.open()
+
+    assert running.result(TIMEOUT) == 'a'
+    assert waiting.result(TIMEOUT) == 'b'
+
+
+def test_cancel_waiting_job(pool):
+    gate = Gate()
+    running = pool.submit(gate, 'a')
+    waiting = pool.submit(gate, 'b')
+    after = pool.submit(gate, 'c')
+
+    assert waiting.cancel()
+    gate.open()
+
+    assert running.result(TIMEOUT) == 'a'
+    assert after.result(TIMEOUT) == 'c'
+    with pytest.raises(CancelledError):
+        waiting.result(TIMEOUT)
+
+
+def test_shutdown_cancels_waiting_jobs():
+    pool = WorkerPool(max_workers=1, mode=WorkerMode.THREAD)
+    gate = Gate()
+    running = pool.submit(gate, 'a')
+    waiting = pool.submit(gate, 'b')
+
+    threading.Timer(0.1, gate.open).start()
+    pool.shutdown()
+
+    assert running.result(TIMEOUT) == 'a'
+    assert waiting.cancelled()
+    with pytest.raises(RuntimeError):
+        pool.submit(pow, 2, 10)
+
+
+def test_process_mode_passes_images_through_arena():
+    pool = WorkerPool(max_workers=1, mode=WorkerMode.PROCESS)
+    try:
+        image = np.ones((300, 400), np.uint8)
+        assert pool.submit(total, image).result(TIMEOUT) == image.size
+        assert pool.submit(total, image, lane=WorkerLane.PREVIEW).result(TIMEOUT) == image.size
+    finally:
+        pool.shutdown()
+
+
+def test_thread_mode_passes_arguments_as_is(pool):
+    image = np.ones((300, 400), np.uint8)
+    assert pool.submit(lambda arg: arg, image).result(TIMEOUT) is image
+
+
+def test_prepare_adds_kwargs_when_job_starts(pool):
+    gate = Gate()
+    values = []
+    pool.submit(gate)
+    waiting = pool.submit(pow, 2, prepare=lambda: {'exp': values[-1]})
+
+    # Not called until the job is handed to a worker.
+    values.append(10)
+    gate.open()
+
+    assert waiting.result(TIMEOUT) == 1024
+
+
+class BrokenExecutor:
+    def submit(self, *args, **kwargs):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+    def shutdown(self):
+        pass
+
+
+def test_submit_failure_fails_job(pool, monkeypatch):
+    executor = pool._executor
+    monkeypatch.setattr(pool, '_executor', BrokenExecutor())
+
+    fut = pool.submit(pow, 2, 10, supersede='key')
+    with pytest.raises(RuntimeError):
+        fut.result(TIMEOUT)
+
+    # The worker and key are free again.
+    monkeypatch.setattr(pool, '_executor', executor)
+    assert pool.submit(pow, 2, 10, supersede='key').result(TIMEOUT) == 1024
+
+
+def test_share_failure_releases_shared_frames(monkeypatch):
+    pool = WorkerPool(max_workers=1, mode=WorkerMode.PROCESS)
+    try:
+        arena = pool._arena
+        put_frames = []
+        released = []
+
+        def put(image, put=arena.put):
+            if put_frames:
+                raise OSError('No space left on device')
+            frame = put(image)
+            put_frames.append(frame)
+            return frame
+
+        def release(frame, release=arena.release):
+            released.append(frame)
+            release(frame)
+
+        monkeypatch.setattr(arena, 'put', put)
+        monkeypatch.setattr(arena, 'release', release)
+
+        image = np.ones((300, 400), np.uint8)
+        with pytest.raises(OSError):
+            pool.submit(total, image, image.copy()).result(TIMEOUT)
+
+        # The frame shared before the failure is released.
+        assert released == put_frames
+
+        monkeypatch.undo()
+        assert pool.submit(total, image).result(TIMEOUT) == image.size
+    finally:
+        pool.shutdown()
+
+
+def test_prepare_failure_fails_job(pool):
+    fut = pool.submit(pow, 2, prepare=lambda: 1/0)
+    with pytest.raises(ZeroDivisionError):
+        fut.result(TIMEOUT)
+
+    assert pool.submit(pow, 2, 10).result(TIMEOUT) == 1024
+
+
+def test_supersede_waiting_job(pool):
+    gate = Gate()
+    running = pool.submit(gate, 'a')
+    old = pool.submit(gate, 'b', lane=WorkerLane.PREVIEW, supersede='preview')
+    new = pool.submit(gate, 'c', lane=WorkerLane.PREVIEW, supersede='preview')
+
+    assert old.cancelled()
+
+    gate.open()
+
+    assert running.result(TIMEOUT) == 'a'
+    assert new.result(TIMEOUT) == 'c'
+
+
+def test_supersede_only_in_same_lane(pool):
+    gate = Gate()
+    running = pool.submit(gate, 'a')
+    analysis = pool.submit(gate, 'b', supersede='frame')
+    preview = pool.submit(gate, 'c', lane=WorkerLane.PREVIEW, supersede='frame')
+
+    gate.open()
+
+    assert running.result(TIMEOUT) == 'a'
+    assert analysis.result(TIMEOUT) == 'b'
+    assert preview.result(TIMEOUT) == 'c'
+
+
+def test_one_job_per_key_runs_at_a_time():
+    pool = WorkerPool(max_workers=2, mode=WorkerMode.THREAD)
+    try:
+        gate = Gate()
+        first = pool.submit(gate, 'a', supersede='preview')
+        second = pool.submit(gate, 'b', supersede='preview')
+
+        # A worker is free, but the second job waits for the first.
+        assert not second.running()
+
+        gate.open()
+
+        assert first.result(TIMEOUT) == 'a'
+        assert second.result(TIMEOUT) == 'b'
+    finally:
+        pool.shutdown()
+
+
+def test_worker_reserved_for_previews(monkeypatch):
+    monkeypatch.setattr(workers, 'PREVIEW_RESERVE_TIMEOUT', 60.0)
+
+    pool = WorkerPool(max_workers=2, mode=WorkerMode.THREAD)
+    try:
+        gate = Gate()
+        pool.submit(pow, 2, 10, lane=WorkerLane.PREVIEW).result(TIMEOUT)
+
+        analyses = [pool.submit(gate, i) for i in range(2)]
+        assert analyses[0].running()
+        assert not analyses[1].running()
+
+        # The reserved worker runs previews straight away.
+        assert pool.submit(pow, 2, 10, lane=WorkerLane.PREVIEW).result(TIMEOUT) == 1024
+
+        gate.open()
+
+        assert [fut.result(TIMEOUT) for fut in analyses] == [0, 1]
+    finally:
+        pool.shutdown()
+
+
+def test_no_reserve_without_previews():
+    pool = WorkerPool(max_workers=2, mode=WorkerMode.THREAD)
+    try:
+        gate = Gate()
+        analyses = [pool.submit(gate, i) for i in range(2)]
+
+        assert all(fut.running() for fut in analyses)
+
+        gate.open()
+
+        assert [fut.result(TIMEOUT) for fut in analyses] == [0, 1]
+    finally:
+        pool.shutdown()
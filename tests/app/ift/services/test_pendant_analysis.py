@@ -0,0 +1,143 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import asyncio
+import math
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.ift.services.analysis import PendantAnalysisJob
+from opendrop.fit import FitError
+
+
+class FakeInputImage:
+    est_ready = math.nan
+    is_replicated = False
+
+    def __init__(self, loop, image=None, exception=None) -> None:
+        self._read = loop.create_future()
+        if exception is not None:
+            self._read.set_exception(exception)
+        else:
+            self._read.set_result((image, 0.0))
+
+        self.release = Mock()
+        self.cancel = Mock()
+
+    async def read(self):
+        return await self._read
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(Mock())
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def make_job(loop, input_image, analysis_exception):
+    analysis = loop.create_future()
+    analysis.set_exception(analysis_exception)
+
+    features_service = Mock()
+    features_service.extract_and_fit.return_value = analysis
+
+    return PendantAnalysisJob(
+        input_image,
+        None,
+        0,
+        physical_params_factory=Mock(),
+        features_params_factory=Mock(),
+        features_service=features_service,
+    )
+
+
+def run_until_done(loop, job):
+    for _ in range(10):
+        if job.bn_is_done.get():
+            break
+        loop.run_until_complete(asyncio.sleep(0))
+
+
+def test_fit_error_fails_job_and_releases_image(loop):
+    input_image = FakeInputImage(loop, np.zeros((10, 10), np.uint8))
+    features = Mock(drop_points=np.zeros((2, 5)), needle_diameter=3.0)
+
+    job = make_job(loop, input_image, FitError(features, 'fit did not converge'))
+    run_until_done(loop, job)
+
+    assert job.bn_status.get() is PendantAnalysisJob.Status.FAILED
+    assert job.bn_is_done.get() and not job.bn_is_cancelled.get()
+    input_image.release.assert_called_once_with()
+
+    # Extracted features are kept.
+    assert job.bn_drop_profile_extract.get().shape == (5, 2)
+    assert job.bn_needle_width_px.get() == 3.0
+
+    loop.get_exception_handler().assert_called_once()
+
+
+def test_extraction_error_fails_job_and_releases_image(loop):
+    input_image = FakeInputImage(loop, np.zeros((10, 10), np.uint8))
+
+    job = make_job(loop, input_image, ValueError('no drop found'))
+    run_until_done(loop, job)
+
+    assert job.bn_status.get() is PendantAnalysisJob.Status.FAILED
+    assert job.bn_drop_profile_extract.get() is None
+    input_image.release.assert_called_once_with()
+
+
+def test_read_error_fails_job_and_releases_image(loop):
+    input_image = FakeInputImage(loop, exception=OSError('unreadable'))
+
+    job = make_job(loop, input_image, AssertionError('not reached'))
+    run_until_done(loop, job)
+
+    assert job.bn_status.get() is PendantAnalysisJob.Status.FAILED
+    input_image.release.assert_called_once_with()
+
+
+def test_cancel_after_failure_is_noop(loop):
+    input_image = FakeInputImage(loop, np.zeros((10, 10), np.uint8))
+
+    job = make_job(loop, input_image, ValueError('no drop found'))
+    run_until_done(loop, job)
+    job.cancel()
+
+    assert job.bn_status.get() is PendantAnalysisJob.Status.FAILED
+    input_image.release.assert_called_once_with()
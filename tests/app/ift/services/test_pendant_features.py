@@ -0,0 +1,205 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import asyncio
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+# Modules under opendrop.app need PyGObject.
+pytest.importorskip('gi')
+
+from opendrop.app.common.services.workers import WorkerMode, WorkerPool
+from opendrop.app.ift.services import features
+from opendrop.app.ift.services.features import (
+    PendantFeaturesParams,
+    PendantFeaturesPriors,
+    PendantFeaturesService,
+)
+from opendrop.geometry import Rect2
+
+
+def make_params(thresh1=80.0):
+    return PendantFeaturesParams(
+        thresh1=thresh1,
+        thresh2=160.0,
+        needle_region=None,
+        drop_region=Rect2(0, 0, 100, 100),
+    )
+
+
+def make_features(x):
+    return Mock(
+        drop_apex=(x, 50.0),
+        drop_radius=20.0,
+        drop_rotation=0.0,
+        drop_points=np.array([[x - 10.0, x + 10.0], [30.0, 70.0]]),
+    )
+
+
+class TestPendantFeaturesPriors:
+    def test_empty(self):
+        priors = PendantFeaturesPriors()
+        assert priors.get(('key',), 0) == (None, None)
+
+    def test_only_later_frames_are_seeded(self):
+        priors = PendantFeaturesPriors()
+        priors.update(('key',), 3, make_features(40.0))
+
+        assert priors.get(('key',), 2) == (None, None)
+        assert priors.get(('key',), 3) == (None, None)
+
+        apex_prior, drop_edge_prior = priors.get(('key',), 4)
+        assert apex_prior == ((40.0, 50.0), 20.0, 0.0)
+        assert tuple(drop_edge_prior.position) == (30, 30)
+        assert tuple(drop_edge_prior.size) == (20, 40)
+
+    def test_older_frame_does_not_replace_newer(self):
+        priors = PendantFeaturesPriors()
+        priors.update(('key',), 5, make_features(40.0))
+        priors.update(('key',), 2, make_features(60.0))
+
+        apex_prior, _ = priors.get(('key',), 6)
+        assert apex_prior[0] == (40.0, 50.0)
+
+    def test_parameter_change_resets(self):
+        priors = PendantFeaturesPriors()
+        priors.update(('old',), 1, make_features(40.0))
+
+        assert priors.get(('new',), 2) == (None, None)
+
+        priors.update(('new',), 0, make_features(60.0))
+        assert priors.get(('old',), 2) == (None, None)
+        assert priors.get(('new',), 1)[0][0] == (60.0, 50.0)
+
+
+class TestPendantFeaturesService:
+    @pytest.fixture(autouse=True)
+    def loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        yield loop
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    @pytest.fixture
+    def workers(self):
+        self.futs = []
+
+        def submit(*args, **kwargs):
+            self.futs.append(Future())
+            return self.futs[-1]
+
+        return Mock(submit=Mock(side_effect=submit))
+
+    def complete(self, loop, cfut, result):
+        cfut.set_result(result)
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.run_until_complete(asyncio.sleep(0))
+
+    def submitted(self, workers):
+        """Keyword arguments of the last job, as if it was handed to a worker now."""
+        _, kwargs = workers.submit.call_args
+        kwargs = dict(kwargs)
+        prepare = kwargs.pop('prepare')
+        return {**kwargs, **prepare()} if prepare is not None else kwargs
+
+    def test_sequence_seeds_later_frames(self, loop, workers):
+        service = PendantFeaturesService(Mock(), workers)
+        priors = PendantFeaturesPriors()
+        params = make_params()
+
+        service.extract_and_fit(np.zeros((10, 10)), params, priors=priors, frame=0)
+        assert self.submitted(workers)['apex_prior'] is None
+
+        self.complete(loop, self.futs[0], (make_features(40.0), Mock()))
+
+        service.extract_and_fit(np.zeros((10, 10)), params, priors=priors, frame=1)
+        assert self.submitted(workers)['apex_prior'] == ((40.0, 50.0), 20.0, 0.0)
+
+        # Another sequence has its own priors.
+        service.extract_and_fit(np.zeros((10, 10)), params, priors=PendantFeaturesPriors(), frame=1)
+        assert self.submitted(workers)['apex_prior'] is None
+
+    def test_preview_does_not_seed_analysis(self, loop, workers):
+        service = PendantFeaturesService(Mock(), workers)
+        priors = PendantFeaturesPriors()
+        params = make_params()
+
+        service.extract(np.zeros((10, 10)), params, preview=True)
+        self.complete(loop, self.futs[0], make_features(40.0))
+
+        service.extract_and_fit(np.zeros((10, 10)), params, priors=priors, frame=5)
+        assert self.submitted(workers)['apex_prior'] is None
+
+        # Previews still seed later previews.
+        service.extract(np.zeros((10, 10)), params, preview=True)
+        assert self.submitted(workers)['apex_prior'] == ((40.0, 50.0), 20.0, 0.0)
+
+    def test_parameter_change_drops_priors(self, loop, workers):
+        service = PendantFeaturesService(Mock(), workers)
+        priors = PendantFeaturesPriors()
+
+        service.extract_and_fit(np.zeros((10, 10)), make_params(), priors=priors, frame=0)
+        self.complete(loop, self.futs[0], (make_features(40.0), Mock()))
+
+        service.extract_and_fit(np.zeros((10, 10)), make_params(thresh1=90.0), priors=priors, frame=1)
+        assert self.submitted(workers)['apex_prior'] is None
+        assert self.submitted(workers)['drop_edge_prior'] is None
+
+    def test_priors_resolved_when_job_starts(self, loop, monkeypatch):
+        apex_priors = {}
+
+        def extract_and_fit_pendant(image, *, apex_prior, **kwargs):
+            frame = int(image[0, 0])
+            apex_priors[frame] = apex_prior
+            return make_features(float(frame)), Mock()
+
+        monkeypatch.setattr(features, 'extract_and_fit_pendant', extract_and_fit_pendant)
+
+        workers = WorkerPool(max_workers=1, mode=WorkerMode.THREAD)
+        try:
+            service = PendantFeaturesService(Mock(), workers)
+            priors = PendantFeaturesPriors()
+            params = make_params()
+
+            # The whole sequence is submitted before any frame is extracted.
+            futs = [
+                service.extract_and_fit(np.full((10, 10), i), params, priors=priors, frame=i)
+                for i in range(4)
+            ]
+            loop.run_until_complete(asyncio.wait(futs, timeout=10))
+        finally:
+            workers.shutdown()
+
+        assert apex_priors[0] is None
+        for i in range(1, 4):
+            assert apex_priors[i][0] == (i - 1.0, 50.0)
@@ -0,0 +1,125 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import numpy as np
+import pytest
+
+from opendrop.features.conan import _outermost_edges
+
+
+def outermost_edges_loop(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """The per-level-set loop that _outermost_edges() replaced, as it was in extract_contact_angle_features()."""
+    mask = np.zeros(len(y), dtype=bool)
+
+    # Sort in ascending y coordinate.
+    ix = y.argsort()
+    x, y = x[ix], y[ix]
+
+    # Divide into 2 pixel high level sets.
+    levels = np.histogram_bin_edges(y, bins=max(1, int(y.max()/2)))
+    levels_ix = (0, *np.searchsorted(y, levels[1:], side='right'))
+
+    # Find left and right-most edges in pairs of level sets.
+    for start, stop in zip(levels_ix, levels_ix[min(2, len(levels_ix)-1):]):
+        level_set = x[start:stop]
+
+        # Left-to-right index.
+        ltr_ix = level_set.argsort()
+
+        # Split into clusters where x distances are less than 2*sqrt(2) ~ 2.828.
+        contiguous_groups = np.split(
+            ltr_ix,
+            (np.diff(level_set[ltr_ix]) > 2.828).nonzero()[0] + 1,
+        )
+        mask[start + contiguous_groups[0]] = True
+        mask[start + contiguous_groups[-1]] = True
+
+    # Mask was built in sorted order.
+    unsorted_mask = np.zeros_like(mask)
+    unsorted_mask[ix] = mask
+
+    return unsorted_mask
+
+
+def drop_profile(n: int, rng: np.random.Generator, noise: float = 0.0) -> np.ndarray:
+    """Edge points of a drop (height, distance along baseline) with a needle and some clutter inside."""
+    t = rng.uniform(0.0, np.pi, n)
+    height = 80*np.sin(t)
+    across = 100*np.cos(t)
+    needle = np.array([rng.uniform(40, 80, n//10), rng.choice([-6.0, 6.0], n//10)])
+    clutter = np.array([rng.uniform(10, 60, n//10), rng.uniform(-40, 40, n//10)])
+    x, y = np.concatenate([np.array([height, across]), needle, clutter], axis=1)
+
+    # The function is called with x across the baseline and y the height.
+    return np.array([y, x]) + rng.normal(0.0, noise, (2, len(x)))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_loop_on_drop_profiles(seed):
+    rng = np.random.default_rng(seed)
+    x, y = drop_profile(2000, rng, noise=0.5*seed)
+
+    assert (_outermost_edges(x, y) == outermost_edges_loop(x, y)).all()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_loop_on_pixel_coordinates(seed):
+    # Integer heights land exactly on level set bin edges.
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 60, 500).astype(float)
+    y = rng.integers(0, 40, 500).astype(float)
+
+    assert (_outermost_edges(x, y) == outermost_edges_loop(x, y)).all()
+
+
+@pytest.mark.parametrize('y_max', [0.0, 1.0, 3.9])
+def test_single_level_set(y_max):
+    # int(y.max()/2) <= 1 gives a single level set.
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.uniform(0, 10, 20), rng.uniform(50, 60, 20), rng.uniform(25, 30, 5)])
+    y = rng.uniform(0, y_max, len(x))
+    y[0] = y_max
+
+    mask = _outermost_edges(x, y)
+
+    assert (mask == outermost_edges_loop(x, y)).all()
+    assert mask[:40].all()
+    assert not mask[40:].any()
+
+
+def test_two_level_sets():
+    x = np.array([0.0, 1.0, 5.0, 10.0, 0.0, 5.0, 9.0])
+    y = np.array([0.5, 0.5, 0.5, 0.5, 3.5, 3.5, 4.0])
+
+    assert (_outermost_edges(x, y) == outermost_edges_loop(x, y)).all()
+
+
+def test_single_point():
+    assert _outermost_edges(np.array([3.0]), np.array([5.0])).tolist() == [True]
+    assert outermost_edges_loop(np.array([3.0]), np.array([5.0])).tolist() == [True]
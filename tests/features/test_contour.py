@@ -0,0 +1,93 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.features import contour
+from opendrop.features.contour import contour_arclength, trace_contour
+
+
+def steps(points: np.ndarray) -> np.ndarray:
+    """Chessboard distance between consecutive points."""
+    return np.abs(np.diff(points, axis=1)).max(axis=0)
+
+
+def test_empty():
+    assert trace_contour(np.zeros((10, 10), np.uint8)).shape == (2, 0)
+
+
+def test_open_curve_starts_at_left_end():
+    edges = np.zeros((100, 100), np.uint8)
+    cv2.ellipse(edges, (50, 20), (40, 60), 0, 0, 180, 255, 1)
+
+    points = trace_contour(edges)
+
+    assert points.shape[1] == np.count_nonzero(edges)
+    assert points[0, 0] == points[0].min()
+    assert (steps(points) <= 1).all()
+
+
+def test_closed_curve():
+    edges = np.zeros((100, 100), np.uint8)
+    cv2.circle(edges, (50, 50), 30, 255, 1)
+
+    points = trace_contour(edges)
+
+    assert points.shape[1] == np.count_nonzero(edges)
+    assert (steps(points) <= 1).all()
+
+
+def test_thick_closed_curve_matches_loop(monkeypatch):
+    edges = np.zeros((200, 200), np.uint8)
+    cv2.circle(edges, (100, 100), 70, 255, 3)
+
+    def border_param_loop(param, border, component, x, y):
+        start = np.lexsort((y[border], x[border]))[0]
+        border = np.roll(border, -start)
+        _, first = np.unique(border, return_index=True)
+        param[border[first]] = first
+        members = (component == component[border[0]]).nonzero()[0]
+        for i in np.setdiff1d(members, border):
+            param[i] = np.argmin(np.abs(x[border] - x[i]) + np.abs(y[border] - y[i])) + 0.5
+
+    points = trace_contour(edges)
+
+    # Small blocks so the vectorized version works through several of them.
+    monkeypatch.setattr(contour, 'BORDER_DISTANCE_BLOCK', 1000)
+    np.testing.assert_array_equal(trace_contour(edges), points)
+
+    monkeypatch.setattr(contour, '_border_param', border_param_loop)
+    np.testing.assert_array_equal(trace_contour(edges), points)
+
+
+def test_contour_arclength():
+    points = np.array([[0, 3, 3], [0, 4, 5]])
+    np.testing.assert_allclose(contour_arclength(points), [0, 5, 6])
@@ -0,0 +1,206 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.features.edges import EdgeDetector
+from opendrop.frame import Frame, PixelFormat
+from opendrop.geometry import Rect2
+
+
+def disc(size: int) -> np.ndarray:
+    image = np.zeros((size, size), np.uint8)
+    cv2.circle(image, (size//2, size//2), size//3, 255, -1)
+    return image
+
+
+def whole(image: np.ndarray) -> Rect2[int]:
+    return Rect2(x0=0, y0=0, x1=image.shape[1] - 1, y1=image.shape[0] - 1)
+
+
+def largest_buffer(detector: EdgeDetector) -> int:
+    return max(buffer.size for buffer in detector._buffers.values())
+
+
+def test_buffers_shrink_after_smaller_images():
+    large = disc(400)
+    small = disc(50)
+
+    detector = EdgeDetector()
+    detector.load(large, [whole(large)])
+    detector.strength(whole(large))
+    assert largest_buffer(detector) >= 400*400
+
+    for _ in range(EdgeDetector.BUFFER_SHRINK_LOADS - 1):
+        detector.load(small, [whole(small)])
+    assert largest_buffer(detector) >= 400*400
+
+    detector.load(small, [whole(small)])
+    assert largest_buffer(detector) <= 50*50
+
+    fresh = EdgeDetector()
+    fresh.load(small, [whole(small)])
+    for a, b in zip(detector.gradient(whole(small)), fresh.gradient(whole(small))):
+        assert (a == b).all()
+
+
+def test_interleaved_large_image_keeps_buffers():
+    large = disc(400)
+    small = disc(50)
+
+    detector = EdgeDetector()
+    for _ in range(3*EdgeDetector.BUFFER_SHRINK_LOADS):
+        detector.load(large, [whole(large)])
+        for _ in range(EdgeDetector.BUFFER_SHRINK_LOADS - 1):
+            detector.load(small, [whole(small)])
+
+    assert largest_buffer(detector) >= 400*400
+
+
+def test_clear():
+    image = disc(100)
+
+    detector = EdgeDetector()
+    detector.load(image, [whole(image)])
+    detector.clear()
+
+    assert not detector._buffers
+    assert not detector._windows
+
+
+def blurred_disc(size: int) -> np.ndarray:
+    image = disc(size)
+    return cv2.GaussianBlur(image, (0, 0), 2.0)
+
+
+def step(size: int, high: int, dtype) -> np.ndarray:
+    image = np.zeros((size, size), dtype)
+    image[:, size//2:] = high
+    return image
+
+
+def test_mono12_matches_8bit():
+    image8 = blurred_disc(200)
+    image12 = Frame(image8.astype(np.uint16) << 4, PixelFormat.MONO16, bit_depth=12)
+    region = whole(image8)
+
+    detector8 = EdgeDetector()
+    detector8.load(image8, [region])
+    detector12 = EdgeDetector()
+    detector12.load(image12, [region])
+
+    assert detector12.max_gradient(region) == pytest.approx(detector8.max_gradient(region), rel=0.02)
+
+    strength8 = detector8.strength(region).astype(int)
+    strength12 = detector12.strength(region).astype(int)
+    assert np.abs(strength8 - strength12).max() <= 3
+
+    # Thresholds are in 8-bit grey levels for both.  Rounding can move non-maximum suppression by a pixel.
+    mask = np.ones(image8.shape, np.uint8)
+    for thresh1, thresh2 in [(20.0, 40.0), (150.0, 300.0)]:
+        edges8 = detector8.canny(region, mask, thresh1, thresh2).copy()
+        edges12 = detector12.canny(region, mask, thresh1, thresh2).copy()
+        assert np.count_nonzero(edges12) == pytest.approx(np.count_nonzero(edges8), rel=0.02)
+        assert not (edges12 & ~cv2.dilate(edges8, np.ones((3, 3), np.uint8))).any()
+
+    high = 0.9*detector8.max_gradient(region)
+    assert detector8.canny(region, mask, high, high).any()
+    assert detector12.canny(region, mask, high, high).any()
+    too_high = 1.1*detector8.max_gradient(region)
+    assert not detector8.canny(region, mask, too_high, too_high).any()
+    assert not detector12.canny(region, mask, too_high, too_high).any()
+
+
+@pytest.mark.parametrize('bit_depth', [8, 10, 12, 16])
+def test_full_contrast_step_does_not_saturate(bit_depth):
+    image8 = step(50, 255, np.uint8)
+    region = whole(image8)
+
+    detector8 = EdgeDetector()
+    detector8.load(image8, [region])
+
+    image = Frame(step(50, 2**bit_depth - 1, np.uint16), PixelFormat.MONO16, bit_depth=bit_depth)
+    detector = EdgeDetector()
+    detector.load(image, [region])
+
+    dx, dy = detector.gradient(region)
+    assert np.abs(dx).max() < 2**15 - 1
+    assert detector.max_gradient(region) == pytest.approx(detector8.max_gradient(region), rel=0.01)
+
+
+def test_gradient_gain_headroom():
+    # Largest Scharr response (kernel weights 3 + 10 + 3) to an unblurred full range step.  At 16 bits this
+    # is 32767.5, which the int16 clip rounds off by half a grey level; any larger gain would saturate.
+    for bit_depth in (10, 12, 16):
+        scale = EdgeDetector.GRADIENT_GAIN * 2.0**(8 - bit_depth)
+        assert 16 * (2**bit_depth - 1) * scale < 2**15
+
+
+def soft_edge(shape, normal, distance: float) -> np.ndarray:
+    """Blurred step that rises across the line {p : p·normal == distance} in the direction of `normal`."""
+    ys, xs = np.indices(shape)
+    t = xs*normal[0] + ys*normal[1] - distance
+    return (255/(1 + np.exp(-t/0.8))).round().astype(np.uint8)
+
+
+@pytest.mark.parametrize('x0', [40.0, 40.2, 40.5, 40.8])
+def test_subpixel_vertical_edge(x0):
+    image = soft_edge((40, 80), (1.0, 0.0), x0)
+    region = whole(image)
+    detector = EdgeDetector()
+    detector.load(image, [region])
+
+    ys = np.arange(5, 35)
+    xs = np.full(len(ys), round(x0))
+    refined = detector.subpixel(region, np.array([xs, ys]))
+
+    assert refined[0] == pytest.approx(x0, abs=0.1)
+    assert (refined[1] == ys).all()
+
+
+@pytest.mark.parametrize('angle', [0.3, 0.7])
+def test_subpixel_oblique_edge(angle):
+    normal = np.array([np.cos(angle), np.sin(angle)])
+    distance = 50.37
+    image = soft_edge((100, 100), normal, distance)
+    region = whole(image)
+    detector = EdgeDetector()
+    detector.load(image, [region])
+
+    # Pixels nearest the line, away from the image border.
+    ys, xs = np.indices(image.shape)
+    t = xs*normal[0] + ys*normal[1] - distance
+    near = (np.abs(t) <= 0.5) & (xs > 5) & (xs < 94) & (ys > 5) & (ys < 94)
+    points = np.array([xs[near], ys[near]])
+    refined = detector.subpixel(region, points)
+
+    before = np.abs(normal @ points - distance)
+    after = np.abs(normal @ refined - distance)
+    assert after.max() < 0.15
+    assert after.mean() < before.mean()/2
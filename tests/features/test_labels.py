@@ -0,0 +1,112 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import cv2
+import numpy as np
+
+from opendrop.features import colorize_labels, extract_contact_angle_features, label_points
+from opendrop.geometry import Line2, Vector2
+
+
+def test_label_points_cropped_to_points():
+    edges = np.array([[10, 12, 20], [5, 9, 7]])
+    drop = np.array([[12, 15], [9, 6]])
+
+    labels, position = label_points(edges, drop)
+
+    assert position == Vector2(10, 5)
+    assert labels.shape == (5, 11)
+    assert labels.dtype == np.uint8
+
+    expected = np.zeros((5, 11), np.uint8)
+    expected[0, 0] = 1
+    expected[2, 10] = 1
+    expected[4, 2] = 2  # Drop point drawn over the edge point.
+    expected[1, 5] = 2
+    assert (labels == expected).all()
+
+
+def test_label_points_rounds_subpixel_points():
+    labels, position = label_points(np.array([[3.4, 4.6], [7.4, 8.8]]))
+
+    assert position == Vector2(3, 7)
+    assert labels.tolist() == [[1, 0, 0], [0, 0, 0], [0, 0, 1]]
+
+
+def test_label_points_empty_sets():
+    labels, position = label_points(np.empty((2, 0)), np.empty((2, 0)))
+    assert labels.shape == (0, 0)
+    assert position == Vector2(0, 0)
+
+    # An empty set still takes its label number.
+    labels, position = label_points(np.empty((2, 0)), np.array([[1], [2]]))
+    assert labels.tolist() == [[2]]
+    assert position == Vector2(1, 2)
+
+
+def test_contact_angle_labels_match_points():
+    image = np.full((300, 400), 220, np.uint8)
+    cv2.circle(image, (200, 180), 80, 40, -1)
+    image[220:] = 40
+    image = cv2.GaussianBlur(image, (0, 0), 1.0)
+    baseline = Line2((0, 220), (399, 220))
+
+    features = extract_contact_angle_features(image, baseline, False, labels=True)
+    labels = features.labels
+    x0, y0 = features.labels_position
+
+    assert 0 < labels.size < image.size
+
+    # Labels touch every edge of their bounding box.
+    assert labels[0].any() and labels[-1].any() and labels[:, 0].any() and labels[:, -1].any()
+
+    drop_x, drop_y = features.drop_points.astype(int)
+    assert (labels[drop_y - y0, drop_x - x0] == 2).all()
+    assert np.count_nonzero(labels == 2) == features.drop_points.shape[1]
+
+    # Position back in the full frame.
+    full = np.zeros(image.shape, np.uint8)
+    full[y0:y0+labels.shape[0], x0:x0+labels.shape[1]] = labels
+    assert (full[drop_y, drop_x] == 2).all()
+
+
+def test_colorize_cropped_labels():
+    colors = np.array([
+        0x00000000,
+        0xffbbbbff,
+        0xff0000ff,
+    ], dtype=np.uint32).view(np.uint8).reshape(-1, 4)
+
+    labels, _ = label_points(np.array([[10, 14], [20, 22]]), np.array([[12], [21]]))
+    data = np.frombuffer(colorize_labels(labels, colors), np.uint8).reshape(*labels.shape, 4)
+
+    assert (data[0, 0] == colors[1]).all()
+    assert (data[2, 4] == colors[1]).all()
+    assert (data[1, 2] == colors[2]).all()
+    assert (data[0, 1] == colors[0]).all()
@@ -0,0 +1,255 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+# PendantApexFinder fits circles with opendrop.fit, which needs the compiled Young-Laplace shape extension.
+pytest.importorskip('opendrop.fit.younglaplace.shape')
+
+from opendrop.features import pendant
+from opendrop.features.edges import EdgeDetector
+from opendrop.features.pendant import (
+    PRIOR_OFFSET_TOL,
+    PRIOR_ROTATION_TOL,
+    PendantApexFinder,
+    _extract_drop_edge,
+    _largest_connected_component,
+    _orient_from_prior,
+)
+from opendrop.fit.younglaplace.model import get_shape
+from opendrop.geometry import Rect2, Vector2
+from opendrop.utility.misc import rotation_mat2d
+
+
+APEX = Vector2(300.0, 100.0)
+RADIUS = 100.0
+
+
+def pendant_profile(rotation: float, bond: float = 0.2, s_max: float = 3.0) -> np.ndarray:
+    """Points about one pixel apart on a Young-Laplace pendant drop profile with its apex at APEX."""
+    s = np.linspace(-s_max, s_max, int(2*RADIUS*s_max))
+    return np.reshape(APEX, (2, 1)) + rotation_mat2d(rotation) @ (RADIUS*get_shape(bond)(s))
+
+
+def angle_diff(a: float, b: float) -> float:
+    return abs((a - b + math.pi) % (2*math.pi) - math.pi)
+
+
+def assert_apex(result, rotation: float) -> None:
+    apex, radius, found_rotation = result
+    assert apex.x == pytest.approx(APEX.x, abs=0.1)
+    assert apex.y == pytest.approx(APEX.y, abs=0.1)
+    assert radius == pytest.approx(RADIUS, rel=0.01)
+    assert angle_diff(found_rotation, rotation) < 1e-3
+
+
+@pytest.fixture
+def search_calls(monkeypatch):
+    """Records calls to the symmetry axis search."""
+    calls = []
+    search_axis = PendantApexFinder._search_axis
+
+    def spy(self, *args):
+        calls.append(args)
+        return search_axis(self, *args)
+
+    monkeypatch.setattr(PendantApexFinder, '_search_axis', spy)
+    return calls
+
+
+@pytest.mark.parametrize('rotation', [0.0, 0.05, -0.1, 0.5*math.pi, math.pi])
+def test_find_apex(rotation):
+    assert_apex(PendantApexFinder()(pendant_profile(rotation)), rotation)
+
+
+@pytest.mark.parametrize('rotation', [0.0, -0.1, math.pi])
+def test_prior_skips_axis_search(rotation, search_calls):
+    data = pendant_profile(rotation)
+    finder = PendantApexFinder()
+
+    without_prior = finder(data)
+    assert len(search_calls) == 1
+
+    # Next frame, the drop has moved slightly.
+    with_prior = finder(data + [[0.5], [0.3]], without_prior)
+    assert len(search_calls) == 1
+
+    # Agrees with the full search.
+    expected = PendantApexFinder()(data + [[0.5], [0.3]])
+    assert with_prior[0].x == pytest.approx(expected[0].x, abs=1e-6)
+    assert with_prior[0].y == pytest.approx(expected[0].y, abs=1e-6)
+    assert with_prior[1] == pytest.approx(expected[1])
+    assert angle_diff(with_prior[2], expected[2]) < 1e-9
+
+
+@pytest.mark.parametrize('prior', [
+    # Rotated too far.
+    (APEX, RADIUS, 2*PRIOR_ROTATION_TOL),
+    # Apex moved sideways.
+    (APEX + (2*PRIOR_OFFSET_TOL*RADIUS, 0.0), RADIUS, 0.0),
+    # Apex on the other side of the bowl center, i.e. the drop flipped.
+    (APEX + (0.0, 2.2*RADIUS), RADIUS, 0.0),
+])
+def test_inconsistent_prior_is_ignored(prior, search_calls):
+    result = PendantApexFinder()(pendant_profile(0.0), prior)
+
+    assert len(search_calls) == 1
+    assert_apex(result, 0.0)
+
+
+def test_orient_from_prior():
+    center = APEX + (0.0, RADIUS)
+
+    # Closest principal axis orientation to the prior.
+    assert _orient_from_prior((APEX, RADIUS, 0.02), center, RADIUS, 0.5*math.pi) == pytest.approx(0.0)
+    assert _orient_from_prior((APEX, RADIUS, math.pi), center + (0, -2*RADIUS), RADIUS, 0.01) \
+        == pytest.approx(math.pi + 0.01)
+
+    assert _orient_from_prior((APEX, RADIUS, 0.0), center, RADIUS, 0.9*PRIOR_ROTATION_TOL) is not None
+    assert _orient_from_prior((APEX, RADIUS, 0.0), center, RADIUS, 1.1*PRIOR_ROTATION_TOL) is None
+
+    assert _orient_from_prior((APEX + (0.9*PRIOR_OFFSET_TOL*RADIUS, 0), RADIUS, 0.0), center, RADIUS, 0.0) \
+        is not None
+    assert _orient_from_prior((APEX + (1.1*PRIOR_OFFSET_TOL*RADIUS, 0), RADIUS, 0.0), center, RADIUS, 0.0) \
+        is None
+
+
+def test_buffers_reused():
+    large = pendant_profile(0.0, s_max=3.0)
+    small = pendant_profile(0.1, s_max=2.0)
+
+    finder = PendantApexFinder()
+    finder(large)
+    buffer = finder._buffer
+
+    # Results don't depend on what was left in the buffers.
+    assert_apex(finder(small), 0.1)
+    assert finder._buffer is buffer
+
+    assert_apex(finder(large), 0.0)
+    assert finder._buffer is buffer
+
+
+def test_find_pendant_apex_empty():
+    assert pendant.find_pendant_apex(np.empty((2, 0))) is None
+
+
+def components_image() -> np.ndarray:
+    """A large ring (the drop edge), a small blob and a line touching the image border."""
+    gray = np.zeros((200, 300), np.uint8)
+    cv2.ellipse(gray, (150, 90), (60, 70), 0, 0, 360, 255, 3)
+    cv2.circle(gray, (30, 170), 8, 255, -1)
+    gray[195:, 200:] = 255
+    return gray
+
+
+def assert_component(mask: np.ndarray, bbox: Rect2[int], gray: np.ndarray) -> None:
+    _, labels = cv2.connectedComponents(gray, connectivity=4)
+    label = labels[20, 150]
+    ys, xs = (labels == label).nonzero()
+
+    assert (bbox.x0, bbox.y0, bbox.x1, bbox.y1) == (xs.min(), ys.min(), xs.max(), ys.max())
+    assert mask.shape == (bbox.h + 1, bbox.w + 1)
+    assert (mask == (labels[bbox.y0:bbox.y1+1, bbox.x0:bbox.x1+1] == label)).all()
+
+
+def test_largest_connected_component():
+    gray = components_image()
+    mask, bbox = _largest_connected_component(gray)
+    assert_component(mask, bbox, gray)
+
+
+@pytest.mark.parametrize('seed', [
+    # Bounding box of the ring on the previous frame.
+    Rect2(89, 19, 211, 161),
+    # Ring has moved.
+    Rect2(95, 25, 215, 165),
+    # Ring has grown past the seed window, the full image is scanned.
+    Rect2(120, 60, 180, 120),
+    # Window clipped by the image.
+    Rect2(0, 0, 299, 199),
+])
+def test_largest_connected_component_seed(seed):
+    gray = components_image()
+    mask, bbox = _largest_connected_component(gray, seed)
+    assert_component(mask, bbox, gray)
+
+
+def test_largest_connected_component_seed_limits_search(monkeypatch):
+    gray = components_image()
+    regions = []
+    connected_components = cv2.connectedComponentsWithStats
+
+    def spy(image, *args, **kwargs):
+        regions.append(image.shape)
+        return connected_components(image, *args, **kwargs)
+
+    monkeypatch.setattr(pendant.cv2, 'connectedComponentsWithStats', spy)
+
+    _largest_connected_component(gray, Rect2(89, 19, 211, 161))
+    assert len(regions) == 1
+    assert regions[0][0] < gray.shape[0] and regions[0][1] < gray.shape[1]
+
+
+def test_largest_connected_component_empty():
+    mask, bbox = _largest_connected_component(np.zeros((20, 30), np.uint8))
+    assert (bbox.x0, bbox.y0, bbox.x1, bbox.y1) == (0, 0, 29, 19)
+    assert mask.shape == (20, 30) and mask.all()
+
+
+@pytest.mark.parametrize('subpixel', [False, True])
+@pytest.mark.parametrize('ordered', [False, True])
+def test_extract_drop_edge_seed(subpixel, ordered):
+    image = np.full((300, 400), 200, np.uint8)
+    cv2.ellipse(image, (200, 140), (70, 90), 0, 0, 360, 60, -1)
+    # Needle.
+    image[:60, 190:210] = 60
+    image = cv2.GaussianBlur(image, (0, 0), 1.5)
+
+    region = Rect2(50, 20, 350, 280)
+    detector = EdgeDetector()
+    detector.load(image, [region])
+
+    points = _extract_drop_edge(detector, region, 50, 100, subpixel=subpixel, ordered=ordered).copy()
+    x0, y0 = points.min(axis=1).astype(int)
+    x1, y1 = points.max(axis=1).astype(int)
+
+    seeded = _extract_drop_edge(
+        detector, region, 50, 100, subpixel=subpixel, ordered=ordered, seed=Rect2(x0, y0, x1, y1),
+    )
+
+    assert points.shape[1] > 0
+    assert np.array_equal(seeded, points)
+
+    # Points are relative to the region, on the drop edge below the needle.
+    x, y = points + np.reshape(region.position, (2, 1))
+    below_needle = y > 60
+    assert np.hypot((x - 200)/70, (y - 140)/90)[below_needle] == pytest.approx(1.0, abs=0.05)
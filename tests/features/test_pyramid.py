@@ -0,0 +1,142 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.features.conan import extract_contact_angle_features
+from opendrop.features.pyramid import (
+    MAX_PYRAMID_LEVEL,
+    pyramid_down,
+    pyramid_level,
+    _point_down,
+    _point_up,
+    _points_up,
+    _region_down,
+)
+from opendrop.geometry import Line2, Rect2, Vector2
+
+
+@pytest.mark.parametrize('scale, level', [
+    (2.0, 0),
+    (1.0, 0),
+    (0.99, 0),
+    (0.5, 1),
+    (0.3, 1),
+    (0.25, 2),
+    (0.2, 2),
+    (0.125, 3),
+    (0.0625, 4),
+    (0.01, MAX_PYRAMID_LEVEL),
+    (0.0, MAX_PYRAMID_LEVEL),
+])
+def test_pyramid_level(scale, level):
+    assert pyramid_level(scale) == level
+
+
+def test_pyramid_level_resolution_at_least_scale():
+    for scale in np.linspace(0.07, 1.0, 50):
+        level = pyramid_level(scale)
+        assert 2.0**-level >= scale
+        assert 2.0**-(level + 1) < scale
+
+
+@pytest.mark.parametrize('level', range(MAX_PYRAMID_LEVEL + 1))
+def test_region_down_covers_region(level):
+    image = np.zeros((123, 97), np.uint8)
+    downsampled = pyramid_down(image, level)
+
+    for region in [Rect2(0, 0, 97, 123), Rect2(13, 7, 61, 100), Rect2(16, 32, 48, 64), Rect2(5, 5, 6, 6)]:
+        region_down = _region_down(region, level)
+
+        # Full resolution pixels covered by region_down.
+        x0, y0 = _points_up(np.array([region_down.x0, region_down.y0]) - 0.5, level) + 0.5
+        x1, y1 = _points_up(np.array([region_down.x1, region_down.y1]) - 0.5, level) + 0.5
+        assert x0 <= region.x0 < x0 + 2**level
+        assert y0 <= region.y0 < y0 + 2**level
+        assert x1 - 2**level < region.x1 <= x1
+        assert y1 - 2**level < region.y1 <= y1
+
+        # Never larger than the downsampled image.
+        assert region_down.x1 <= downsampled.shape[1]
+        assert region_down.y1 <= downsampled.shape[0]
+
+
+def test_region_down_none():
+    assert _region_down(None, 2) is None
+
+
+@pytest.mark.parametrize('level', range(MAX_PYRAMID_LEVEL + 1))
+def test_point_round_trip(level):
+    for point in [Vector2(0.0, 0.0), Vector2(10.25, 3.5), Vector2(-0.5, 99.9)]:
+        assert _point_up(_point_down(point, level), level) == pytest.approx(point)
+        assert _point_down(_point_up(point, level), level) == pytest.approx(point)
+
+    points = np.array([[0.0, 10.25, -0.5], [0.0, 3.5, 99.9]])
+    points_up = _points_up(points, level)
+    for point, point_up in zip(points.T, points_up.T):
+        assert tuple(point_up) == pytest.approx(tuple(_point_up(Vector2(*point), level)))
+
+
+def test_pixel_centres_map_to_block_centres():
+    # Pixel i at level 2 covers full resolution pixels 4*i to 4*i + 3.
+    assert _points_up(np.array([[0, 1, 2]]), 2).tolist() == [[1.5, 5.5, 9.5]]
+    assert _point_down(Vector2(1.5, 5.5), 2) == Vector2(0.0, 1.0)
+
+
+def sessile_drop_image(shape, centre, radius, baseline_y):
+    image = np.full(shape, 220, np.uint8)
+    cv2.circle(image, centre, radius, 40, -1)
+    image[baseline_y:] = 40
+    return cv2.GaussianBlur(image, (0, 0), 1.0)
+
+
+@pytest.mark.parametrize('scale', [0.5, 0.25])
+def test_extract_contact_angle_features_full_resolution_coordinates(scale):
+    image = sessile_drop_image((360, 480), (250, 240), 90, 280)
+    baseline = Line2((0, 280), (479, 280))
+    roi = Rect2(101, 51, 421, 301)
+
+    full = extract_contact_angle_features(image, baseline, False, roi=roi)
+    scaled = extract_contact_angle_features(image, baseline, False, roi=roi, scale=scale)
+
+    assert full.drop_points.shape[1] > 0
+    assert scaled.drop_points.shape[1] > 0
+
+    # Same extents as the full resolution points, to within a pixel at the coarser level.  Edges within 2
+    # pixels of the baseline are dropped at the coarser level too, so the bottom is cut higher.
+    tol = 1/scale + 1
+    assert scaled.drop_points.min(axis=1) == pytest.approx(full.drop_points.min(axis=1), abs=tol)
+    assert scaled.drop_points[0].max() == pytest.approx(full.drop_points[0].max(), abs=tol)
+    assert full.drop_points[1].max() - 2/scale - tol <= scaled.drop_points[1].max() <= full.drop_points[1].max()
+
+    # Every point lies on the drop edge.
+    r = np.hypot(scaled.drop_points[0] - 250, scaled.drop_points[1] - 240)
+    assert np.abs(r - 90).max() < tol
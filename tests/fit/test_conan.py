@@ -0,0 +1,251 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import math
+
+import numpy as np
+import pytest
+import scipy.optimize
+
+# opendrop.fit needs the compiled Young-Laplace shape extension.
+pytest.importorskip('opendrop.fit.younglaplace.shape')
+
+from opendrop.geometry import Line2
+from opendrop.fit import contact_angle_fit, contact_angle_fit_batch
+from opendrop.fit.younglaplace.model import get_shape
+
+
+BASELINE_Y = 200.0
+
+
+def circular_cap(angle: float, base_radius: float = 100.0, noise: float = 0.0) -> np.ndarray:
+    """Points about one pixel apart on a circular cap sitting on the line y = BASELINE_Y in image coordinates
+    with contact angle `angle` (in radians)."""
+    radius = base_radius/math.sin(angle)
+    center = (300.0, BASELINE_Y + radius*math.cos(angle))
+
+    t = np.linspace(-angle, angle, int(2*radius*angle)) - math.pi/2
+    x = center[0] + radius*np.cos(t)
+    y = center[1] + radius*np.sin(t)
+
+    points = np.array([x, y])[:, y <= BASELINE_Y]
+    if noise:
+        points += np.random.default_rng(0).normal(scale=noise, size=points.shape)
+
+    return points
+
+
+def sessile_drop(bond: float, radius: float, angle: float, noise: float = 0.1):
+    """Points about one pixel apart on a sessile Young-Laplace profile with apex radius `radius` (in pixels), cut
+    off by a horizontal baseline where the profile makes `angle` with it. Returns the points, the baseline, the
+    expected contact points' x-coordinates and the expected curvature at the contacts."""
+    shape = get_shape(-bond)
+    h = 1.e-6
+
+    def phi(s: float) -> float:
+        dr, dz = (shape(s + h) - shape(s - h)) / (2*h)
+        return math.atan2(dz, dr)
+
+    grid = np.linspace(1.e-3, 5.0, 500)
+    i = np.flatnonzero([phi(s) >= angle for s in grid])[0]
+    s_contact = scipy.optimize.brentq(lambda s: phi(s) - angle, grid[i - 1], grid[i])
+
+    s = np.linspace(-s_contact, s_contact, int(2*radius*s_contact))
+    points = np.array([300.0, 100.0]).reshape(2, 1) + radius*shape(s)
+    points += np.random.default_rng(0).normal(scale=noise, size=points.shape)
+
+    contact_r, contact_z = radius*shape(s_contact)
+    baseline = Line2((0, 100.0 + contact_z), (1, 100.0 + contact_z))
+    curvature = (phi(s_contact + 1.e-4) - phi(s_contact - 1.e-4)) / 2.e-4 / radius
+
+    return points, baseline, (300.0 - contact_r, 300.0 + contact_r), curvature
+
+
+@pytest.mark.parametrize('angle_deg', [60, 90, 120])
+def test_young_laplace_fit_sessile_drop(angle_deg):
+    data, baseline, (left_x, right_x), curvature = sessile_drop(0.3, 80.0, math.radians(angle_deg))
+
+    result = contact_angle_fit(data, baseline, method='young-laplace')
+
+    assert math.degrees(result.left_angle) == pytest.approx(angle_deg, abs=1.0)
+    assert math.degrees(result.right_angle) == pytest.approx(angle_deg, abs=1.0)
+
+    assert result.left_contact.x == pytest.approx(left_x, abs=0.5)
+    assert result.right_contact.x == pytest.approx(right_x, abs=0.5)
+    assert result.left_contact.y == pytest.approx(baseline.pt0.y)
+    assert result.right_contact.y == pytest.approx(baseline.pt0.y)
+
+    assert result.left_curvature == pytest.approx(-curvature, rel=0.1)
+    assert result.right_curvature == pytest.approx(curvature, rel=0.1)
+
+    # Every point belongs to one side.
+    assert (result.left_mask ^ result.right_mask).all()
+    assert result.left_residuals.shape == (np.count_nonzero(result.left_mask),)
+    assert np.abs(result.right_residuals).max() < 1.0
+
+
+def test_young_laplace_fit_too_few_points():
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+
+    result = contact_angle_fit(circular_cap(math.radians(60))[:, :5], baseline, method='young-laplace')
+
+    assert result.left_angle is None and result.right_angle is None
+    assert not result.left_mask.any() and not result.right_mask.any()
+
+
+@pytest.mark.parametrize('angle_deg', [5, 10, 30, 60, 90, 120, 150, 170, 175])
+def test_polynomial_fit_circular_cap(angle_deg):
+    angle = math.radians(angle_deg)
+    data = circular_cap(angle)
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+
+    result = contact_angle_fit(data, baseline, method='polynomial')
+
+    assert math.degrees(result.left_angle) == pytest.approx(angle_deg, abs=0.5)
+    assert math.degrees(result.right_angle) == pytest.approx(angle_deg, abs=0.5)
+
+    curvature = math.sin(angle)/100.0
+    assert result.left_curvature == pytest.approx(-curvature, rel=0.1)
+    assert result.right_curvature == pytest.approx(curvature, rel=0.1)
+
+    assert result.left_contact.x == pytest.approx(200.0, abs=0.1)
+    assert result.right_contact.x == pytest.approx(400.0, abs=0.1)
+    assert result.left_contact.y == pytest.approx(BASELINE_Y)
+
+
+@pytest.mark.parametrize('angle_deg', [30, 90, 150])
+def test_polynomial_fit_noisy_circular_cap(angle_deg):
+    data = circular_cap(math.radians(angle_deg), noise=0.5)
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+
+    result = contact_angle_fit(data, baseline, method='polynomial')
+
+    assert math.degrees(result.left_angle) == pytest.approx(angle_deg, abs=5.0)
+    assert math.degrees(result.right_angle) == pytest.approx(angle_deg, abs=5.0)
+
+
+def test_polynomial_fit_results_per_point():
+    data = circular_cap(math.radians(60))
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+
+    result = contact_angle_fit(data, baseline, method='polynomial')
+
+    assert result.left_residuals.shape == (np.count_nonzero(result.left_mask),)
+    assert result.right_arclengths.shape == (np.count_nonzero(result.right_mask),)
+    # Points outside the refined window are not fitted but still get residuals.
+    assert np.abs(result.left_residuals).max() < 0.5
+
+
+def assert_same_fit(batched, single):
+    for side in ('left', 'right'):
+        assert (getattr(batched, side + '_mask') == getattr(single, side + '_mask')).all()
+
+        angle = getattr(single, side + '_angle')
+        if angle is None:
+            assert getattr(batched, side + '_angle') is None
+            continue
+
+        assert getattr(batched, side + '_angle') == pytest.approx(angle, abs=math.radians(0.5))
+        assert getattr(batched, side + '_contact').x == pytest.approx(getattr(single, side + '_contact').x, abs=0.5)
+        assert getattr(batched, side + '_contact').y == pytest.approx(getattr(single, side + '_contact').y, abs=0.5)
+        assert getattr(batched, side + '_curvature') \
+            == pytest.approx(getattr(single, side + '_curvature'), rel=0.05, abs=1e-4)
+
+        # Per-point results are in the order of the input data. Arclengths on a circle wrap around at its
+        # circumference, which points right at the contact may land on either side of.
+        arclength_diff = np.abs(getattr(batched, side + '_arclengths') - getattr(single, side + '_arclengths'))
+        curvature = getattr(single, side + '_curvature')
+        if curvature:
+            arclength_diff = np.minimum(arclength_diff, abs(2*math.pi/curvature) - arclength_diff)
+        assert arclength_diff.max() < 0.5
+        np.testing.assert_allclose(
+            np.abs(getattr(batched, side + '_residuals')),
+            np.abs(getattr(single, side + '_residuals')),
+            atol=0.1,
+        )
+
+
+def test_batch_matches_single_fits():
+    rng = np.random.default_rng(1)
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+    reversed_baseline = Line2((1, BASELINE_Y), (0, BASELINE_Y))
+
+    frames = []
+    for angle_deg in (20, 60, 90, 120, 160):
+        data = circular_cap(math.radians(angle_deg), noise=0.2)
+        # Fits must not depend on the order of the points.
+        data = data[:, rng.permutation(data.shape[1])]
+        frames.append((data, baseline))
+        frames.append((data, reversed_baseline))
+
+    # Only the left half of a drop.
+    data = circular_cap(math.radians(70))
+    frames.append((data[:, data[0] < 300.0], baseline))
+
+    # Straight sides are fitted with lines.
+    t = np.linspace(0.0, 60.0, 61)
+    frames.append((np.array([np.r_[250.0 + 0.5*t, 350.0 - 0.5*t], np.r_[BASELINE_Y - t, BASELINE_Y - t]]), baseline))
+
+    results = contact_angle_fit_batch([data for data, _ in frames], [baseline for _, baseline in frames])
+
+    assert len(results) == len(frames)
+    for result, (data, baseline) in zip(results, frames):
+        assert_same_fit(result, contact_angle_fit(data, baseline))
+
+
+def test_batch_results_follow_input_order():
+    rng = np.random.default_rng(2)
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+    data = circular_cap(math.radians(60), noise=0.2)
+    perm = rng.permutation(data.shape[1])
+
+    result, permuted_result = contact_angle_fit_batch([data, data[:, perm]], [baseline]*2)
+
+    for side in ('left', 'right'):
+        mask = getattr(result, side + '_mask')
+        assert (getattr(permuted_result, side + '_mask') == mask[perm]).all()
+
+        for name in ('_arclengths', '_residuals'):
+            values = np.full(data.shape[1], np.nan)
+            values[mask] = getattr(result, side + name)
+            np.testing.assert_allclose(getattr(permuted_result, side + name), values[perm][mask[perm]])
+
+
+def test_batch_empty_frames():
+    baseline = Line2((0, BASELINE_Y), (1, BASELINE_Y))
+    data = circular_cap(math.radians(60))
+
+    results = contact_angle_fit_batch([np.empty((2, 0)), data, np.empty((2, 0))], [baseline]*3)
+
+    for result in (results[0], results[2]):
+        assert result.left_angle is None and result.right_angle is None
+        assert result.left_mask.shape == (0,)
+    assert_same_fit(results[1], contact_angle_fit(data, baseline))
+
+    assert contact_angle_fit_batch([], []) == []
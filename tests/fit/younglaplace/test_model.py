@@ -0,0 +1,72 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+import pytest
+
+# opendrop.fit needs the compiled Young-Laplace shape extension.
+pytest.importorskip('opendrop.fit.younglaplace.shape')
+
+from opendrop.fit.younglaplace import model
+from opendrop.fit.younglaplace.model import SHAPE_CACHE_SIZE, get_shape
+
+
+def test_get_shape_reuses_shapes():
+    shape = get_shape(0.123)
+
+    assert get_shape(0.123) is shape
+    assert get_shape(0.124) is not shape
+
+
+def test_get_shape_evicts_least_recently_used(monkeypatch):
+    monkeypatch.delattr(model._shape_cache, 'shapes', raising=False)
+
+    first = get_shape(0.0)
+    second = get_shape(0.01)
+    for i in range(2, SHAPE_CACHE_SIZE):
+        get_shape(0.01*i)
+
+    # Keep the first shape recently used, so the second one is evicted next.
+    assert get_shape(0.0) is first
+    get_shape(1.0)
+
+    assert get_shape(0.0) is first
+    assert get_shape(0.01) is not second
+    assert len(model._shape_cache.shapes) == SHAPE_CACHE_SIZE
+
+
+def test_get_shape_per_thread():
+    shape = get_shape(0.2)
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_shape(0.2)))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not shape
+    assert get_shape(0.2) is shape
@@ -0,0 +1,247 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import pickle
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from opendrop import arena
+from opendrop.arena import FrameArena, MappedFrame, call_with_shared_frames, map_frame
+from opendrop.frame import Frame, PixelFormat
+
+
+def run_python(script: str, *args: str) -> subprocess.CompletedProcess:
+    """Run `script` in a new interpreter that can import opendrop. Output includes that of any resource tracker
+    the interpreter starts, since the tracker inherits its stderr."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get('PYTHONPATH')))))
+    return subprocess.run(
+        [sys.executable, '-c', textwrap.dedent(script), *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+@pytest.fixture
+def frame_arena():
+    frame_arena = FrameArena(max_free=1)
+    yield frame_arena
+    frame_arena.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_mappings():
+    yield
+    while arena._mappings:
+        arena._close_mapping(arena._mappings.popitem()[1])
+    arena._mappings_generation = 0
+
+
+def test_put_and_open(frame_arena):
+    image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+
+    handle = frame_arena.put(image)
+    opened = pickle.loads(pickle.dumps(handle)).open()
+
+    np.testing.assert_array_equal(opened, image)
+    assert not opened.flags.writeable
+    assert not isinstance(opened, Frame)
+
+    del opened
+    frame_arena.release(handle)
+
+
+def test_frame_tags_are_kept(frame_arena):
+    image = Frame(np.zeros((3, 4, 3), np.uint16), PixelFormat.RGB16, 12)
+
+    handle = frame_arena.put(image)
+    opened = handle.open()
+
+    assert opened.pixel_format is PixelFormat.RGB16
+    assert opened.bit_depth == 12
+
+    del opened
+    frame_arena.release(handle)
+
+
+def test_released_slot_is_reused(frame_arena):
+    handle0 = frame_arena.put(np.zeros(100, np.uint8))
+    frame_arena.release(handle0)
+
+    handle1 = frame_arena.put(np.ones(50, np.uint8))
+    assert handle1.name == handle0.name
+    assert handle1.generation == handle0.generation
+
+    frame_arena.release(handle1)
+
+
+def test_slot_is_kept_until_last_release(frame_arena):
+    handle = frame_arena.put(np.zeros(100, np.uint8))
+    frame_arena.acquire(handle)
+
+    frame_arena.release(handle)
+    other = frame_arena.put(np.zeros(100, np.uint8))
+    assert other.name != handle.name
+
+    frame_arena.release(handle)
+    frame_arena.release(other)
+
+
+def test_unlink_bumps_generation(frame_arena):
+    handles = [frame_arena.put(np.zeros(100, np.uint8)) for _ in range(3)]
+    assert {handle.generation for handle in handles} == {0}
+
+    # Only one free slot is kept, the other two are unlinked.
+    for handle in handles:
+        frame_arena.release(handle)
+
+    handle = frame_arena.put(np.zeros(1000, np.uint8))
+    assert handle.generation == 2
+    frame_arena.release(handle)
+
+
+def test_newer_generation_drops_cached_mappings(frame_arena):
+    handle0 = frame_arena.put(np.zeros(100, np.uint8))
+    handle0.open()
+    assert handle0.name in arena._mappings
+
+    frame_arena.release(handle0)
+    frame_arena.close()
+
+    frame_arena = FrameArena()
+    handle1 = frame_arena.put(np.ones(100, np.uint8))
+    handle1 = handle1._replace(generation=handle0.generation + 1)
+
+    np.testing.assert_array_equal(handle1.open(), 1)
+    assert list(arena._mappings) == [handle1.name]
+
+    frame_arena.release(handle1)
+    frame_arena.close()
+
+
+def test_closed_arena_rejects_put(frame_arena):
+    frame_arena.close()
+    with pytest.raises(RuntimeError):
+        frame_arena.put(np.zeros(10, np.uint8))
+
+
+def test_map_frame(tmp_path):
+    frames = Frame(np.arange(2*3*4, dtype=np.uint16).reshape(2, 3, 4), PixelFormat.MONO16, 12)
+    path = tmp_path/'frames.npy'
+    np.save(path, frames)
+
+    stack = Frame(np.load(path, mmap_mode='r'), PixelFormat.MONO16, 12)
+    handle = map_frame(stack[1])
+
+    assert isinstance(handle, MappedFrame)
+    opened = pickle.loads(pickle.dumps(handle)).open()
+    np.testing.assert_array_equal(opened, frames[1])
+    assert opened.pixel_format is PixelFormat.MONO16
+    assert opened.bit_depth == 12
+
+
+def test_map_frame_rejects_unmapped_and_strided(tmp_path):
+    assert map_frame(np.zeros((3, 4))) is None
+
+    path = tmp_path/'frames.npy'
+    np.save(path, np.zeros((2, 3, 4)))
+    assert map_frame(np.load(path, mmap_mode='r')[:, :, ::2]) is None
+
+
+def test_call_with_shared_frames(frame_arena):
+    image = np.arange(6, dtype=np.uint8).reshape(2, 3)
+    handle = frame_arena.put(image)
+
+    total = call_with_shared_frames(lambda a, *, b: int(a.sum()) + b, (handle,), {'b': 1})
+
+    assert total == image.sum() + 1
+    frame_arena.release(handle)
+
+
+def test_attaching_process_does_not_unlink(frame_arena):
+    image = np.arange(100, dtype=np.uint8)
+    handle = frame_arena.put(image)
+
+    # A process with a resource tracker of its own attaches and exits.
+    result = run_python("""
+        import sys
+        from opendrop import arena
+        print(int(arena._attach(sys.argv[1]).buf[99]))
+    """, handle.name)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '99'
+    assert result.stderr == ''
+
+    np.testing.assert_array_equal(handle.open(), image)
+    frame_arena.release(handle)
+
+
+def test_worker_processes_sharing_tracker():
+    result = run_python("""
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+
+        import numpy as np
+
+        from opendrop.arena import FrameArena, call_with_shared_frames
+
+        if __name__ == '__main__':
+            frame_arena = FrameArena(max_free=1)
+            handles = [frame_arena.put(np.full(100, i, np.uint8)) for i in range(3)]
+
+            # Workers share this process's resource tracker.
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                for _ in range(2):
+                    futs = [executor.submit(call_with_shared_frames, np.sum, (handle,), {}) for handle in handles]
+                    print(*(int(fut.result()) for fut in futs))
+
+            for handle in handles:
+                frame_arena.release(handle)
+            frame_arena.close()
+
+            for handle in handles:
+                try:
+                    shared_memory.SharedMemory(name=handle.name).close()
+                except FileNotFoundError:
+                    pass
+                else:
+                    print('not unlinked')
+    """)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['0', '100', '200']*2
+    assert result.stderr == ''
@@ -0,0 +1,124 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+import pickle
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.frame import Frame, PixelFormat, as_frame
+
+
+@pytest.mark.parametrize('shape, dtype, pixel_format', [
+    ((4, 5), np.uint8, PixelFormat.MONO8),
+    ((4, 5), np.uint16, PixelFormat.MONO16),
+    ((4, 5, 3), np.uint8, PixelFormat.RGB8),
+    ((4, 5, 3), np.uint16, PixelFormat.RGB16),
+])
+def test_guess_pixel_format(shape, dtype, pixel_format):
+    frame = as_frame(np.zeros(shape, dtype))
+
+    assert frame.pixel_format is pixel_format
+    assert frame.bit_depth == (16 if pixel_format.is_16bit else 8)
+
+
+def test_unrecognized_image():
+    with pytest.raises(ValueError):
+        as_frame(np.zeros((4, 5), np.float32))
+
+
+def test_as_frame_returns_frame_as_is():
+    frame = Frame(np.zeros((4, 5), np.uint16), PixelFormat.MONO16, bit_depth=12)
+    assert as_frame(frame) is frame
+
+
+def test_views_keep_tags_and_results_drop_them():
+    frame = Frame(np.zeros((4, 5), np.uint16), PixelFormat.MONO16, bit_depth=12)
+
+    view = frame[1:3, 1:3]
+    assert isinstance(view, Frame)
+    assert view.pixel_format is PixelFormat.MONO16
+    assert view.bit_depth == 12
+
+    assert not isinstance(frame + 1, Frame)
+    assert not isinstance(frame.max(), Frame)
+
+
+def test_pickle_keeps_tags():
+    frame = Frame(np.arange(20, dtype=np.uint16).reshape(4, 5), PixelFormat.MONO16, bit_depth=12)
+
+    copy = pickle.loads(pickle.dumps(frame))
+
+    assert (copy == frame).all()
+    assert copy.pixel_format is PixelFormat.MONO16
+    assert copy.bit_depth == 12
+
+
+def test_convert_to_same_format_is_identity():
+    frame = as_frame(np.zeros((4, 5, 3), np.uint8))
+    assert frame.convert(PixelFormat.RGB8) is frame
+
+
+def test_convert_rgb8_to_mono8():
+    rgb = np.random.default_rng(0).integers(0, 256, (4, 5, 3), dtype=np.uint8)
+
+    mono = as_frame(rgb).convert(PixelFormat.MONO8)
+
+    assert mono.pixel_format is PixelFormat.MONO8
+    assert (mono == cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)).all()
+
+
+def test_convert_mono12_to_mono8_keeps_most_significant_bits():
+    frame = Frame(np.array([[0, 16, 4095]], np.uint16), PixelFormat.MONO16, bit_depth=12)
+
+    mono = frame.convert(PixelFormat.MONO8)
+
+    assert mono.dtype == np.uint8
+    assert mono.tolist() == [[0, 1, 255]]
+
+
+def test_convert_mono8_to_rgb16():
+    frame = as_frame(np.array([[0, 7, 255]], np.uint8))
+
+    rgb = frame.convert(PixelFormat.RGB16)
+
+    assert rgb.pixel_format is PixelFormat.RGB16
+    assert rgb.dtype == np.uint16
+    assert rgb.bit_depth == 8
+    assert rgb.shape == (1, 3, 3)
+    assert (rgb == np.array([0, 7, 255])[:, None]).all()
+
+
+def test_convert_into_dst():
+    frame = Frame(np.full((4, 5, 3), 4095, np.uint16), PixelFormat.RGB16, bit_depth=12)
+    dst = np.empty((4, 5), np.uint8)
+
+    mono = frame.convert(PixelFormat.MONO8, dst=dst)
+
+    assert np.shares_memory(mono, dst)
+    assert (dst == 255).all()